@@ -0,0 +1,76 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      AsyncStreams
+Purpose:   This file contains the helper used by the LandingPlatformController and UAVController
+           classes to expose their data as asyncio streams. Both classes produce data through
+           callbacks, either from the background camera reader, an event loop reader or the
+           Crazyflie logging thread. The helper bridges those callbacks onto the event loop with
+           call_soon_threadsafe so they can be consumed with "async for".
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import asyncio
+
+def _offer(queue, items):
+    """
+    Function:    _offer
+    Purpose:     Place items on a bounded queue, discarding the oldest entries if it is full
+    Inputs:      queue - an asyncio.Queue
+                 items - a list of values to place on the queue
+    Outputs:     None
+    Description: A slow consumer should see the newest data rather than stall the producer, so old entries are dropped.
+                 Must only be called from the event loop thread.
+    """
+    for item in items:
+        if(queue.full()):
+            queue.get_nowait()
+        queue.put_nowait(item)
+    return
+
+async def callbackStream(addListener, removeListener, maxQueue=256):
+    """
+    Function:    callbackStream
+    Purpose:     Turn a listener registration into an asynchronous iterator
+    Inputs:      addListener - a function that registers a callback, the callback is given a list of new values
+                 removeListener - a function that removes a previously registered callback
+                 maxQueue - an integer value denoting how many values may wait for the consumer before the oldest are dropped
+    Outputs:     yields each value passed to the callback, in order
+    Description: The callback may be called from any thread. It hands its values to the event loop with call_soon_threadsafe,
+                 so the producer never blocks on the consumer. The listener is removed when the iterator is closed.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=maxQueue)
+
+    def listener(values):
+        loop.call_soon_threadsafe(_offer, queue, values)
+
+    addListener(listener)
+    try:
+        while(True):
+            yield await queue.get()
+    finally:
+        removeListener(listener)
@@ -0,0 +1,166 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      CameraParseBenchmark
+Purpose:   Compares the camera packet parsing used by _getUAVPosition before the background reader
+           (read(1) until the end of a packet, then string slicing) against the bulk readinto and batch
+           decode path in CameraStream.CameraReader.
+
+           Synthetic {xxx$yyy} traffic is fed through an in-memory serial port. For each traffic rate the
+           camera is assumed to be drained every --poll seconds, and the CPU time needed to parse one
+           second of traffic is reported along with the raw packets/second of each parser.
+
+           Usage:     python3 CameraParseBenchmark.py [--rates 100 1000 5000 10000] [--poll 0.01]
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import CameraProtocol
+from CameraStream import CameraReader
+
+INIT_VALUE = '{904$904}\r\n'
+LIMITERS = ['{', '$', '}']
+
+class MemorySerial():
+    #Just enough of the serial.Serial interface to drive both parsers from a byte string
+    def __init__(self, data=b''):
+        self.timeout = 0
+        self._data = bytes(data)
+        self._pos = 0
+
+    def feed(self, data):
+        self._data = self._data[self._pos:] + data
+        self._pos = 0
+
+    @property
+    def in_waiting(self):
+        return len(self._data) - self._pos
+
+    def read(self, size=1):
+        chunk = self._data[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+    def readinto(self, buffer):
+        chunk = self.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+def makeTraffic(count):
+    """
+    Function:    makeTraffic
+    Purpose:     Build ASCII camera traffic
+    Inputs:      count - an integer value, the number of packets
+    Outputs:     a bytes value of count {xxx$yyy} packets
+    Description: See purpose.
+    """
+    return b''.join(b'{%03d$%03d}\r\n' % (i % 240, (7*i) % 240) for i in range(count))
+
+def legacyParse(camera, count):
+    """
+    Function:    legacyParse
+    Purpose:     Parse packets the way _getUAVPosition did before the background reader
+    Inputs:      camera - a MemorySerial value holding the traffic
+                 count - an integer value, the number of packets to parse
+    Outputs:     a tuple of x, y lists of pixel coordinates
+    Description: The pixel conversion is left out, so only the parsing is timed.
+    """
+    xPoints = []
+    yPoints = []
+    for i in range(0, count):
+        while(camera.read(1).decode('ascii') != INIT_VALUE[-1]):{}
+        posString = camera.read(len(INIT_VALUE)).decode('ascii')
+        posString = posString[posString.find(LIMITERS[0]):posString.find(LIMITERS[2])+1]
+        if(len(posString) > 0):
+            if(posString[0] == LIMITERS[0]):
+                initIndex=posString.rfind(LIMITERS[0])
+                splitIndex=posString.rfind(LIMITERS[1])
+                lastIndex=posString.rfind(LIMITERS[2])
+                xPoints.append(int(posString[(initIndex+1):splitIndex]))
+                yPoints.append(int(posString[(splitIndex+1):lastIndex]))
+    return xPoints, yPoints
+
+def legacyRate(packets):
+    """
+    Function:    legacyRate
+    Purpose:     Measure the packets/second of the legacy parser
+    Inputs:      packets - an integer value, the number of packets parsed
+    Outputs:     a floating point value in packets per second
+    Description: The fixed length read after each terminator swallows a whole line, so the loop consumes two lines per packet
+                 and twice the traffic is fed.
+    """
+    camera = MemorySerial(makeTraffic(2*packets + 2))
+    start = time.perf_counter()
+    legacyParse(camera, packets)
+    return packets/(time.perf_counter() - start)
+
+def batchCost(rate, poll, seconds):
+    """
+    Function:    batchCost
+    Purpose:     Measure the CPU time the batch reader needs to parse and store one second of traffic
+    Inputs:      rate - an integer value, the camera packet rate in Hz
+                 poll - a floating point value, the seconds between reads of the camera
+                 seconds - a floating point value, the seconds of traffic to simulate
+    Outputs:     a tuple of the CPU seconds per second of traffic and the packets/second parsed
+    Description: See purpose.
+    """
+    perPoll = max(1, int(round(rate*poll)))
+    chunk = makeTraffic(perPoll)
+    polls = int(seconds/poll)
+    camera = MemorySerial()
+    reader = CameraReader(camera, CameraProtocol.CameraProtocol(INIT_VALUE, '{900$900}\r\n', LIMITERS), bufferSize=4096, packetFormat=CameraProtocol.FORMAT_ASCII)
+    parsed = 0
+    start = time.perf_counter()
+    for _ in range(polls):
+        camera.feed(chunk)
+        batch = reader.readBatch()
+        reader._storeBatch(batch, time.monotonic())
+        parsed += len(batch.x)
+    elapsed = time.perf_counter() - start
+    return elapsed/(polls*poll), parsed/elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the legacy camera packet parsing loop with the batch CameraReader path.')
+    parser.add_argument('--rates', type=int, nargs='+', default=[100, 1000, 5000, 10000], help='camera packet rates in Hz')
+    parser.add_argument('--poll', type=float, default=0.01, help='seconds between reads of the camera')
+    parser.add_argument('--seconds', type=float, default=2.0, help='seconds of traffic to simulate per rate')
+    args = parser.parse_args()
+
+    legacy = legacyRate(20000)
+    print('legacy per-byte loop: %12.0f packets/s' % legacy)
+    print('%8s %14s %14s %14s' % ('rate Hz', 'batch pkt/s', 'batch CPU %', 'legacy CPU %'))
+    for rate in args.rates:
+        cost, throughput = batchCost(rate, args.poll, args.seconds)
+        print('%8d %14.0f %14.2f %14.2f' % (rate, throughput, 100*cost, 100*rate/legacy))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      FlightRecorderBenchmark
+Purpose:   Measures the cost of each kind of FlightRecorder record, written to a recording in a temporary
+           directory, and the time to map the recording back with numpy.memmap and select each kind.
+
+           Usage:     python3 FlightRecorderBenchmark.py [--records 200000] [--capacity 65536]
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import argparse
+import collections
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import CameraProtocol
+import FlightRecorder
+import LandingStateMachine
+
+#Same fields as UAVController.TelemetryPacket, which cannot be imported without cflib
+TelemetryPacket = collections.namedtuple('TelemetryPacket', ['timestamp', 'uavTimestamp', 'data'])
+
+def timePerRecord(write, batches, perBatch):
+    """
+    Function:    timePerRecord
+    Purpose:     Measure the seconds taken by each record
+    Inputs:      write - a function that writes one batch of records
+                 batches - an integer value, the number of batches written
+                 perBatch - an integer value, the number of records in each batch
+    Outputs:     a floating point value in seconds per record
+    Description: See purpose.
+    """
+    start = time.perf_counter()
+    for _ in range(batches):
+        write()
+    return (time.perf_counter() - start)/(batches*perBatch)
+
+def main():
+    """
+    Function:    main
+    Purpose:     Parse the arguments and print the cost of each kind of record and of reading the recording
+    Inputs:      None
+    Outputs:     None
+    Description: See purpose.
+    """
+    parser = argparse.ArgumentParser(description='Measure the cost of each kind of FlightRecorder record.')
+    parser.add_argument('--records', type=int, default=200000, help='records written per kind')
+    parser.add_argument('--capacity', type=int, default=65536, help='records held by the recording before it wraps')
+    args = parser.parse_args()
+
+    fixes = [CameraProtocol.CameraFix(1.0, 120, 130, None, None, 0, 0.99, i) for i in range(10)]
+    packet = b'{120$130}\r\n'*4
+    telemetry = [TelemetryPacket(1.0, 1000, {'pm.vbat': 3.9, 'stateEstimate.x': 0.1, 'stateEstimate.y': 0.2, 'stateEstimate.z': 0.5, 'pm.chargeCurrent': 0.0})]
+    transition = LandingStateMachine.Transition(1.0, LandingStateMachine.ALIGN, LandingStateMachine.DESCEND, 'tick')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'benchmark.rec')
+        recorder = FlightRecorder.FlightRecorder(path, args.capacity)
+        kinds = [
+            ('packet', lambda: recorder.recordPacket(1.0, packet), 1),
+            ('fix', lambda: recorder.recordFixes(fixes), len(fixes)),
+            ('telemetry', lambda: recorder.recordTelemetry(telemetry), 1),
+            ('command', lambda: recorder.recordCommand(1.0, FlightRecorder.COMMAND_MOVE, 0.1, 0.2, -0.1, 0.2, 7), 1),
+            ('transition', lambda: recorder.recordTransition(transition), 1),
+        ]
+        print('%12s %12s' % ('record', 'us/record'))
+        for name, write, perBatch in kinds:
+            print('%12s %12.2f' % (name, 1e6*timePerRecord(write, args.records//perBatch, perBatch)))
+        recorder.close()
+
+        start = time.perf_counter()
+        recording = FlightRecorder.FlightRecording(path)
+        counts = [len(recording.select(kind)) for kind in FlightRecorder.KIND_DTYPES]
+        print('read and select %d records: %.2f ms' % (sum(counts), 1000*(time.perf_counter() - start)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      FlightReplayBenchmark
+Purpose:   Replays recorded flights through LandingPlatformController on a virtual clock and compares the
+           commands and landing states of each replay with the recording. Without --recordings, a set of
+           simulated landings is recorded first into a temporary directory and replayed.
+
+           The real replays/second and simulated flight seconds replayed per real second are reported,
+           along with every replay that did not make the same decisions as the original flight.
+
+           Usage:     python3 FlightReplayBenchmark.py [--seeds 100] [--mode step]
+                      python3 FlightReplayBenchmark.py --recordings ~/arav_flights/*.rec --setting landingMode=closedLoop
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import argparse
+import ast
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from Simulation import LandingSimulation, replay, formatResult
+from Simulation.LandingSimulation import DEFAULT_SETTINGS
+
+def recordSimulations(directory, seeds, settings):
+    """
+    Function:    recordSimulations
+    Purpose:     Record one simulated landing per seed
+    Inputs:      directory - a string value, the directory the recordings are written under
+                 seeds - an iterable of seed values
+                 settings - a dictionary value of controller settings
+    Outputs:     a list of recording paths
+    Description: See purpose.
+    """
+    paths = []
+    for seed in seeds:
+        #One directory per seed, as recordings are named by the second they start in
+        seedDirectory = os.path.join(directory, str(seed))
+        os.mkdir(seedDirectory)
+        recordSettings = dict(settings)
+        recordSettings['flightRecordDir'] = seedDirectory
+        simulation = LandingSimulation(seed, settings=recordSettings)
+        try:
+            simulation.run()
+        finally:
+            simulation.close()
+        paths.extend(glob.glob(os.path.join(seedDirectory, '*.rec')))
+    return paths
+
+def parseSetting(text):
+    """
+    Function:    parseSetting
+    Purpose:     Split a name=value setting argument
+    Inputs:      text - a string value
+    Outputs:     a tuple of the setting name and its value
+    Description: The value is read as a python literal when it is one and kept as a string otherwise.
+    """
+    name, _, value = text.partition('=')
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value
+
+def main():
+    """
+    Function:    main
+    Purpose:     Parse the arguments, replay the flights and print every replay that diverged
+    Inputs:      None
+    Outputs:     None
+    Description: See purpose.
+    """
+    parser = argparse.ArgumentParser(description='Replay recorded flights and compare their decisions with the recording.')
+    parser.add_argument('--recordings', nargs='+', help='recordings to replay instead of simulated landings')
+    parser.add_argument('--seeds', type=int, default=100, help='number of simulated landings to record and replay')
+    parser.add_argument('--mode', default='step', help='landingMode of the simulated landings')
+    parser.add_argument('--setting', action='append', default=[], help='controller setting name=value used when replaying')
+    args = parser.parse_args()
+
+    settings = dict(DEFAULT_SETTINGS)
+    del settings['flightRecordDir']
+    settings['landingMode'] = args.mode
+    settings.update(parseSetting(text) for text in args.setting)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = args.recordings
+        if(paths == None):
+            start = time.perf_counter()
+            paths = recordSimulations(directory, range(args.seeds), settings)
+            print('recorded %d simulated landings in %.2f s' % (len(paths), time.perf_counter() - start))
+
+        start = time.perf_counter()
+        results = [replay(path, settings) for path in paths]
+        elapsed = time.perf_counter() - start
+
+    for result in results:
+        if(not result.identical):
+            print(formatResult(result))
+    simulated = sum(result.simulatedTime for result in results)
+    identical = sum(result.identical for result in results)
+    print('replayed %d flights in %.2f s: %.1f replays/s, %.0f flight s per s, %d identical, %d diverged' % (
+        len(results), elapsed, len(results)/elapsed, simulated/elapsed, identical, len(results) - identical))
+
+if __name__ == '__main__':
+    main()
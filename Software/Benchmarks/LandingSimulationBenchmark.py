@@ -0,0 +1,98 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      LandingSimulationBenchmark
+Purpose:   Runs whole landings of LandingPlatformController against the simulated UAV and camera in
+           Simulation, on a virtual clock, across a range of seeds. Each seed draws its own starting
+           position, UAV frame rotation and scale error, wind and camera noise, so every landing mode
+           is compared on exactly the same flights.
+
+           For each landing mode the real landings/second, the moves and velocity setpoints sent per
+           landing, the simulated time-to-land and the share of landings that ended charging are reported.
+
+           Usage:     python3 LandingSimulationBenchmark.py [--seeds 50] [--modes step closedLoop]
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from Simulation import LandingSimulation
+
+def runMode(mode, seeds, wind, noise):
+    """
+    Function:    runMode
+    Purpose:     Run one simulated landing per seed in a landing mode
+    Inputs:      mode - a string value, the landingMode setting
+                 seeds - an iterable of seed values
+                 wind - a floating point value, the standard deviation of the wind in m/s
+                 noise - a floating point value, the standard deviation of the camera pixel noise
+    Outputs:     a tuple of the list of SimulationResult values and the real seconds taken
+    Description: See purpose.
+    """
+    results = []
+    start = time.perf_counter()
+    for seed in seeds:
+        simulation = LandingSimulation(seed, settings={'landingMode': mode}, uavOptions={'windStd': wind}, cameraOptions={'pixelNoise': noise})
+        try:
+            results.append(simulation.run())
+        finally:
+            simulation.close()
+    return results, time.perf_counter() - start
+
+def main():
+    """
+    Function:    main
+    Purpose:     Parse the arguments and print one row per landing mode
+    Inputs:      None
+    Outputs:     None
+    Description: See purpose.
+    """
+    parser = argparse.ArgumentParser(description='Compare the landing modes on seeded simulated landings.')
+    parser.add_argument('--seeds', type=int, default=50, help='number of seeded landings per mode')
+    parser.add_argument('--first-seed', dest='firstSeed', type=int, default=0, help='seed of the first landing')
+    parser.add_argument('--modes', nargs='+', default=['step', 'closedLoop'], help='landingMode values to compare')
+    parser.add_argument('--wind', type=float, default=0.01, help='standard deviation of the wind in m/s')
+    parser.add_argument('--noise', type=float, default=1.0, help='standard deviation of the camera pixel noise')
+    args = parser.parse_args()
+
+    seeds = range(args.firstSeed, args.firstSeed + args.seeds)
+    print('%12s %12s %12s %12s %12s %12s %12s' % ('mode', 'landings/s', 'iterations', 'sim mean s', 'sim p90 s', 'error mm', 'charging %'))
+    for mode in args.modes:
+        results, elapsed = runMode(mode, seeds, args.wind, args.noise)
+        simulated = np.array([result.simulatedTime for result in results])
+        iterations = np.mean([result.iterations for result in results])
+        error = 1000*np.median([result.error for result in results])
+        charging = 100*np.mean([result.charging for result in results])
+        print('%12s %12.1f %12.1f %12.2f %12.2f %12.1f %12.1f' % (mode, len(results)/elapsed, iterations, simulated.mean(), np.percentile(simulated, 90), error, charging))
+
+if __name__ == '__main__':
+    main()
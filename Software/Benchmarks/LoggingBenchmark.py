@@ -0,0 +1,178 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      LoggingBenchmark
+Purpose:   Measures the cost of LandingPlatformController debug logging, first per statement and then over
+           whole simulated landings.
+
+           Per statement, the old eager print to /dev/null is compared with DebugLog disabled, writing text
+           or JSON through the background queue, and writing directly. A stream that takes --slow-write ms
+           per write stands in for an SD card, to show the queue keeps slow writes out of the logging thread.
+
+           Per landing, the closedLoop and step landings of Simulation are run with logging off and with
+           every debug statement written to a file, text and JSON, and the real time per landing is reported.
+
+           Usage:     python3 LoggingBenchmark.py [--statements 100000] [--seeds 20] [--slow-write 0.2]
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import DebugLog
+from Simulation import LandingSimulation
+
+class SlowStream():
+
+    def __init__(self, stream, seconds):
+        """
+        Function:    __init__
+        Purpose:     Wrap a stream so each write takes a fixed time
+        Inputs:      stream - a file-like value written to
+                     seconds - a floating point value, the seconds each write sleeps
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._stream = stream
+        self._seconds = seconds
+
+    def write(self, text):
+        time.sleep(self._seconds)
+        return self._stream.write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+def timePerStatement(log, count):
+    """
+    Function:    timePerStatement
+    Purpose:     Measure the seconds taken by each debug statement
+    Inputs:      log - a logging function such as Logger.debug
+                 count - an integer value, the number of statements
+    Outputs:     a floating point value in seconds per statement
+    Description: See purpose.
+    """
+    distances = [0.0123, -0.0456, -0.05]
+    start = time.perf_counter()
+    for i in range(count):
+        log("_sendToHome - distances = %s, step %d", distances, i)
+    return (time.perf_counter() - start)/count
+
+def timeEagerPrint(stream, count):
+    """
+    Function:    timeEagerPrint
+    Purpose:     Measure the seconds taken by each statement printed the way the controller printed before DebugLog
+    Inputs:      stream - a file-like value printed to
+                 count - an integer value, the number of statements
+    Outputs:     a floating point value in seconds per statement
+    Description: See purpose.
+    """
+    distances = [0.0123, -0.0456, -0.05]
+    start = time.perf_counter()
+    for i in range(count):
+        print("LPC: _sendToHome - distances =" + str(distances) + ", step " + str(i), file=stream)
+    return (time.perf_counter() - start)/count
+
+def timeLandings(directory, seeds, settings):
+    """
+    Function:    timeLandings
+    Purpose:     Measure the real seconds taken by each simulated landing
+    Inputs:      directory - a string value, the directory holding the log file
+                 seeds - a sequence of seed values
+                 settings - a dictionary value of controller settings
+    Outputs:     a floating point value in seconds per landing
+    Description: See purpose.
+    """
+    start = time.perf_counter()
+    for seed in seeds:
+        simulation = LandingSimulation(seed, settings=settings)
+        try:
+            simulation.run()
+        finally:
+            simulation.close()
+    return (time.perf_counter() - start)/len(seeds)
+
+def main():
+    """
+    Function:    main
+    Purpose:     Parse the arguments and print the cost of logging per statement and per landing
+    Inputs:      None
+    Outputs:     None
+    Description: See purpose.
+    """
+    parser = argparse.ArgumentParser(description='Measure the cost of debug logging per statement and per simulated landing.')
+    parser.add_argument('--statements', type=int, default=100000, help='debug statements timed per case')
+    parser.add_argument('--seeds', type=int, default=20, help='simulated landings timed per case')
+    parser.add_argument('--slow-write', dest='slowWrite', type=float, default=0.2, help='milliseconds taken by each write to the slow stream')
+    args = parser.parse_args()
+
+    with open(os.devnull, 'w') as devnull:
+        slow = SlowStream(devnull, args.slowWrite/1000)
+        cases = [
+            ('print', None),
+            ('disabled', DebugLog.DebugLog('LPC')),
+            ('info only', DebugLog.DebugLog('LPC', devnull, 'info')),
+            ('text queued', DebugLog.DebugLog('LPC', devnull)),
+            ('json queued', DebugLog.DebugLog('LPC', devnull, logFormat=DebugLog.FORMAT_JSON)),
+            ('text direct', DebugLog.DebugLog('LPC', devnull, queued=False)),
+            ('slow queued', DebugLog.DebugLog('LPC', slow)),
+            ('slow direct', DebugLog.DebugLog('LPC', slow, queued=False)),
+        ]
+        print('%14s %14s' % ('statement', 'us/statement'))
+        for name, log in cases:
+            count = args.statements if not name.startswith('slow') else max(1, args.statements//100)
+            if(log == None):
+                seconds = timeEagerPrint(devnull, count)
+            else:
+                seconds = timePerStatement(log.logger.debug, count)
+                log.close()
+            print('%14s %14.2f' % (name, 1e6*seconds))
+
+    seeds = range(args.seeds)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'debug.log')
+        cases = [
+            ('off', {}),
+            ('info text', {'debugFile': path, 'logLevel': 'info'}),
+            ('debug text', {'debugFile': path}),
+            ('debug json', {'debugFile': path, 'logFormat': 'json'}),
+        ]
+        print()
+        print('%14s %14s %14s' % ('logging', 'step ms', 'closedLoop ms'))
+        for name, settings in cases:
+            times = []
+            for mode in ['step', 'closedLoop']:
+                modeSettings = dict(settings)
+                modeSettings['landingMode'] = mode
+                times.append(1000*timeLandings(directory, seeds, modeSettings))
+            print('%14s %14.1f %14.1f' % (name, times[0], times[1]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      MetricsBenchmark
+Purpose:   Measures the cost of the Metrics instrumentation: the time to record one histogram value and
+           add to one counter, the time to format every metric for a Prometheus scrape, and the real time
+           per simulated landing of LandingPlatformController with metrics kept and with them switched off.
+
+           Usage:     python3 MetricsBenchmark.py [--records 1000000] [--seeds 20]
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import Metrics
+from Simulation import LandingSimulation
+
+def timePerCall(call, values):
+    """
+    Function:    timePerCall
+    Purpose:     Measure the seconds taken by each call
+    Inputs:      call - a function taking one value
+                 values - a list of values, each passed to one call
+    Outputs:     a floating point value in seconds per call
+    Description: See purpose.
+    """
+    start = time.perf_counter()
+    for value in values:
+        call(value)
+    return (time.perf_counter() - start)/len(values)
+
+def timeLandings(seeds, settings):
+    """
+    Function:    timeLandings
+    Purpose:     Measure the real seconds taken by each simulated landing
+    Inputs:      seeds - a sequence of seed values
+                 settings - a dictionary value of controller settings
+    Outputs:     a floating point value in seconds per landing
+    Description: See purpose.
+    """
+    start = time.perf_counter()
+    for seed in seeds:
+        simulation = LandingSimulation(seed, settings=settings)
+        try:
+            simulation.run()
+        finally:
+            simulation.close()
+    return (time.perf_counter() - start)/len(seeds)
+
+def main():
+    """
+    Function:    main
+    Purpose:     Parse the arguments and print the cost of the metrics per call, per scrape and per landing
+    Inputs:      None
+    Outputs:     None
+    Description: See purpose.
+    """
+    parser = argparse.ArgumentParser(description='Measure the cost of the Metrics instrumentation per call and per simulated landing.')
+    parser.add_argument('--records', type=int, default=1000000, help='values recorded per timing')
+    parser.add_argument('--seeds', type=int, default=20, help='simulated landings timed per case')
+    args = parser.parse_args()
+
+    draw = random.Random(0)
+    values = [draw.lognormvariate(-6, 1) for _ in range(args.records)]
+    registry = Metrics.MetricsRegistry()
+    histogram = registry.histogram('benchmark_seconds', 'Benchmark values')
+    counter = registry.counter('benchmark_total', 'Benchmark count')
+    for state in ['ACQUIRE', 'ALIGN', 'DESCEND', 'FINAL_OFFSET', 'TOUCHDOWN']:
+        registry.histogram('landing_state_iterations', 'Ticks per state', lowest=1, highest=1e6, state=state).record(3)
+    print('%24s %12.3f us' % ('histogram record', 1e6*timePerCall(histogram.record, values)))
+    print('%24s %12.3f us' % ('counter add', 1e6*timePerCall(counter.add, values)))
+    start = time.perf_counter()
+    text = registry.formatPrometheus()
+    print('%24s %12.3f ms, %d bytes' % ('format scrape', 1000*(time.perf_counter() - start), len(text)))
+    for percent in (50, 90, 99):
+        exact = sorted(values)[max(0, int(len(values)*percent/100.0) - 1)]
+        print('%24s %12.3f %% error' % ('p%d' % percent, 100*(histogram.percentile(percent) - exact)/exact))
+
+    seeds = range(args.seeds)
+    print()
+    print('%12s %14s %14s' % ('metrics', 'step ms', 'closedLoop ms'))
+    for name, enabled in [('off', False), ('on', True)]:
+        times = [1000*timeLandings(seeds, {'landingMode': mode, 'metrics': enabled}) for mode in ['step', 'closedLoop']]
+        print('%12s %14.1f %14.1f' % (name, times[0], times[1]))
+
+if __name__ == '__main__':
+    main()
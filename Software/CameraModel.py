@@ -0,0 +1,428 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      CameraModel
+Purpose:   This file contains the camera model used by the LandingPlatformController class to
+           convert pixel coordinates from the camera into world coordinates. The pinhole terms
+           for every pixel column and row of the frame are computed once into lookup tables, so
+           a conversion is a table lookup and a multiply by the height. Arrays of pixels and
+           heights are converted in a single NumPy operation, which is also used to reprocess
+           recorded flight logs.
+
+           world = height*(pixelSize/focalLength)*(pixel - offset)
+
+           If lens distortion coefficients are given, the tables instead hold the undistorted
+           ray of every pixel in the frame, found once by iterating the Brown-Conrady model in
+           reverse. That is too slow to repeat at every start, so the tables are cached on disk
+           as .npz files named by a hash of every parameter that went into them.
+
+           distorted = undistorted*(1 + k1*r^2 + k2*r^4 + k3*r^6) + tangential(p1, p2)
+
+           The firmware scripts run the sensor in different modes, each a window of a binned
+           sensor frame. The tables always cover the whole binned frame, and a mode only moves
+           the window origin, so an ROI that follows the target costs nothing to move. The camera
+           announces its mode, and ROI origin if it has one, with status code packets.
+
+           The footprint of the frame, the polygon of world points the camera can see at a
+           height, also scales with height, so it is traced once per window along every edge
+           pixel and kept as edge half-planes per meter of height. That bounds how far the UAV
+           can move in any direction without leaving the frame.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+#Distortion coefficients are given in the OpenCV order
+DISTORTION_TERMS = ('k1', 'k2', 'p1', 'p2', 'k3')
+
+#Fixed point iterations used to invert the distortion model, enough to converge well below a pixel for an M12 lens
+UNDISTORT_ITERATIONS = 20
+
+#Points traced along each edge of the frame footprint, more than two so distorted edges are followed
+FOOTPRINT_EDGE_POINTS = 8
+
+def bodyOffsetInCamera(roll, pitch, yaw, offset, frameAngle=0.0):
+    """
+    Function:    bodyOffsetInCamera
+    Purpose:     Rotate a point fixed on the UAV body into the camera frame
+    Inputs:      roll - a floating point value or NumPy array, Crazyflie stabilizer.roll in degrees
+                 pitch - a floating point value or NumPy array, Crazyflie stabilizer.pitch in degrees
+                 yaw - a floating point value or NumPy array, Crazyflie stabilizer.yaw in degrees
+                 offset - a list of x, y, z floating point values, the point from the UAV center in the body frame in meters
+                 frameAngle - a floating point value, the UAV frame offset angle from the camera frame in radians
+    Outputs:     a tuple of x, y, z NumPy arrays, the point from the UAV center in the camera frame in meters
+    Description: Uses the Z-Y-X rotation order of the Crazyflie. The Crazyflie logs pitch inverted from the right hand
+                 rule, so its sign is flipped here. The x-y result is then rotated from the UAV frame into the camera
+                 frame, the inverse of the transform used by _sendToHome.
+    """
+    r = np.radians(roll)
+    p = -np.radians(pitch)
+    w = np.radians(yaw)
+    cr, sr = np.cos(r), np.sin(r)
+    cp, sp = np.cos(p), np.sin(p)
+    cw, sw = np.cos(w), np.sin(w)
+    dx, dy, dz = offset
+    x = cw*cp*dx + (cw*sp*sr - sw*cr)*dy + (cw*sp*cr + sw*sr)*dz
+    y = sw*cp*dx + (sw*sp*sr + cw*cr)*dy + (sw*sp*cr - cw*sr)*dz
+    z = -sp*dx + cp*sr*dy + cp*cr*dz
+    ca, sa = np.cos(frameAngle), np.sin(frameAngle)
+    return x*ca - y*sa, x*sa + y*ca, z
+
+class CameraMode():
+    __slots__ = ('name', 'modeId', 'width', 'height', 'binning', 'xWindow', 'yWindow')
+
+    def __init__(self, name, modeId, width, height, binning, xWindow, yWindow):
+        """
+        Function:    __init__
+        Purpose:     Describe one camera window and resolution
+        Inputs:      name - a string value naming the mode
+                     modeId - an integer value the firmware announces for the mode, or None for modes built from settings
+                     width - an integer value, the frame x-size in pixels
+                     height - an integer value, the frame y-size in pixels
+                     binning - an integer value, the number of sensor pixels per frame pixel along each axis, 1 for VGA and 2 for QVGA
+                     xWindow - an integer value, the x-coordinate of the frame origin in the binned sensor frame
+                     yWindow - an integer value, the y-coordinate of the frame origin in the binned sensor frame
+        Outputs:     None
+        Description: See purpose.
+        """
+        self.name = name
+        self.modeId = modeId
+        self.width = width
+        self.height = height
+        self.binning = binning
+        self.xWindow = xWindow
+        self.yWindow = yWindow
+
+    def __repr__(self):
+        return "CameraMode(" + self.name + ", " + str(self.width) + "x" + str(self.height) + ", binning " + str(self.binning) + ")"
+
+#Modes used by the OpenMV scripts, set_windowing((w, h)) centers the window in the frame
+CAMERA_MODES = [
+    CameraMode('qvga', 0, 320, 240, 2, 0, 0),        #ir_track2.py
+    CameraMode('qvga240', 1, 240, 240, 2, 40, 0),    #frame_differencing_v2-3.py
+    CameraMode('vga450', 2, 450, 450, 1, 95, 15),    #tape_tracking_working_2.py, color_tracking_quad_v2.py
+    CameraMode('vga400', 3, 400, 400, 1, 120, 40),   #red-blue-LED-tracking.py
+    CameraMode('vga230', 4, 230, 230, 1, 205, 125),  #april_tag.py search window
+    CameraMode('roi150', 5, 150, 150, 1, 0, 0),      #april_tag.py tracking window, origin sent as an ROI
+]
+MODES_BY_ID = {mode.modeId: mode for mode in CAMERA_MODES}
+MODES_BY_NAME = {mode.name: mode for mode in CAMERA_MODES}
+
+def undistortGrid(width, height, fx, fy, cx, cy, distortion, iterations=UNDISTORT_ITERATIONS):
+    """
+    Function:    undistortGrid
+    Purpose:     Find the undistorted ray of every pixel in a frame
+    Inputs:      width - an integer value, the frame x-size in pixels
+                 height - an integer value, the frame y-size in pixels
+                 fx - a floating point value, the focal length in x-pixels
+                 fy - a floating point value, the focal length in y-pixels
+                 cx - a floating point value, the pixel x-coordinate of the optical center
+                 cy - a floating point value, the pixel y-coordinate of the optical center
+                 distortion - a list of k1, k2, p1, p2, k3 floating point coefficients
+                 iterations - an integer value denoting the number of fixed point iterations
+    Outputs:     a tuple of x, y NumPy arrays of shape (height, width), in meters per meter of height
+    Description: The whole frame is iterated at once, using the same fixed point method as OpenCV undistortPoints.
+    """
+    k1, k2, p1, p2, k3 = (list(distortion) + [0.0]*len(DISTORTION_TERMS))[:len(DISTORTION_TERMS)]
+    v, u = np.mgrid[0:height, 0:width].astype(float)
+    x0 = (u - cx)/fx
+    y0 = (v - cy)/fy
+    x = x0.copy()
+    y = y0.copy()
+    for _ in range(iterations):
+        r2 = x*x + y*y
+        radial = 1/(1 + r2*(k1 + r2*(k2 + r2*k3)))
+        dx = 2*p1*x*y + p2*(r2 + 2*x*x)
+        dy = p1*(r2 + 2*y*y) + 2*p2*x*y
+        x = (x0 - dx)*radial
+        y = (y0 - dy)*radial
+    return x, y
+
+def loadUndistortionTable(cacheDir, width, height, fx, fy, cx, cy, distortion):
+    """
+    Function:    loadUndistortionTable
+    Purpose:     Get the undistortion tables for a frame, from the disk cache if possible
+    Inputs:      cacheDir - a string value, the directory holding cached tables, or None to never cache
+                 width, height, fx, fy, cx, cy, distortion - see undistortGrid
+    Outputs:     a tuple of x, y NumPy arrays of shape (height, width)
+    Description: The cache file name is a hash of every input, so changed settings never load a stale table. A cache
+                 that cannot be read or written is ignored and the tables are computed.
+    """
+    params = repr((int(width), int(height), float(fx), float(fy), float(cx), float(cy), tuple(float(d) for d in distortion), UNDISTORT_ITERATIONS))
+    path = None
+    if(cacheDir != None):
+        path = os.path.join(os.path.expanduser(cacheDir), "undistort-" + hashlib.sha1(params.encode('ascii')).hexdigest()[:16] + ".npz")
+        try:
+            with np.load(path) as cached:
+                return cached['x'], cached['y']
+        except (OSError, KeyError, ValueError):
+            pass
+
+    x, y = undistortGrid(width, height, fx, fy, cx, cy, distortion)
+
+    if(path != None):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            #Write to a temporary name first so a partial file is never loaded
+            with open(path + ".tmp", 'wb') as cacheFile:
+                np.savez(cacheFile, x=x, y=y, params=np.array(params))
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+    return x, y
+
+class CameraModel():
+    __slots__ = ('mode', 'fullWidth', 'fullHeight', 'xScale', 'yScale', 'xCenter', 'yCenter', 'xWindow', 'yWindow',
+                 'distorted', 'xTable', 'yTable', '_xList', '_yList', '_footprint', '_edgeNormals', '_edgeOffsets', '_edgeStarts', '_edgeVectors')
+
+    def __init__(self, mode, focalLength, xImage, yImage, xSensor, ySensor, xActive, yActive, intrinsics=None, distortion=None, cacheDir=None):
+        """
+        Function:    __init__
+        Purpose:     Build the pixel to world lookup tables for a camera mode
+        Inputs:      mode - a CameraMode value
+                     focalLength - a floating point value, the lens focal length in meters
+                     xImage - a floating point value, the sensor x-size in meters
+                     yImage - a floating point value, the sensor y-size in meters
+                     xSensor - an integer value, the sensor x-size in pixels
+                     ySensor - an integer value, the sensor y-size in pixels
+                     xActive - an integer value, the active sensor x-size in pixels
+                     yActive - an integer value, the active sensor y-size in pixels
+                     intrinsics - a list of fx, fy, cx, cy floating point values in full resolution sensor pixels, or None to derive them from the values above
+                     distortion - a list of k1, k2, p1, p2, k3 floating point values, or None for a distortion free lens
+                     cacheDir - a string value, the directory used to cache undistortion tables, or None to never cache
+        Outputs:     None
+        Description: Without distortion each table holds the world offset, in meters per meter of height, of one pixel
+                     column or row of the binned sensor frame. With distortion x and y no longer separate, so the tables
+                     hold one entry per pixel.
+        """
+        self.mode = mode
+        binning = mode.binning
+        self.fullWidth = int(xActive)//binning
+        self.fullHeight = int(yActive)//binning
+
+        #Focal length and optical center in full resolution pixels, then scaled to the binned frame
+        if(intrinsics != None):
+            fx, fy, cx, cy = intrinsics
+        else:
+            fx = focalLength/(xImage/xSensor)
+            fy = focalLength/(yImage/ySensor)
+            cx = xActive/2
+            cy = yActive/2
+        self.xScale = binning/fx
+        self.yScale = binning/fy
+        self.xCenter = cx/binning
+        self.yCenter = cy/binning
+        self.xWindow = mode.xWindow
+        self.yWindow = mode.yWindow
+
+        self.distorted = distortion != None and any(distortion)
+        if(self.distorted):
+            self.xTable, self.yTable = loadUndistortionTable(cacheDir, self.fullWidth, self.fullHeight, 1/self.xScale, 1/self.yScale, self.xCenter, self.yCenter, distortion)
+            self._xList = None
+            self._yList = None
+        else:
+            self.xTable = self.xScale*(np.arange(self.fullWidth) - self.xCenter)
+            self.yTable = self.yScale*(np.arange(self.fullHeight) - self.yCenter)
+            #Plain lists are faster than NumPy arrays for converting a single point
+            self._xList = self.xTable.tolist()
+            self._yList = self.yTable.tolist()
+        self._footprint = None
+        self._edgeNormals = None
+        self._edgeOffsets = None
+        self._edgeStarts = None
+        self._edgeVectors = None
+
+    def setRoi(self, xRoi=None, yRoi=None):
+        """
+        Function:    setRoi
+        Purpose:     Move the frame origin for modes whose window follows the target
+        Inputs:      xRoi - an integer value, the x-coordinate of the ROI origin from the mode window origin, or None to leave it
+                     yRoi - an integer value, the y-coordinate of the ROI origin from the mode window origin, or None to leave it
+        Outputs:     None
+        Description: Only the lookup offset changes, the tables are untouched.
+        """
+        if(xRoi != None):
+            self.xWindow = self.mode.xWindow + xRoi
+        if(yRoi != None):
+            self.yWindow = self.mode.yWindow + yRoi
+        #The footprint follows the window
+        self._footprint = None
+        return
+
+    def pixelToWorld(self, x, y, height):
+        """
+        Function:    pixelToWorld
+        Purpose:     Convert one pixel coordinate to world coordinates
+        Inputs:      x - an integer value denoting the pixel x-coordinate in the mode frame
+                     y - an integer value denoting the pixel y-coordinate in the mode frame
+                     height - a floating point value denoting the distance in meters of the UAV from the camera
+        Outputs:     a tuple of x, y floating point values in meters
+        Description: Pixels outside the sensor fall back to the pinhole formula rather than the table.
+        """
+        u = x + self.xWindow
+        v = y + self.yWindow
+        if(0 <= u < self.fullWidth and 0 <= v < self.fullHeight):
+            if(self.distorted):
+                return height*float(self.xTable[v, u]), height*float(self.yTable[v, u])
+            return height*self._xList[u], height*self._yList[v]
+        return height*self.xScale*(u - self.xCenter), height*self.yScale*(v - self.yCenter)
+
+    def toWorld(self, x, y, height):
+        """
+        Function:    toWorld
+        Purpose:     Convert arrays of pixel coordinates to world coordinates
+        Inputs:      x - an array of integer pixel x-coordinates in the mode frame
+                     y - an array of integer pixel y-coordinates in the mode frame
+                     height - a floating point value, or an array with one height per pixel, in meters
+        Outputs:     a tuple of x, y NumPy arrays in meters
+        Description: Pixels outside the sensor fall back to the pinhole formula rather than the table, which ignores any
+                     distortion.
+        """
+        u = np.asarray(x, dtype=np.intp) + self.xWindow
+        v = np.asarray(y, dtype=np.intp) + self.yWindow
+        height = np.asarray(height, dtype=float)
+        uInside = np.clip(u, 0, self.fullWidth - 1)
+        vInside = np.clip(v, 0, self.fullHeight - 1)
+        if(self.distorted):
+            xWorld = self.xTable[vInside, uInside]
+            yWorld = self.yTable[vInside, uInside]
+        else:
+            xWorld = self.xTable[uInside]
+            yWorld = self.yTable[vInside]
+        xOutside = (u != uInside)
+        yOutside = (v != vInside)
+        if(xOutside.any()):
+            xWorld = np.where(xOutside, self.xScale*(u - self.xCenter), xWorld)
+        if(yOutside.any()):
+            yWorld = np.where(yOutside, self.yScale*(v - self.yCenter), yWorld)
+        return xWorld*height, yWorld*height
+
+    def _buildFootprint(self):
+        """
+        Function:    _buildFootprint
+        Purpose:     Trace the frame footprint at one meter of height
+        Inputs:      None
+        Outputs:     None
+        Description: The edge pixels of the mode window are converted to world coordinates in counter clockwise order,
+                     and each polygon edge is stored as an inward unit normal n and offset c so that a point p is inside
+                     the edge when n.p >= c. For a distorted lens the footprint may be slightly non convex, in which case
+                     testing every half-plane gives a little less than the polygon, which errs on the safe side.
+        """
+        right = self.mode.width - 1
+        bottom = self.mode.height - 1
+        steps = np.linspace(0.0, 1.0, FOOTPRINT_EDGE_POINTS, endpoint=False)
+        xPixels = np.concatenate((steps*right, np.full_like(steps, right), right - steps*right, np.zeros_like(steps)))
+        yPixels = np.concatenate((np.zeros_like(steps), steps*bottom, np.full_like(steps, bottom), bottom - steps*bottom))
+        xWorld, yWorld = self.toWorld(np.rint(xPixels), np.rint(yPixels), 1.0)
+        points = np.column_stack((xWorld, yWorld))
+
+        #Shoelace area, negative when the points run clockwise
+        area = np.sum(points[:, 0]*np.roll(points[:, 1], -1) - np.roll(points[:, 0], -1)*points[:, 1])
+        if(area < 0):
+            points = points[::-1]
+        edges = np.roll(points, -1, axis=0) - points
+        lengths = np.hypot(edges[:, 0], edges[:, 1])
+        keep = lengths > 0
+        normals = np.column_stack((-edges[keep, 1], edges[keep, 0]))/lengths[keep, None]
+        self._footprint = points
+        self._edgeNormals = normals
+        self._edgeOffsets = np.sum(normals*points[keep], axis=1)
+        self._edgeStarts = points[keep]
+        self._edgeVectors = edges[keep]
+        return
+
+    def footprint(self, height):
+        """
+        Function:    footprint
+        Purpose:     Get the polygon of world points the camera can see at a height
+        Inputs:      height - a floating point value denoting the distance in meters from the camera
+        Outputs:     an Nx2 NumPy array of x, y polygon vertices in meters, counter clockwise
+        Description: See purpose.
+        """
+        if(self._footprint is None):
+            self._buildFootprint()
+        return self._footprint*height
+
+    def contains(self, x, y, height, margin=0.0):
+        """
+        Function:    contains
+        Purpose:     Determine if a world point is inside the frame footprint
+        Inputs:      x - a floating point value denoting the world x-coordinate in meters
+                     y - a floating point value denoting the world y-coordinate in meters
+                     height - a floating point value denoting the distance in meters from the camera
+                     margin - a floating point value, the distance the point must be inside every edge, in meters per meter of height
+        Outputs:     a boolean value
+        Description: See purpose.
+        """
+        if(self._footprint is None):
+            self._buildFootprint()
+        inside = self._edgeNormals[:, 0]*x + self._edgeNormals[:, 1]*y - height*(self._edgeOffsets + margin)
+        return bool(np.all(inside >= 0))
+
+    def maxStep(self, x, y, dx, dy, height, margin=0.0):
+        """
+        Function:    maxStep
+        Purpose:     Find how far a point may move in a direction before leaving the frame footprint
+        Inputs:      x - a floating point value denoting the world x-coordinate in meters
+                     y - a floating point value denoting the world y-coordinate in meters
+                     dx - a floating point value, the x-component of the direction
+                     dy - a floating point value, the y-component of the direction
+                     height - a floating point value denoting the distance in meters from the camera
+                     margin - a floating point value, the distance to stay inside every edge, in meters per meter of height
+        Outputs:     a floating point distance in meters along the direction, infinite if the direction is zero
+        Description: The step ends where the point would cross an edge moved in by the margin. Only edges the direction
+                     heads towards and whose segment the path actually crosses count, so the bulges of a distorted
+                     footprint are not cut off. An edge the point is already outside of stops all movement towards it,
+                     while movement back inside is not limited, so a UAV near the edge can always be brought back.
+        """
+        length = np.hypot(dx, dy)
+        if(length == 0):
+            return np.inf
+        if(self._footprint is None):
+            self._buildFootprint()
+        normals = self._edgeNormals
+        approach = -(normals[:, 0]*dx + normals[:, 1]*dy)/length
+        clearance = normals[:, 0]*x + normals[:, 1]*y - height*(self._edgeOffsets + margin)
+        towards = approach > 0
+        if(towards.any() == False):
+            return np.inf
+        normals = normals[towards]
+        steps = np.maximum(0.0, clearance[towards]/approach[towards])
+
+        #Position of each crossing along its inset edge, 0 at the start and 1 at the end
+        starts = self._edgeStarts[towards]
+        vectors = self._edgeVectors[towards]
+        crossX = x + steps*dx/length - height*(starts[:, 0] + margin*normals[:, 0])
+        crossY = y + steps*dy/length - height*(starts[:, 1] + margin*normals[:, 1])
+        along = (crossX*vectors[:, 0] + crossY*vectors[:, 1])/(height*np.sum(vectors*vectors, axis=1))
+        crossed = (along >= -1e-6) & (along <= 1 + 1e-6)
+        if(crossed.any() == False):
+            #Only possible through rounding at a vertex, fall back to every half-plane
+            return float(np.min(steps))
+        return float(np.min(steps[crossed]))
@@ -0,0 +1,388 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      CameraProtocol
+Purpose:   This file describes the packet formats sent by the OpenMV camera scripts to the
+           LandingPlatformController class. Two formats are supported. The original ASCII
+           format, {xxx$yyy}, and a fixed width binary format that carries a frame counter,
+           a capture timestamp and a CRC so that the host can detect dropped or corrupted
+           packets without any string handling.
+
+           Binary packet layout, little endian, 16 bytes:
+               sync    2 bytes  0xA5 0x5A
+               frame   uint16   frame counter, wraps at 65535
+               tick    uint32   camera capture time in milliseconds (pyb.millis)
+               x       uint16   x pixel coordinate, or the status code if status is not zero
+               y       uint16   y pixel coordinate, or the status code if status is not zero
+               status  uint16   0 for a valid fix, otherwise 900/901/902/904
+               crc     uint16   CRC-16/CCITT-FALSE over the frame..status fields
+
+           Any change to this layout must also be made in the OpenMV scripts, which carry
+           their own copy of the encoder since MicroPython cannot import this file.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import collections
+import enum
+import re
+import struct
+
+import numpy
+
+#Names of the supported packet formats
+FORMAT_ASCII = 'ascii'
+FORMAT_BINARY = 'binary'
+
+#Binary packet definition, see file description for the layout
+BINARY_SYNC = b'\xa5\x5a'
+BINARY_STRUCT = struct.Struct('<2sHIHHHH')
+BINARY_PACKET_LENGTH = BINARY_STRUCT.size
+_BINARY_CRC_START = len(BINARY_SYNC)
+_BINARY_CRC_END = BINARY_PACKET_LENGTH - 2
+
+#Binary packet layout as a NumPy record so that a whole buffer of packets can be viewed without copying
+BINARY_DTYPE = numpy.dtype([('sync', '<u2'), ('frame', '<u2'), ('tick', '<u4'), ('x', '<u2'), ('y', '<u2'), ('status', '<u2'), ('crc', '<u2')])
+_BINARY_SYNC_VALUE = struct.unpack('<H', BINARY_SYNC)[0]
+
+#Number of digits in each coordinate of an ASCII packet, the camera pads every value to this width
+ASCII_DIGITS = 3
+
+#A batch of decoded packets, every field is a NumPy array with one entry per packet.
+#frame, tick and status are None for ASCII packets.
+PacketBatch = collections.namedtuple('PacketBatch', ['x', 'y', 'frame', 'tick', 'status'])
+
+#A single parsed camera packet, timestamp is the host monotonic time the packet was parsed and made available.
+#frame and tick are the camera frame counter and capture time, they are None for ASCII packets.
+#status is zero for a valid fix, otherwise it holds the CameraStatus code sent in place of the coordinates.
+#receiveTime is the host monotonic time the bytes were read from USB, and id is a sequence number unique to the reader.
+CameraFix = collections.namedtuple('CameraFix', ['timestamp', 'x', 'y', 'frame', 'tick', 'status', 'receiveTime', 'id'])
+
+#The fixes in a window of packets that hold a position, and a count of every status seen in that window
+FixWindow = collections.namedtuple('FixWindow', ['fixes', 'counts'])
+
+class CameraStatus(enum.IntEnum):
+    #Codes sent by the camera firmware in place of a coordinate pair
+    FIX = 0
+    NONE = 900
+    TOO_MANY_BLOBS = 901
+    BACKGROUND_RESET = 902
+    STANDBY = 904
+    #Announcements of the camera geometry, the value is carried in the y coordinate
+    MODE = 905
+    ROI_X = 906
+    ROI_Y = 907
+
+#Strings sent to the camera during the handshake to select a packet format
+ASCII_START_STRING = 'start'
+BINARY_START_STRING = 'bstrt'
+
+def _buildCrcTable():
+    """
+    Function:    _buildCrcTable
+    Purpose:     Precompute the CRC-16/CCITT-FALSE lookup table
+    Inputs:      None
+    Outputs:     a list of 256 integer values
+    Description: Polynomial 0x1021, processed most significant bit first.
+    """
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            if(crc & 0x8000):
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+        table.append(crc)
+    return table
+
+_CRC_TABLE = _buildCrcTable()
+_CRC_TABLE_ARRAY = numpy.array(_CRC_TABLE, dtype=numpy.uint16)
+
+def crc16(data, start=0, end=None):
+    """
+    Function:    crc16
+    Purpose:     Calculate the CRC-16/CCITT-FALSE of a range of bytes
+    Inputs:      data - a bytes-like object
+                 start - an integer index of the first byte to include
+                 end - an integer index one past the last byte to include, defaults to the end of data
+    Outputs:     an integer value from 0 to 65535
+    Description: Table driven so that the host only does one lookup per byte.
+    """
+    if(end == None):
+        end = len(data)
+    crc = 0xFFFF
+    table = _CRC_TABLE
+    for i in range(start, end):
+        crc = ((crc << 8) & 0xFFFF) ^ table[((crc >> 8) ^ data[i]) & 0xFF]
+    return crc
+
+def encodeBinaryPacket(frame, tick, x, y, status=0):
+    """
+    Function:    encodeBinaryPacket
+    Purpose:     Build a binary camera packet
+    Inputs:      frame - an integer frame counter, only the low 16 bits are kept
+                 tick - an integer capture time in milliseconds, only the low 32 bits are kept
+                 x - an integer x pixel coordinate
+                 y - an integer y pixel coordinate
+                 status - an integer status code, zero for a valid fix
+    Outputs:     a bytes value of length BINARY_PACKET_LENGTH
+    Description: Mirrors the encoder in the OpenMV scripts. Used on the host for testing.
+    """
+    packet = bytearray(BINARY_STRUCT.pack(BINARY_SYNC, frame & 0xFFFF, tick & 0xFFFFFFFF, x, y, status, 0))
+    struct.pack_into('<H', packet, _BINARY_CRC_END, crc16(packet, _BINARY_CRC_START, _BINARY_CRC_END))
+    return bytes(packet)
+
+def decodeBinaryPacket(buffer, offset=0):
+    """
+    Function:    decodeBinaryPacket
+    Purpose:     Decode a single binary camera packet
+    Inputs:      buffer - a memoryview, bytes or bytearray that holds the packet
+                 offset - an integer index of the first sync byte within buffer
+    Outputs:     a tuple of (frame, tick, x, y, status), or None if the sync word or CRC do not match
+    Description: Decoding is done in place with struct.unpack_from so that no intermediate copies are made.
+    """
+    sync, frame, tick, x, y, status, crc = BINARY_STRUCT.unpack_from(buffer, offset)
+    if(sync != BINARY_SYNC):
+        return None
+    if(crc16(buffer, offset + _BINARY_CRC_START, offset + _BINARY_CRC_END) != crc):
+        return None
+    return frame, tick, x, y, status
+
+def _crc16Rows(rows):
+    """
+    Function:    _crc16Rows
+    Purpose:     Calculate the CRC-16/CCITT-FALSE of many equal length byte rows at once
+    Inputs:      rows - a two dimensional uint8 NumPy array, one row per packet
+    Outputs:     a uint16 NumPy array with one CRC per row
+    Description: Runs the same table driven algorithm as crc16, one byte column at a time across every row.
+    """
+    crc = numpy.full(rows.shape[0], 0xFFFF, dtype=numpy.uint16)
+    for column in range(rows.shape[1]):
+        crc = (crc << 8) ^ _CRC_TABLE_ARRAY[(crc >> 8) ^ rows[:, column]]
+    return crc
+
+def decodeBinaryBatch(buffer, end=None):
+    """
+    Function:    decodeBinaryBatch
+    Purpose:     Decode every complete binary packet in a buffer in one pass
+    Inputs:      buffer - a bytes or bytearray value holding raw camera data
+                 end - an integer index one past the last valid byte in buffer, defaults to the end of buffer
+    Outputs:     a tuple of (batch, consumed)
+                 batch - a PacketBatch of NumPy arrays
+                 consumed - an integer number of bytes at the start of buffer that no longer need to be kept
+    Description: Starting at the first sync word, the buffer is viewed as an array of BINARY_DTYPE records with
+                 numpy.frombuffer. The sync word and CRC of every record are checked at once. If a record fails, the
+                 records before it are kept and decoding resumes at the next sync word after it. Any incomplete packet
+                 at the end of the buffer is not consumed so that it can be completed by the next read.
+    """
+    if(end == None):
+        end = len(buffer)
+    raw = numpy.frombuffer(buffer, dtype=numpy.uint8, count=end)
+    records = []
+    offset = 0
+    while(True):
+        index = buffer.find(BINARY_SYNC, offset, end)
+        if(index < 0):
+            #Keep the final byte in case it is the first half of a sync word
+            offset = max(offset, end - 1)
+            break
+        count = (end - index)//BINARY_PACKET_LENGTH
+        if(count == 0):
+            offset = index
+            break
+        packets = numpy.frombuffer(buffer, dtype=BINARY_DTYPE, count=count, offset=index)
+        rows = raw[index:index + count*BINARY_PACKET_LENGTH].reshape(count, BINARY_PACKET_LENGTH)
+        valid = (packets['sync'] == _BINARY_SYNC_VALUE) & (_crc16Rows(rows[:, _BINARY_CRC_START:_BINARY_CRC_END]) == packets['crc'])
+        invalid = numpy.flatnonzero(~valid)
+        if(len(invalid) == 0):
+            records.append(packets)
+            offset = index + count*BINARY_PACKET_LENGTH
+            break
+        records.append(packets[:invalid[0]])
+        offset = index + int(invalid[0])*BINARY_PACKET_LENGTH + 1
+
+    if(len(records) == 1):
+        packets = records[0].copy()
+    else:
+        packets = numpy.concatenate(records) if len(records) > 0 else numpy.empty(0, dtype=BINARY_DTYPE)
+    return PacketBatch(packets['x'], packets['y'], packets['frame'], packets['tick'], packets['status']), offset
+
+def buildAsciiPattern(serialLimiters, digits=ASCII_DIGITS):
+    """
+    Function:    buildAsciiPattern
+    Purpose:     Compile the regular expression used to find ASCII packets
+    Inputs:      serialLimiters - (char list) the start, split and end characters of a packet
+                 digits - an integer number of digits in each coordinate
+    Outputs:     a compiled regular expression with one group holding both coordinates and the split character
+    Description: See purpose.
+    """
+    start, split, end = [re.escape(limiter.encode('ascii')) for limiter in serialLimiters]
+    number = b'[0-9]{' + str(digits).encode('ascii') + b'}'
+    return re.compile(start + b'(' + number + split + number + b')' + end)
+
+def decodeAsciiBatch(buffer, pattern, end=None, digits=ASCII_DIGITS):
+    """
+    Function:    decodeAsciiBatch
+    Purpose:     Decode every complete ASCII packet in a buffer in one pass
+    Inputs:      buffer - a bytes or bytearray value holding raw camera data
+                 pattern - a compiled regular expression from buildAsciiPattern
+                 end - an integer index one past the last valid byte in buffer, defaults to the end of buffer
+                 digits - an integer number of digits in each coordinate, must match the pattern
+    Outputs:     a tuple of (batch, consumed)
+                 batch - a PacketBatch of NumPy arrays
+                 consumed - an integer number of bytes at the start of buffer that no longer need to be kept
+    Description: The regular expression finds every packet. Since every coordinate has the same number of digits the
+                 matches are joined and viewed as a two dimensional array of characters, which is converted to integers
+                 with a single matrix product. Everything up to the last end limiter is consumed, anything after it may
+                 be the start of a packet that has not been fully received.
+    """
+    if(end == None):
+        end = len(buffer)
+    with memoryview(buffer) as view:
+        matches = pattern.findall(view[:end])
+        #The final character of the pattern is always the end limiter
+        consumed = buffer.rfind(pattern.pattern[-1:], 0, end) + 1
+    if(len(matches) == 0):
+        empty = numpy.empty(0, dtype=numpy.int32)
+        return PacketBatch(empty, empty, None, None, None), consumed
+
+    characters = numpy.frombuffer(b''.join(matches), dtype=numpy.uint8).reshape(len(matches), 2*digits + 1)
+    weights = 10**numpy.arange(digits - 1, -1, -1, dtype=numpy.int32)
+    x = (characters[:, :digits] - ord('0')) @ weights
+    y = (characters[:, digits + 1:] - ord('0')) @ weights
+    return PacketBatch(x, y, None, None, None), consumed
+
+class CameraProtocol():
+
+    def __init__(self, initValue='{904$904}\r\n', outOfFrameValue='{900$900}\r\n', serialLimiters=['{','$','}']):
+        """
+        Function:    __init__
+        Purpose:     Setup a codec for the packets sent by the camera
+        Inputs:      initValue - (string) the packet sent by the camera while in standby
+                     outOfFrameValue - (string) the packet sent by the camera when the UAV is not detected within the frame
+                     serialLimiters - (char list) a list of character values that are used to parse a data packet from the camera
+        Outputs:     None
+        Description: Everything derived from the settings is worked out once here, so that decoding a packet or judging a
+                     window of packets never needs to touch the setting strings again. Any coordinate at or above the out
+                     of frame value is treated as a status code rather than a position.
+        """
+        self.initValue = initValue
+        self.initPacket = initValue.encode('ascii')
+        self.packetLength = len(initValue)
+        self.serialLimiters = serialLimiters
+
+        #Find the sentinel values for the camera, these indicate non-detection
+        self.outOfFrameX, self.outOfFrameY = self._parseValue(outOfFrameValue)
+        self.standbyX, self.standbyY = self._parseValue(initValue)
+        self.noneStatus = self.outOfFrameX
+
+        #Bytes that are not a complete packet are carried over to the next read, but never more than a few packets worth
+        self.maxCarry = 4*max(self.packetLength, BINARY_PACKET_LENGTH)
+        self.asciiPattern = buildAsciiPattern(serialLimiters)
+        self._startLimiter = serialLimiters[0].encode('ascii')
+
+    def decode(self, buffer, end=None, packetFormat=FORMAT_ASCII):
+        """
+        Function:    decode
+        Purpose:     Decode every complete packet in a buffer and classify each one
+        Inputs:      buffer - a bytes or bytearray value holding raw camera data
+                     end - an integer index one past the last valid byte in buffer, defaults to the end of buffer
+                     packetFormat - a string value, one of the FORMAT values
+        Outputs:     a tuple of (batch, consumed), see decodeAsciiBatch
+        Description: Binary packets carry their own status. ASCII packets are given the status of their x coordinate
+                     when either coordinate reaches the out of frame value, and zero otherwise.
+        """
+        if(packetFormat == FORMAT_BINARY):
+            return decodeBinaryBatch(buffer, end)
+
+        batch, consumed = decodeAsciiBatch(buffer, self.asciiPattern, end)
+        status = numpy.where((batch.x >= self.outOfFrameX) | (batch.y >= self.outOfFrameY), batch.x, 0)
+        return batch._replace(status=status), consumed
+
+    def countFailures(self, buffer, consumed, count, packetFormat=FORMAT_ASCII):
+        """
+        Function:    countFailures
+        Purpose:     Count the packets in the decoded part of a buffer that could not be decoded
+        Inputs:      buffer - the bytes or bytearray value given to decode
+                     consumed - an integer number of bytes, as returned by decode
+                     count - an integer number of packets decoded
+                     packetFormat - a string value, one of the FORMAT values
+        Outputs:     an integer value
+        Description: Every ASCII packet begins with the start limiter, so each start limiter that did not begin a decoded
+                     packet is a failure. A binary sync word may also appear inside a packet, so instead the bytes
+                     skipped over are rounded up to whole packets.
+        """
+        if(packetFormat == FORMAT_BINARY):
+            return -(-max(0, consumed - count*BINARY_PACKET_LENGTH)//BINARY_PACKET_LENGTH)
+        return max(0, buffer.count(self._startLimiter, 0, consumed) - count)
+
+    def makeFixes(self, batch, timestamp, receiveTime=None, firstId=0):
+        """
+        Function:    makeFixes
+        Purpose:     Convert a decoded batch into individual fix records
+        Inputs:      batch - a PacketBatch from decode
+                     timestamp - a floating point value denoting when the batch was parsed
+                     receiveTime - a floating point value denoting when the batch was read from USB, defaults to timestamp
+                     firstId - an integer value, the id given to the first fix, later fixes count up from it
+        Outputs:     a list of CameraFix values
+        Description: See purpose.
+        """
+        count = len(batch.x)
+        if(count == 0):
+            return []
+        if(receiveTime == None):
+            receiveTime = timestamp
+        frames = batch.frame.tolist() if batch.frame is not None else [None]*count
+        ticks = batch.tick.tolist() if batch.tick is not None else [None]*count
+        timestamps = [timestamp]*count
+        receiveTimes = [receiveTime]*count
+        ids = range(firstId, firstId + count)
+        return list(map(CameraFix, timestamps, batch.x.tolist(), batch.y.tolist(), frames, ticks, batch.status.tolist(), receiveTimes, ids))
+
+    def summarize(self, fixes):
+        """
+        Function:    summarize
+        Purpose:     Split a window of fixes into usable positions and a count of each status
+        Inputs:      fixes - a list of CameraFix values
+        Outputs:     a FixWindow value
+        Description: counts maps each status code seen, including CameraStatus.FIX for usable positions, to the number of
+                     times it was seen in the window.
+        """
+        counts = collections.Counter(fix.status for fix in fixes)
+        valid = [fix for fix in fixes if fix.status == CameraStatus.FIX]
+        return FixWindow(valid, counts)
+
+    def _parseValue(self, value):
+        """
+        Function:    _parseValue
+        Purpose:     Split an ASCII packet into its x and y values
+        Inputs:      value - (string) an ASCII packet
+        Outputs:     a tuple of integer x, y values
+        Description: Only used on the setting strings, live packets are decoded with decode.
+        """
+        xValue = int(value[value.rfind(self.serialLimiters[0])+1:value.rfind(self.serialLimiters[1])])
+        yValue = int(value[value.rfind(self.serialLimiters[1])+1:value.rfind(self.serialLimiters[2])])
+        return xValue, yValue
@@ -0,0 +1,405 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      CameraStream
+Purpose:   This file contains the background reader used by the LandingPlatformController
+           class to collect position packets from the camera module. A dedicated thread
+           drains the camera serial connection as packets arrive, parses them, and stores
+           them with a host timestamp in a fixed size ring buffer. The controller then
+           queries the ring buffer for the most recent fixes instead of blocking on the
+           serial connection every time it needs to make a decision.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import threading
+import time
+
+import serial
+
+import CameraProtocol
+import DebugLog
+
+class FixRing():
+
+    def __init__(self, size=256):
+        """
+        Function:    __init__
+        Purpose:     Setup a fixed size ring buffer of camera fixes
+        Inputs:      size - an integer value that determines how many fixes are kept before the oldest is overwritten
+        Outputs:     None
+        Description: The ring is written by a single thread and read by any number of threads. The writer stores the
+                     fix before publishing the new count, so readers never need to take a lock to get a consistent view.
+        """
+        self._size = int(size)
+        self._slots = [None]*self._size
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self._size)
+
+    def append(self, fix):
+        """
+        Function:    append
+        Purpose:     Store a new fix in the ring, overwriting the oldest fix if the ring is full
+        Inputs:      fix - a CameraFix value
+        Outputs:     None
+        Description: Must only be called from the single writer thread.
+        """
+        self._slots[self._count % self._size] = fix
+        self._count += 1
+        return
+
+    def getCount(self):
+        """
+        Function:    getCount
+        Purpose:     Report the total number of fixes ever written to the ring
+        Inputs:      None
+        Outputs:     an integer value that only ever increases
+        Description: Useful as a cheap way to check if new fixes have arrived since a previous query.
+        """
+        return self._count
+
+    def getLast(self, n):
+        """
+        Function:    getLast
+        Purpose:     Get the most recent fixes from the ring
+        Inputs:      n - an integer value denoting the maximum number of fixes to return
+        Outputs:     a list of CameraFix values ordered from oldest to newest
+        Description: See purpose.
+        """
+        count = self._count
+        n = min(int(n), count, self._size)
+        return [self._slots[i % self._size] for i in range(count - n, count)]
+
+    def getSince(self, timestamp):
+        """
+        Function:    getSince
+        Purpose:     Get all fixes in the ring that were received after a given time
+        Inputs:      timestamp - a floating point value in the time.monotonic() time base
+        Outputs:     a list of CameraFix values ordered from oldest to newest
+        Description: Walks backwards from the newest fix until an older fix is found, so the cost is proportional to the
+                     number of fixes returned.
+        """
+        count = self._count
+        fixes = []
+        for i in range(count - 1, max(count - self._size, 0) - 1, -1):
+            fix = self._slots[i % self._size]
+            if(fix.timestamp <= timestamp):
+                break
+            fixes.append(fix)
+        fixes.reverse()
+        return fixes
+
+class CameraReader(threading.Thread):
+
+    def __init__(self, camera, protocol, bufferSize=256, packetFormat=CameraProtocol.FORMAT_ASCII, threaded=True, recorder=None, metrics=None, log=None):
+        """
+        Function:    __init__
+        Purpose:     Setup the background camera reader
+        Inputs:      camera - an open serial.Serial object connected to the camera
+                     protocol - a CameraProtocol object used to decode packets from the camera
+                     bufferSize - an integer value denoting how many fixes are kept in the ring buffer
+                     packetFormat - a string value, one of the CameraProtocol FORMAT values, selecting how packets are parsed
+                     threaded - a boolean value, False if start will never be called and waitForFixes should read the camera itself
+                     recorder - a FlightRecorder.FlightRecorder value given the raw bytes of every read, or None
+                     metrics - a Metrics.MetricsRegistry value given the read times and packet counts, or None
+                     log - a logging.Logger value given read and listener failures, or None to write nothing
+        Outputs:     None
+        Description: The reader runs as a daemon thread so that it never keeps the process alive on its own. Call start to
+                     begin reading and stop to end it. If the camera connection fails the reader stops and reports it
+                     through failed, and waitForFixes raises rather than letting a dead camera look like a quiet one.
+        """
+        threading.Thread.__init__(self, name="CameraReader", daemon=True)
+        self._camera = camera
+        self._protocol = protocol
+        self._packetFormat = packetFormat
+        self._readBuffer = bytearray(4096)
+        self._carry = 0
+        self._receiveTime = None
+        self._threaded = threaded
+        self._recorder = recorder
+        self._metrics = metrics
+        self._log = log if log != None else DebugLog.DebugLog('CameraReader').logger
+        self._error = None
+        self._failedListeners = set()
+        if(metrics != None):
+            self._readTime = metrics.histogram('camera_read_seconds', 'Time taken by each read of the camera serial connection')
+            self._packetsParsed = metrics.counter('camera_packets_parsed_total', 'Camera packets decoded')
+            self._parseFailures = metrics.counter('camera_parse_failures_total', 'Camera packets that could not be decoded')
+
+        #Smallest difference seen between the host receive time and camera capture tick, maps ticks onto the host clock
+        self._clockOffset = None
+
+        self._ring = FixRing(bufferSize)
+        self._newFix = threading.Condition()
+        self._running = threading.Event()
+
+        #Callbacks given every new list of fixes, replaced rather than modified so it can be read without a lock
+        self._listeners = ()
+
+    def run(self):
+        """
+        Function:    run
+        Purpose:     Drain the camera serial connection until stopped
+        Inputs:      None
+        Outputs:     None
+        Description: Every complete packet from the camera is parsed into a fix and stored in the ring buffer. A short
+                     serial timeout is used so the thread can notice a stop request while the camera is quiet.
+        """
+        self._running.set()
+        self._camera.timeout = 0.1
+        while(self._running.is_set()):
+            try:
+                batch = self.readBatch()
+            except (serial.SerialException, OSError) as error:
+                #The connection failed underneath the reader, nothing more can be read
+                self._fail(error)
+                break
+            self._storeBatch(batch, time.monotonic(), self._receiveTime)
+        return
+
+    @property
+    def failed(self):
+        #A thread that has ended while still meant to be running was stopped by an error
+        return self._error != None or (self._running.is_set() and self.is_alive() == False)
+
+    def _fail(self, error):
+        """
+        Function:    _fail
+        Purpose:     Note that the camera connection has failed
+        Inputs:      error - the exception raised by the connection
+        Outputs:     None
+        Description: Queries waiting for fixes are woken so they can raise at once rather than wait out their timeout.
+        """
+        self._error = error
+        self._log.error("_fail - Camera connection failed: %s", error)
+        with self._newFix:
+            self._newFix.notify_all()
+        return
+
+    def stop(self):
+        """
+        Function:    stop
+        Purpose:     Halt the reader thread
+        Inputs:      None
+        Outputs:     None
+        Description: Blocks until the thread exits, which takes at most one serial timeout.
+        """
+        self._running.clear()
+        if(self.is_alive()):
+            self.join()
+        return
+
+    def poll(self):
+        """
+        Function:    poll
+        Purpose:     Read and store whatever the camera has sent without waiting
+        Inputs:      None
+        Outputs:     an integer number of fixes stored
+        Description: Used in place of the thread when the camera is driven by an event loop reader. Must not be called
+                     while the thread is running, since the ring buffer only supports a single writer. Once the camera
+                     connection has failed nothing more is read, and failed reports it.
+        """
+        if(self._error != None):
+            return 0
+        try:
+            if(self._camera.in_waiting == 0):
+                return 0
+            batch = self.readBatch()
+        except (serial.SerialException, OSError) as error:
+            self._fail(error)
+            return 0
+        self._storeBatch(batch, time.monotonic(), self._receiveTime)
+        return len(batch.x)
+
+    def addListener(self, callback):
+        """
+        Function:    addListener
+        Purpose:     Register a function to be given every new list of fixes
+        Inputs:      callback - a function that takes a list of CameraFix values
+        Outputs:     None
+        Description: The callback runs on whichever thread stores the fixes, so it must be quick and must not block.
+        """
+        self._listeners = self._listeners + (callback,)
+        return
+
+    def removeListener(self, callback):
+        """
+        Function:    removeListener
+        Purpose:     Remove a function registered with addListener
+        Inputs:      callback - a previously registered function
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._listeners = tuple(listener for listener in self._listeners if listener != callback)
+        return
+
+    def readBatch(self):
+        """
+        Function:    readBatch
+        Purpose:     Read everything waiting on the camera connection and decode every complete packet in it
+        Inputs:      None
+        Outputs:     a CameraProtocol.PacketBatch of NumPy arrays, possibly empty
+        Description: The waiting bytes are read with readinto directly behind any bytes carried over from the previous
+                     read, so the preallocated buffer only grows if the camera gets far ahead of the reader. If nothing is
+                     waiting, a single byte is requested so that the call blocks for at most one serial timeout. The time
+                     the read returned is kept for the fixes as their receive time, and the raw bytes are given to the recorder.
+                     The read time and the packets decoded and failed are counted when metrics are kept.
+        """
+        waiting = max(1, self._camera.in_waiting)
+        needed = self._carry + waiting
+        if(needed > len(self._readBuffer)):
+            grown = bytearray(2*needed)
+            grown[:self._carry] = self._readBuffer[:self._carry]
+            self._readBuffer = grown
+
+        buffer = self._readBuffer
+        with memoryview(buffer) as view:
+            if(self._metrics != None):
+                readStart = time.monotonic()
+            count = self._camera.readinto(view[self._carry:needed])
+            self._receiveTime = time.monotonic()
+            if(self._metrics != None):
+                self._readTime.record(self._receiveTime - readStart)
+            if(self._recorder != None and count):
+                self._recorder.recordPacket(self._receiveTime, view[self._carry:self._carry + count])
+        end = self._carry + (count or 0)
+
+        batch, consumed = self._protocol.decode(buffer, end, self._packetFormat)
+        if(self._metrics != None):
+            self._packetsParsed.add(len(batch.x))
+            self._parseFailures.add(self._protocol.countFailures(buffer, consumed, len(batch.x), self._packetFormat))
+
+        #Move any partial packet to the front of the buffer for the next read
+        consumed = max(consumed, end - self._protocol.maxCarry)
+        self._carry = end - consumed
+        buffer[:self._carry] = buffer[consumed:end]
+        return batch
+
+    def getLastFixes(self, n):
+        """
+        Function:    getLastFixes
+        Purpose:     Get the last n fixes received from the camera
+        Inputs:      n - an integer value denoting the maximum number of fixes to return
+        Outputs:     a list of CameraFix values ordered from oldest to newest
+        Description: Does not block or touch the serial connection.
+        """
+        return self._ring.getLast(n)
+
+    def getFixesSince(self, timestamp):
+        """
+        Function:    getFixesSince
+        Purpose:     Get all fixes received after a particular time
+        Inputs:      timestamp - a floating point value in the time.monotonic() time base
+        Outputs:     a list of CameraFix values ordered from oldest to newest
+        Description: Does not block or touch the serial connection.
+        """
+        return self._ring.getSince(timestamp)
+
+    def waitForFixes(self, n, timestamp, timeout=1.0, newest=False):
+        """
+        Function:    waitForFixes
+        Purpose:     Get n fixes received after a particular time, waiting for them if they have not yet arrived
+        Inputs:      n - an integer value denoting the number of fixes desired
+                     timestamp - a floating point value in the time.monotonic() time base
+                     timeout - a floating point value denoting the longest time to wait in seconds
+                     newest - a boolean value, return the newest n fixes after the time rather than the oldest
+        Outputs:     a list of at most n CameraFix values ordered from oldest to newest
+        Description: If enough fixes are already in the ring, this returns immediately. Otherwise it sleeps until the reader
+                     signals a new fix. If the timeout expires, whatever fixes are available are returned. Without the thread
+                     the camera is read here instead, each read waiting at most one serial timeout. If more fixes are needed
+                     and the camera connection has failed, an IOError is raised.
+        """
+        deadline = time.monotonic() + timeout
+        fixes = self._ring.getSince(timestamp)
+        while(len(fixes) < n):
+            if(self.failed):
+                raise IOError("CR: waitForFixes - camera connection failed: " + str(self._error))
+            remaining = deadline - time.monotonic()
+            if(remaining <= 0):
+                break
+            if(self._threaded):
+                with self._newFix:
+                    self._newFix.wait(remaining)
+            else:
+                self._camera.timeout = min(0.1, remaining)
+                try:
+                    batch = self.readBatch()
+                except (serial.SerialException, OSError) as error:
+                    self._fail(error)
+                    continue
+                self._storeBatch(batch, time.monotonic(), self._receiveTime)
+            fixes = self._ring.getSince(timestamp)
+        if(newest):
+            return fixes[-n:] if n > 0 else []
+        return fixes[:n]
+
+    def captureTime(self, fix):
+        """
+        Function:    captureTime
+        Purpose:     Estimate when the camera captured the frame behind a fix, on the host clock
+        Inputs:      fix - a CameraFix value
+        Outputs:     a floating point value in the time.monotonic() time base
+        Description: The capture tick is moved onto the host clock with the fastest packet seen, so the estimate is late by
+                     at most the minimum USB delay. Fixes without a tick use their receive time.
+        """
+        if(fix.tick == None or self._clockOffset == None):
+            return fix.receiveTime
+        return fix.tick/1000.0 + self._clockOffset
+
+    def _storeBatch(self, batch, timestamp, receiveTime=None):
+        """
+        Function:    _storeBatch
+        Purpose:     Place a decoded batch of packets into the ring buffer and wake any waiting queries
+        Inputs:      batch - a CameraProtocol.PacketBatch
+                     timestamp - a floating point value denoting when the batch was parsed
+                     receiveTime - a floating point value denoting when the batch was read from USB
+        Outputs:     None
+        Description: Each fix is given the ring count at the time it is stored as its id, so ids follow arrival order.
+                     A listener that raises is logged and skipped, so it cannot stop the reader or the other listeners. Only
+                     its first failure is logged in full, so a listener failing on every batch does not flood the log.
+        """
+        fixes = self._protocol.makeFixes(batch, timestamp, receiveTime, self._ring.getCount())
+        if(len(fixes) == 0):
+            return
+        if(batch.tick is not None and receiveTime != None):
+            offset = receiveTime - int(batch.tick.max())/1000.0
+            if(self._clockOffset == None or offset < self._clockOffset):
+                self._clockOffset = offset
+        for fix in fixes:
+            self._ring.append(fix)
+        with self._newFix:
+            self._newFix.notify_all()
+        for listener in self._listeners:
+            try:
+                listener(fixes)
+            except Exception:
+                if(listener in self._failedListeners):
+                    self._log.debug("_storeBatch - Camera listener %s failed again", getattr(listener, '__qualname__', listener))
+                else:
+                    self._failedListeners.add(listener)
+                    self._log.exception("_storeBatch - Camera listener %s failed", getattr(listener, '__qualname__', listener))
+        return
@@ -0,0 +1,143 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      DebugLog
+Purpose:   This file builds the leveled debug log used by the LandingPlatformController class.
+           Messages are given as a format string and its arguments, and are only formatted when
+           their level is enabled, so a disabled log costs a single level check per message.
+
+           Enabled messages are put on a queue and written by a background thread, so a slow
+           SD card never stalls the landing loop. Each message is written as one line, either
+           as text or as a JSON object for tools that read the log back.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+
+FORMAT_TEXT = 'text'
+FORMAT_JSON = 'json'
+
+#Level names accepted in place of the logging module constants
+LEVELS = {'debug': logging.DEBUG, 'info': logging.INFO, 'warning': logging.WARNING, 'error': logging.ERROR, 'critical': logging.CRITICAL}
+
+#Level of a log that writes nothing, above every level a message can have
+DISABLED = logging.CRITICAL + 1
+
+TEXT_FORMAT = '%(asctime)s.%(msecs)03d %(levelname)-7s %(name)s: %(message)s'
+TEXT_DATE_FORMAT = '%H:%M:%S'
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record):
+        """
+        Function:    format
+        Purpose:     Write a log record as a single line JSON object
+        Inputs:      record - a logging.LogRecord value
+        Outputs:     a string value
+        Description: time is the wall clock time in seconds since the epoch. Exceptions are added as a single string, so
+                     each record stays on one line.
+        """
+        entry = {'time': round(record.created, 6), 'level': record.levelname, 'logger': record.name, 'message': record.getMessage()}
+        if(record.exc_info):
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class _Logger(logging.Logger):
+
+    def findCaller(self, stack_info=False, stacklevel=1):
+        #Messages name their function themselves, so skip walking the stack for every message
+        return '(unknown file)', 0, '(unknown function)', None
+
+class _QueueHandler(logging.handlers.QueueHandler):
+
+    def prepare(self, record):
+        #Only merge the arguments, which may change once the message is queued, and leave the layout of the line to the
+        #writer thread. The standard handler formats the whole line here so that records can be sent to other processes.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+class DebugLog():
+
+    def __init__(self, name, stream=None, level=logging.DEBUG, logFormat=FORMAT_TEXT, queued=True):
+        """
+        Function:    __init__
+        Purpose:     Setup a log writing to a stream
+        Inputs:      name - a string value shown with every message, such as 'LPC'
+                     stream - a file object written to, or None for a log that writes nothing
+                     level - an integer logging level or a LEVELS name, messages below it are dropped unformatted
+                     logFormat - a string value, FORMAT_TEXT or FORMAT_JSON
+                     queued - a boolean value, write from a background thread rather than the thread logging the message
+        Outputs:     None
+        Description: The logger is not registered with the logging module, so every controller gets its own log and
+                     creating many controllers, as a simulation does, does not pile handlers onto a shared logger.
+        """
+        if(isinstance(level, str)):
+            level = LEVELS[level.lower()]
+        self.logger = _Logger(name)
+        self._stream = stream
+        self._listener = None
+        if(stream == None):
+            self.logger.setLevel(DISABLED)
+            return
+        self.logger.setLevel(level)
+
+        handler = logging.StreamHandler(stream)
+        if(logFormat == FORMAT_JSON):
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT, TEXT_DATE_FORMAT))
+        if(queued == True):
+            messages = queue.SimpleQueue()
+            self._listener = logging.handlers.QueueListener(messages, handler)
+            self._listener.start()
+            handler = _QueueHandler(messages)
+        self.logger.addHandler(handler)
+
+    def close(self, closeStream=False):
+        """
+        Function:    close
+        Purpose:     Write every queued message and stop the background writer
+        Inputs:      closeStream - a boolean value, also close the stream, for files the caller opened
+        Outputs:     None
+        Description: Messages logged after close are dropped.
+        """
+        if(self._listener != None):
+            self._listener.stop()
+            self._listener = None
+        for handler in list(self.logger.handlers):
+            handler.flush()
+            self.logger.removeHandler(handler)
+        self.logger.setLevel(DISABLED)
+        if(closeStream == True and self._stream != None):
+            self._stream.close()
+        self._stream = None
+        return
@@ -0,0 +1,153 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      DescentPlanner
+Purpose:   This file contains the planner used by the LandingPlatformController class to descend
+           in a few large combined moves rather than a staircase of small ones. The accuracy horn
+           allows a lateral error of onTargetFactor^(h - onTargetOffset) at height h, which is
+           tabulated once over the whole height range. Each move corrects the lateral error and
+           descends as far as the horn allows for the error expected to be left after the move.
+
+           allowed(h') >= errorFraction*|lateral error| + position uncertainty
+
+           The same model is stepped forward to predict how many moves, and how long, a landing
+           will take, so the prediction can be compared with the actual landing.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import collections
+import math
+
+import numpy as np
+
+#The predicted moves and time of a landing from a given height and lateral error
+DescentPrediction = collections.namedtuple('DescentPrediction', ['steps', 'duration'])
+
+#Most moves stepped by predict before giving up, reached only if the horn never admits the expected error
+MAX_PREDICTED_STEPS = 1000
+
+class DescentPlanner():
+
+    def __init__(self, onTargetFactor, onTargetOffset, minHeight, maxHeight, velocity, errorFraction=0.2, stepOverhead=0.5, resolution=0.01, tolerance=0.02):
+        """
+        Function:    __init__
+        Purpose:     Tabulate the accuracy horn over the height range
+        Inputs:      onTargetFactor - a floating point value greater than one, the horn width factor
+                     onTargetOffset - a floating point value, the horn offset in height in meters
+                     minHeight - a floating point value, the height at which the descent ends in meters
+                     maxHeight - a floating point value, the highest height the UAV may reach in meters
+                     velocity - a floating point value, the UAV speed along a move in meters per second
+                     errorFraction - a floating point value, the fraction of a lateral correction expected to be left over after the move
+                     stepOverhead - a floating point value, the time spent between moves sampling the camera in seconds
+                     resolution - a floating point value, the height step of the table in meters
+                     tolerance - a floating point value, the height within which minHeight counts as reached, and the smallest descent planned, in meters
+        Outputs:     None
+        Description: The horn widens with height, so the table is increasing and the lowest height that admits an error
+                     is found with a binary search.
+        """
+        self._minHeight = minHeight
+        self._velocity = velocity
+        self._errorFraction = errorFraction
+        self._stepOverhead = stepOverhead
+        self._tolerance = tolerance
+        count = max(2, int(math.ceil((maxHeight - minHeight)/resolution)) + 1)
+        self.heights = np.linspace(minHeight, max(maxHeight, minHeight + resolution), count)
+        self.allowed = np.power(float(onTargetFactor), self.heights - onTargetOffset)
+
+    def allowedError(self, height):
+        """
+        Function:    allowedError
+        Purpose:     Look up the lateral error allowed by the horn at a height
+        Inputs:      height - a floating point value in meters
+        Outputs:     a floating point value in meters
+        Description: Interpolated from the table, held at the ends outside of it.
+        """
+        return float(np.interp(height, self.heights, self.allowed))
+
+    def lowestHeight(self, error):
+        """
+        Function:    lowestHeight
+        Purpose:     Find the lowest height at which the horn allows a lateral error
+        Inputs:      error - a floating point value in meters
+        Outputs:     a floating point height in meters, or None if the error is too large at every height
+        Description: See purpose.
+        """
+        index = int(np.searchsorted(self.allowed, error))
+        if(index >= len(self.heights)):
+            return None
+        return float(self.heights[index])
+
+    def atBottom(self, height):
+        """
+        Function:    atBottom
+        Purpose:     Determine if the descent is finished
+        Inputs:      height - a floating point value, the current height in meters
+        Outputs:     a boolean value
+        Description: The measured height scatters around the end of the last move, so minHeight counts as reached within tolerance.
+        """
+        return height <= self._minHeight + self._tolerance
+
+    def nextMove(self, height, errorX, errorY, positionRadius=0.0):
+        """
+        Function:    nextMove
+        Purpose:     Plan one combined lateral and vertical move
+        Inputs:      height - a floating point value, the current height in meters
+                     errorX - a floating point value, the x-distance from the UAV to the landing position in meters
+                     errorY - a floating point value, the y-distance from the UAV to the landing position in meters
+                     positionRadius - a floating point value, the uncertainty of the UAV position in meters
+        Outputs:     a tuple of dx, dy, dz floating point values in meters, dz is zero when the horn does not allow a descent
+        Description: The move corrects the whole lateral error and descends to the lowest height that allows what is
+                     expected to be left of it, but never below minHeight and never upwards. Descents smaller than the
+                     tolerance are not worth a move and are left out.
+        """
+        residual = self._errorFraction*math.hypot(errorX, errorY) + positionRadius
+        target = self.lowestHeight(residual)
+        if(target == None or max(target, self._minHeight) > height - self._tolerance):
+            return errorX, errorY, 0.0
+        return errorX, errorY, max(target, self._minHeight) - height
+
+    def predict(self, height, error, positionRadius=0.0):
+        """
+        Function:    predict
+        Purpose:     Predict the moves and time needed to reach minHeight
+        Inputs:      height - a floating point value, the current height in meters
+                     error - a floating point value, the current lateral error in meters
+                     positionRadius - a floating point value, the uncertainty of the UAV position at the current height in meters
+        Outputs:     a DescentPrediction value
+        Description: nextMove is stepped assuming each move leaves errorFraction of its lateral correction plus the
+                     position uncertainty, which shrinks in proportion to the height as the camera sees the UAV larger.
+                     Each move takes its length over the velocity plus stepOverhead.
+        """
+        steps = 0
+        duration = 0.0
+        radiusPerMeter = positionRadius/height if height > 0 else 0.0
+        while(self.atBottom(height) == False and steps < MAX_PREDICTED_STEPS):
+            dx, dy, dz = self.nextMove(height, error, 0.0, radiusPerMeter*height)
+            steps += 1
+            duration += math.sqrt(dx*dx + dz*dz)/self._velocity + self._stepOverhead
+            height += dz
+            error = self._errorFraction*abs(dx) + radiusPerMeter*height
+        return DescentPrediction(steps, duration)
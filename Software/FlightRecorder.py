@@ -0,0 +1,349 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      FlightRecorder
+Purpose:   This file contains the flight recorder used by the LandingPlatformController class to
+           keep a binary record of every flight. Records are a fixed 64 bytes and are written with
+           struct.pack_into straight into a preallocated memory mapped file, so recording costs no
+           allocation, no system call and no lock. Once the file is full the oldest records are
+           overwritten.
+
+           header      - 64 bytes, see HEADER_DTYPE
+           records     - capacity slots of 64 bytes, see RECORD_DTYPE
+
+           Every record starts with the same 16 bytes, a time.monotonic() timestamp, a kind, a
+           kind specific code and length, and an id. The other 48 bytes depend on the kind and
+           are described by the dtypes in KIND_DTYPES, so a recording can be read without copying
+           with numpy.memmap and each kind viewed through its own dtype.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import datetime
+import itertools
+import math
+import mmap
+import struct
+import time
+
+import numpy as np
+
+import LandingStateMachine
+
+MAGIC = b'ARAVREC1'
+VERSION = 1
+HEADER_SIZE = 64
+RECORD_SIZE = 64
+
+#Bytes of a raw camera read held by one packet record
+PACKET_CHUNK = 48
+
+#Record kinds
+KIND_PACKET = 1
+KIND_FIX = 2
+KIND_TELEMETRY = 3
+KIND_COMMAND = 4
+KIND_TRANSITION = 5
+KIND_READING = 6
+
+#Command codes of KIND_COMMAND records
+COMMAND_MOVE = 1
+COMMAND_VELOCITY = 2
+COMMAND_ROTATE = 3
+COMMAND_LAUNCH = 4
+COMMAND_LAND = 5
+#Written when a command that blocks, such as a move, returns
+COMMAND_DONE = 6
+
+#Reading codes of KIND_READING records, values read back from the UAV that decisions depend on
+READ_HEIGHT = 1
+READ_BATTERY = 2
+
+#Header flags
+FLAG_BINARY_PACKETS = 1
+
+#Transition reasons of KIND_TRANSITION records, by code
+REASONS = ('tick', 'deadline', 'guard')
+
+#Stored in place of an id, state or integer field that has no value
+NO_ID = 0xFFFFFFFF
+NO_STATE = 0xFF
+NO_VALUE = -1
+
+HEADER_STRUCT = struct.Struct('<8sHHIQQdd16x')
+HEADER_DTYPE = np.dtype({'names': ['magic', 'version', 'recordSize', 'flags', 'capacity', 'count', 'startTime', 'startMonotonic'],
+                         'formats': ['S8', '<u2', '<u2', '<u4', '<u8', '<u8', '<f8', '<f8'],
+                         'offsets': [0, 8, 10, 12, 16, 24, 32, 40], 'itemsize': HEADER_SIZE})
+
+def _recordDtype(names, formats, offsets):
+    #Every record dtype shares the first 16 bytes and is padded to the record size
+    return np.dtype({'names': ['timestamp', 'kind', 'code', 'length', 'id'] + names,
+                     'formats': ['<f8', 'u1', 'u1', '<u2', '<u4'] + formats,
+                     'offsets': [0, 8, 9, 10, 12] + offsets, 'itemsize': RECORD_SIZE})
+
+RECORD_DTYPE = _recordDtype(['payload'], ['V48'], [16])
+PACKET_DTYPE = _recordDtype(['data'], ['S48'], [16])
+FIX_DTYPE = _recordDtype(['receiveTime', 'tick', 'x', 'y', 'frame', 'status'], ['<f8', '<i8', '<i4', '<i4', '<i4', '<u2'], [16, 24, 32, 36, 40, 44])
+TELEMETRY_DTYPE = _recordDtype(['uavTimestamp', 'vbat', 'x', 'y', 'z', 'chargeCurrent'], ['<i8', '<f8', '<f8', '<f8', '<f8', '<f8'], [16, 24, 32, 40, 48, 56])
+COMMAND_DTYPE = _recordDtype(['x', 'y', 'z', 'velocity'], ['<f8', '<f8', '<f8', '<f8'], [16, 24, 32, 40])
+TRANSITION_DTYPE = _recordDtype(['previous', 'next'], ['u1', 'u1'], [16, 17])
+READING_DTYPE = _recordDtype(['value'], ['<f8'], [16])
+
+KIND_DTYPES = {KIND_PACKET: PACKET_DTYPE, KIND_FIX: FIX_DTYPE, KIND_TELEMETRY: TELEMETRY_DTYPE,
+               KIND_COMMAND: COMMAND_DTYPE, KIND_TRANSITION: TRANSITION_DTYPE, KIND_READING: READING_DTYPE}
+
+#Writers matching the dtypes above, field for field
+_PACKET_STRUCT = struct.Struct('<dBBHI48s')
+_FIX_STRUCT = struct.Struct('<dBBHIdqiiiH18x')
+_TELEMETRY_STRUCT = struct.Struct('<dBBHIq5d')
+_COMMAND_STRUCT = struct.Struct('<dBBHI4d16x')
+_TRANSITION_STRUCT = struct.Struct('<dBBHIBB46x')
+_READING_STRUCT = struct.Struct('<dBBHId40x')
+
+class FlightRecorder():
+
+    def __init__(self, path, capacity=2**19, startMonotonic=None, flags=0):
+        """
+        Function:    __init__
+        Purpose:     Create a recording file and map it into memory
+        Inputs:      path - a string value, the file to record to, replaced if it exists
+                     capacity - an integer value denoting how many records the file holds before the oldest are overwritten
+                     startMonotonic - a floating point value in the time.monotonic() time base, taken at the same moment as
+                                      the wall clock start time, defaults to now
+                     flags - an integer value, FLAG values describing the recording, such as the camera packet format
+        Outputs:     None
+        Description: The file is sized once here. Its blocks are only allocated by the filesystem as records reach them.
+        """
+        self.path = path
+        self._capacity = int(capacity)
+        self._flags = flags
+        self._file = open(path, 'w+b')
+        self._file.truncate(HEADER_SIZE + self._capacity*RECORD_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), HEADER_SIZE + self._capacity*RECORD_SIZE)
+        #next() on a count is atomic, so writers on the camera, telemetry and landing threads never share a slot
+        self._slots = itertools.count()
+        self._count = 0
+        self._packetBytes = 0
+        #Wall clock and monotonic start times together place the recording in real time
+        self._startTime = datetime.datetime.now().timestamp()
+        self._startMonotonic = time.monotonic() if startMonotonic == None else startMonotonic
+        self._writeHeader()
+
+    def _writeHeader(self):
+        HEADER_STRUCT.pack_into(self._map, 0, MAGIC, VERSION, RECORD_SIZE, self._flags, self._capacity, self._count, self._startTime, self._startMonotonic)
+        return
+
+    def _offset(self):
+        #Claim the next slot, wrapping over the oldest record once the file is full
+        return HEADER_SIZE + (next(self._slots) % self._capacity)*RECORD_SIZE
+
+    def recordPacket(self, timestamp, data):
+        """
+        Function:    recordPacket
+        Purpose:     Record the raw bytes of one camera read
+        Inputs:      timestamp - a floating point value, when the bytes were read
+                     data - a bytes-like value
+        Outputs:     None
+        Description: The bytes are split over as many records as needed. The id of each record is the running byte count
+                     of the camera stream where its bytes start, modulo 2^32, so a reader can tell if bytes were lost to
+                     the file wrapping.
+        """
+        for start in range(0, len(data), PACKET_CHUNK):
+            chunk = bytes(data[start:start + PACKET_CHUNK])
+            _PACKET_STRUCT.pack_into(self._map, self._offset(), timestamp, KIND_PACKET, 0, len(chunk), self._packetBytes & NO_ID, chunk)
+            self._packetBytes += len(chunk)
+        return
+
+    def recordFixes(self, fixes):
+        """
+        Function:    recordFixes
+        Purpose:     Record parsed camera fixes
+        Inputs:      fixes - a list of CameraProtocol.CameraFix values
+        Outputs:     None
+        Description: Matches the CameraReader listener signature. Fields the packet format does not carry are stored as -1.
+        """
+        for fix in fixes:
+            _FIX_STRUCT.pack_into(self._map, self._offset(), fix.timestamp, KIND_FIX, 0, 0, fix.id & NO_ID, fix.receiveTime,
+                                  NO_VALUE if fix.tick == None else fix.tick, fix.x, fix.y, NO_VALUE if fix.frame == None else fix.frame, fix.status)
+        return
+
+    def recordTelemetry(self, packets):
+        """
+        Function:    recordTelemetry
+        Purpose:     Record UAV log packets
+        Inputs:      packets - a list of UAVController.TelemetryPacket values
+        Outputs:     None
+        Description: Matches the UAVController telemetry listener signature. Values missing from a packet are stored as NaN.
+        """
+        for packet in packets:
+            data = packet.data
+            _TELEMETRY_STRUCT.pack_into(self._map, self._offset(), packet.timestamp, KIND_TELEMETRY, 0, 0, 0, packet.uavTimestamp,
+                                        data.get('pm.vbat', math.nan), data.get('stateEstimate.x', math.nan), data.get('stateEstimate.y', math.nan),
+                                        data.get('stateEstimate.z', math.nan), data.get('pm.chargeCurrent', math.nan))
+        return
+
+    def recordCommand(self, timestamp, command, x=0.0, y=0.0, z=0.0, velocity=0.0, decisionId=None):
+        """
+        Function:    recordCommand
+        Purpose:     Record a command sent to the UAV
+        Inputs:      timestamp - a floating point value, when the command was sent
+                     command - an integer value, one of the COMMAND codes
+                     x, y, z - floating point values, the distances of a move, the velocity of a setpoint, or the angle of a rotation in x
+                     velocity - a floating point value, the speed of a move
+                     decisionId - an integer value, the LatencyTracer decision the command acted on, or None
+        Outputs:     None
+        Description: See purpose.
+        """
+        _COMMAND_STRUCT.pack_into(self._map, self._offset(), timestamp, KIND_COMMAND, command, 0, NO_ID if decisionId == None else decisionId & NO_ID,
+                                  x, y, z, velocity)
+        return
+
+    def recordReading(self, timestamp, reading, value):
+        """
+        Function:    recordReading
+        Purpose:     Record a value read back from the UAV
+        Inputs:      timestamp - a floating point value, when the value was read
+                     reading - an integer value, one of the READ codes
+                     value - a floating point value, or None if the UAV had nothing to report
+        Outputs:     None
+        Description: A value of None is stored as NaN.
+        """
+        _READING_STRUCT.pack_into(self._map, self._offset(), timestamp, KIND_READING, reading, 0, 0, math.nan if value == None else value)
+        return
+
+    def recordTransition(self, transition):
+        """
+        Function:    recordTransition
+        Purpose:     Record a change of landing state
+        Inputs:      transition - a LandingStateMachine.Transition value
+        Outputs:     None
+        Description: Matches the LandingStateMachine transition hook signature. States are stored by their index in
+                     LandingStateMachine.STATES and the reason by its index in REASONS.
+        """
+        previous = NO_STATE if transition.previous == None else LandingStateMachine.STATES.index(transition.previous)
+        _TRANSITION_STRUCT.pack_into(self._map, self._offset(), transition.timestamp, KIND_TRANSITION, REASONS.index(transition.reason), 0, 0,
+                                     previous, LandingStateMachine.STATES.index(transition.next))
+        return
+
+    def flush(self):
+        """
+        Function:    flush
+        Purpose:     Store the record count in the header and write the mapping out to the file
+        Inputs:      None
+        Outputs:     an integer number of records written so far
+        Description: The count is only kept up to date here, rather than on every record, to keep records cheap. Reading
+                     the counter would claim a slot, so the slot is claimed and blanked, which makes the stored count exact
+                     while records keep arriving. A reader of a recording that was never flushed can still find its records
+                     by their non-zero kind.
+        """
+        blank = next(self._slots)
+        offset = HEADER_SIZE + (blank % self._capacity)*RECORD_SIZE
+        self._map[offset:offset + RECORD_SIZE] = bytes(RECORD_SIZE)
+        self._count = blank + 1
+        self._writeHeader()
+        self._map.flush()
+        return self._count
+
+    def close(self):
+        """
+        Function:    close
+        Purpose:     Flush the recording and release the file
+        Inputs:      None
+        Outputs:     an integer number of records written
+        Description: Records written after close are an error.
+        """
+        count = self.flush()
+        self._map.close()
+        self._file.close()
+        return count
+
+class FlightRecording():
+
+    def __init__(self, path):
+        """
+        Function:    __init__
+        Purpose:     Open a recording for reading
+        Inputs:      path - a string value, a file written by FlightRecorder
+        Outputs:     None
+        Description: The records are mapped with numpy.memmap, nothing is read until it is used.
+        """
+        self.header = np.memmap(path, dtype=HEADER_DTYPE, mode='r', shape=(1,))[0]
+        if(bytes(self.header['magic']) != MAGIC):
+            raise ValueError("FR: FlightRecording - " + str(path) + " is not a flight recording")
+        if(int(self.header['recordSize']) != RECORD_SIZE):
+            raise ValueError("FR: FlightRecording - unsupported record size " + str(int(self.header['recordSize'])))
+        self.capacity = int(self.header['capacity'])
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(self.capacity,))
+
+    @property
+    def count(self):
+        return int(self.header['count'])
+
+    @property
+    def flags(self):
+        return int(self.header['flags'])
+
+    def ordered(self):
+        """
+        Function:    ordered
+        Purpose:     Get the written records from oldest to newest
+        Inputs:      None
+        Outputs:     a NumPy array of RECORD_DTYPE values
+        Description: Zero copy unless the file wrapped, in which case its two halves are joined. Without a count in the
+                     header, unwritten slots are dropped by their kind instead. Slots blanked by flush have kind 0 and are
+                     skipped by select.
+        """
+        count = self.count
+        if(count == 0):
+            return self.records[self.records['kind'] != 0]
+        if(count <= self.capacity):
+            return self.records[:count]
+        split = count % self.capacity
+        return np.concatenate((self.records[split:], self.records[:split]))
+
+    def select(self, kind, records=None):
+        """
+        Function:    select
+        Purpose:     Get the records of one kind through that kind's dtype
+        Inputs:      kind - an integer value, one of the KIND values
+                     records - a NumPy array of RECORD_DTYPE values, defaults to ordered()
+        Outputs:     a NumPy array of the dtype in KIND_DTYPES for the kind
+        Description: See purpose.
+        """
+        if(records is None):
+            records = self.ordered()
+        return records[records['kind'] == kind].view(KIND_DTYPES[kind])
+
+    def packetBytes(self, records=None):
+        """
+        Function:    packetBytes
+        Purpose:     Join the raw camera bytes back into one stream
+        Inputs:      records - a NumPy array of RECORD_DTYPE values, defaults to ordered()
+        Outputs:     a bytes value
+        Description: See purpose.
+        """
+        packets = self.select(KIND_PACKET, records)
+        #Fixed width byte strings drop trailing NUL bytes, which padding to the recorded length restores
+        return b''.join(bytes(packet['data']).ljust(packet['length'], b'\x00') for packet in packets)
@@ -45,11 +45,31 @@ Modified:  5-5-2020
 """
 import serial
 import sys
+import os
 import glob
 import math
 import time
+import concurrent.futures
+import threading
+import datetime
+import logging
 import RPi.GPIO as GPIO
 
+import AsyncStreams
+import CameraProtocol
+from CameraStream import CameraReader
+from PositionEstimator import PositionEstimator, fractionInterval
+from StateEstimator import KalmanTracker
+from LatencyTracer import LatencyTracer
+import CameraModel
+from VelocityController import VelocityController
+from RotationEstimator import RotationEstimator
+import LandingStateMachine
+from DescentPlanner import DescentPlanner
+import FlightRecorder
+import DebugLog
+import Metrics
+
 class LandingPlatformController():
     
     def __init__(self, settings=dict(), debug=False):
@@ -61,6 +81,9 @@ class LandingPlatformController():
         Outputs:     None
         Description: Recognized Settings Dictionary Values
                      debugFile - (string) a file path that will be used to save all regularly output debug statements, a value here will ignore the debug option.
+                     logLevel - (string) 'debug', 'info', 'warning' or 'error', the lowest level of debug statement written. Statements below it are never formatted.
+                     logFormat - (string) 'text' for readable lines, or 'json' for one JSON object per line with a timestamp, level and message.
+                     logQueue - (bool) a value that determines whether debug statements are written by a background thread, so slow writes never stall the landing loop.
                      flightPathFile - (string) a file paht that contains x,y,z,V values that will be used to control the UAV for a flight routine.
                      cameraPowerPin - (int) a value that will be used by the RaspberryPi to turn the camera on/off.
                      padPowerPin - (int) a value that will be used by the single-board computer to turn the Qi charging pad on/off.
@@ -71,12 +94,36 @@ class LandingPlatformController():
                      maxHoverHeight - (float) a value that determines what the maximum height the UAV is able to hover at, any movements above this height will be ignored. Measured in meters.
                      landingPos - (float list) a list of three values that gives the x, y, z position of the landing target from the center of the camera. Measured in meters.
                      landingOffset - (float list) a list of three values that gives informs a final x,y,z position offset once the UAV is ready to land. Measured in meters from the landing position. 
-                     cameraAccuracy - (int) a value that determines how many sample points will be gathered from the camera to determine UAV position.
-                     cameraInFrameAccuracy - (int) a value that determines how many sample points will be gathered from the camera to determine if the UAV is within the frame.
+                     cameraAccuracy - (int) a value that determines the most sample points that will be gathered from the camera to determine UAV position.
+                     cameraMinSamples - (int) a value that determines the fewest sample points that will be gathered from the camera to determine UAV position, even if the estimate is already confident.
+                     cameraInFrameAccuracy - (int) a value that determines the most sample points that will be gathered from the camera to determine if the UAV is within the frame.
+                     cameraInFrameMinSamples - (int) a value that determines the fewest sample points that will be gathered from the camera to determine if the UAV is within the frame.
                      cameraInFrameThreshold - (float) a value from 0 to 1 that represents the percentage of points that must be valid for the UAV to be determined as in the frame of the camera.
-                     coordTolerance - (float) a positive value that is used by the landing algorithm to determine if the UAV position is near the desired coordinates. Zero indicates that the coordinates must match exactly.
+                     rotationWindow - (int) a value that determines how many of the latest moves are used to estimate the rotation between the UAV and camera frames.
+                     rotationMinPairs - (int) a value that determines how many moves must be in the rotation window before a rotation estimate is applied. A single move always fits with a near zero error, so at least 2 are needed.
+                     rotationMaxStd - (float) a value that determines the largest standard error of the rotation estimate that will be applied. Measured in radians.
+                     rotationFitScale - (bool) a value that enables fitting a scale between commanded and observed moves along with the rotation.
+                     rotationFitTranslation - (bool) a value that enables fitting a constant drift added to every move along with the rotation.
+                     descentProfile - (bool) a value that enables planning combined lateral and vertical moves from the accuracy horn in step landing mode, in place of ten percent descents once on target.
+                     descentErrorFraction - (float) a value from 0 to 1 that gives the fraction of a lateral move expected to be left as error after it, used by the descent planner.
+                     descentStepOverhead - (float) a value that gives the time spent sampling the camera between moves, used to predict the landing duration. Measured in seconds.
+                     frameMargin - (float) a value that determines how far inside the edge of the camera view a move may end. Moves that would end closer to the edge are shortened before being sent. Measured in meters per meter of height.
                      onTargetFactor - (int)  a positive value that is used to determine the width factor for if the UAV is over the target point. See _uavOnTarget function for more details.
                      onTargetOffset - (float) a value that is used to control the offset in the Z-dimension of the accuracy horn. See _uavOnTarget function for more details.
+                     onTargetHysteresis - (float) a value from 0 to 1. To start descending the UAV must be within this fraction less than the on target radius, and it only stops descending once outside the full radius, so it does not flip between aligning and descending at the edge of the horn.
+                     positionEstimator - (string) 'median', 'trimmed' or 'mad'. Selects how camera data points are combined into a position. See PositionEstimator for more details.
+                     positionConfidenceFraction - (float) a positive value. Sampling for a position stops early once the 95% confidence radius of the estimate is below this fraction of the on target radius at the current height.
+                     positionErrorFloor - (float) a value that determines the smallest standard error given to a position estimate along each axis, so samples that all fall on the same pixel do not end sampling at once. Measured in camera pixels.
+                     stateEstimator - (bool) a value that enables the Kalman filter fusing camera data points with UAV odometry. When its estimate is confident enough, it is used in place of sampling the camera.
+                     kalmanProcessNoise - (float) a positive value denoting the random acceleration of the UAV assumed by the Kalman filter. Measured in meters^2 per second^3.
+                     kalmanCameraStd - (float) a positive value denoting the standard deviation of a single camera data point per meter of height. Measured in meters.
+                     kalmanOdometryStd - (float) a positive value denoting the standard deviation of the velocity derived from UAV odometry. Measured in meters per second.
+                     latencyTracing - (bool) a value that enables tracing the age of camera data points from capture to the move command. Per-stage percentiles are reported by done.
+                     flightRecordDir - (string) a directory path in which a binary flight recording of camera packets and data points, UAV telemetry and readings, commands and landing states is written for every run. None disables the recorder.
+                     flightRecordCapacity - (int) a value that determines how many 64 byte records a flight recording holds before the oldest are overwritten.
+                     metrics - (bool) a value that enables the latency histograms and counters of the camera, UAV and landing states. If false, nothing is measured.
+                     metricsPort - (int) a TCP port on localhost on which the metrics are served in the Prometheus text format. None serves nothing.
+                     metricsFile - (string) a file path the metrics are written to in the Prometheus text format when done is called. None writes nothing.
                      focalLength - (float) a value that represents the camera focal length per the datasheet. Is used to convert the camera pixel values into world coordinates. Measured in meters.
                      xImage - (float) a value that represents the X-dimension size of the camera per the datasheet. Is used to convert the camera pixel values into world coordinates. Measured in meters.
                      yImage - (float) a value that represents the Y-dimension size of the camera per the datasheet. Is used to convert the camera pixel values into world coordinates. Measured in meters.
@@ -88,22 +135,71 @@ class LandingPlatformController():
                      yRange - (int) a value that defines the size of the frame in the Y-dimension for the camera, per the datasheet. Is used to convert the camera pixel values into world coordinates.
                      xOff - (int) a value that represents the offset of the camera zero coordiante in the X-dimension. Is used to convert the camera pixel values into world coordinates.
                      yOff - (int) a value that represents the offset of the camera zero coordinate in the Y-dimension. Is used to conver the camera pixel values into world coordinates.
+                     cameraMode - (string) the name of a CameraModel.CAMERA_MODES entry the camera starts in. If not given, a mode is built from xRange, yRange, xOff and yOff. Replaced by any mode the camera announces.
+                     cameraIntrinsics - (float list) a list of four values fx, fy, cx, cy from a lens calibration, in full resolution sensor pixels. Replaces the focal length and sensor size values above when given.
+                     cameraDistortion - (float list) a list of five values k1, k2, p1, p2, k3 giving the radial and tangential lens distortion from a lens calibration, in the OpenCV order.
+                     cameraModelCache - (string) a directory path used to cache the undistortion lookup tables built from the lens calibration.
+                     landingMode - (string) 'step' to land with blocking moves between camera queries, or 'closedLoop' to stream velocity setpoints computed from the Kalman filter estimate.
+                     setpointRate - (float) a value that determines how often the landing state machine is ticked, and so how often velocity setpoints are sent in closedLoop landing mode. Measured in hertz.
+                     stateDeadlines - (dict) a dictionary of LandingStateMachine state names to the longest time the landing may stay in that state before aborting. Measured in seconds.
+                     landingDeadline - (float) a value that determines the longest time the whole landing may take before aborting, however often it changes state. None disables the limit. Measured in seconds.
+                     minBatteryVoltage - (float) a value that determines the UAV battery voltage below which the landing is aborted and the UAV lands at its current position. None disables the check. Measured in volts.
+                     velocityGains - (float list) a list of three values kp, ki, kd used by the closedLoop landing controller for both horizontal axes.
+                     maxVelocity - (float) a value that limits the horizontal speed commanded along each axis in closedLoop landing mode. Measured in meters per second.
+                     integralLimit - (float) a value that limits the velocity the integral term of the closedLoop landing controller may contribute. Measured in meters per second.
+                     descentVelocity - (float) a value that determines how quickly the UAV descends in closedLoop landing mode when exactly over the target. Measured in meters per second.
+                     attitudeCompensation - (bool) a value that enables correcting camera data points for the UAV attitude at the time they were captured.
+                     ledOffset - (float list) a list of three values that give the x, y, z position of the tracked IR LEDs from the UAV center, in the UAV body frame. Measured in meters.
                      cameraInitValue - (string) the default string value that is output by the camera to enable setup procedures.
                      cameraOutOfFrameValue - (string) the default value that is output by the camera when the UAV is not detected within the frame.
                      cameraStartString - (string) the value that is sent to the camera so that it begins generating data points.
                      serialLimiters - (char list) a list of character values that are used to parse a data packet from the camera. 
+                     cameraBufferSize - (int) a value that determines how many camera data points are kept by the background camera reader.
+                     cameraTimeout - (float) a value that determines the longest time to wait for fresh camera data points before using what is available. Measured in seconds.
+                     cameraPacketFormat - (string) 'ascii', 'binary' or 'auto'. Selects the packet format requested from the camera, 'auto' requests binary and falls back to ascii.
+                     cameraNegotiateTimeout - (float) a value that determines how long to wait for the camera to answer a binary format request. Measured in seconds.
+                     cameraUsbIds - (string list) a list of 'vendor:product' USB ids, in lowercase hex, that the camera may enumerate as. Only serial ports with these ids are probed on linux. An empty list probes every port.
+                     cameraPortCache - (string) a file path used to remember the serial port the camera was last found on, so it is tried first on the next start. None disables the cache.
+                     cameraCachedProbeTimeout - (float) a value that determines how long the port in cameraPortCache is probed on its own before every port is probed. Measured in seconds.
+                     cameraDiscoveryTimeout - (float) a value that determines the longest time a single pass of probing serial ports for the camera may take, and the longest wait between passes that find nothing. Measured in seconds.
+                     cameraPowerTimeout - (float) a value that determines the longest time to hold the camera off waiting for its old serial port to be removed, and the longest time to wait for it to enumerate over USB after it is powered on. Measured in seconds.
+                     cameraPowerPollInterval - (float) a value that determines how often to check for the camera enumerating over USB after it is powered on, and the first wait between passes of probing serial ports that find nothing, doubled after each pass. Measured in seconds.
+                     cameraSerial - (Python Class Object) an open serial connection to the camera, such as a simulated camera. When given, the camera is not powered up or searched for.
+                     cameraThread - (bool) a value that determines whether the camera is read by a background thread. If false, the camera is read while waiting for data points and by pollCamera.
         
         
         """
-        #Create a file descriptor object that can then be written for debug messages
+        #Define the lowest level of debug statement written
         try:
-            self._debugFile = open(settings['debugFile'], 'w')
+            logLevel = settings['logLevel']
         except (TypeError, KeyError):
             #If the dictionary value is not present, use defaults
-            if(debug == True):
-                self._debugFile = sys.stdout
-            else:
-                self._debugFile = open('/dev/null', 'w')
+            logLevel = 'debug'
+
+        #Define the format debug statements are written in, 'text' or 'json'
+        try:
+            logFormat = settings['logFormat']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            logFormat = DebugLog.FORMAT_TEXT
+
+        #Define whether debug statements are written by a background thread
+        try:
+            logQueue = settings['logQueue']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            logQueue = True
+
+        #Create the debug log, written to a file, to stdout when debugging, or nowhere at all
+        try:
+            debugStream = open(settings['debugFile'], 'w')
+            self._ownsDebugStream = True
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            debugStream = sys.stdout if debug == True else None
+            self._ownsDebugStream = False
+        self._debugLog = DebugLog.DebugLog('LPC', debugStream, logLevel, logFormat, logQueue)
+        self._log = self._debugLog.logger
 
         #Create a file descriptor object that can then be read for flight plan values
         try:
@@ -138,13 +234,15 @@ class LandingPlatformController():
 
         #Define default UAV offset angle value
         self._uavOffsetAngle = 0 #in radians
+        self._frameTransform = None
 
         #Define class constants necessary for UAV 
         try:
             self._uav = settings['uav']
         except (TypeError, KeyError):
             #If the dictionary value is not present, print warning message and exit.
-            print("LPC: __init__ - Landing Platform Controller requires a UAV control object.", file=self._debugFile)
+            self._log.error("__init__ - Landing Platform Controller requires a UAV control object.")
+            self._debugLog.close()
             sys.exit(0)
            
         #Define UAV velocity in meters per second
@@ -197,6 +295,13 @@ class LandingPlatformController():
             #If the dictionary value is not present, use defaults
             self._cameraAccuracy = 15 
 
+        #Define the fewest points the camera will sample to determine UAV position
+        try:
+            self._cameraMinSamples = settings['cameraMinSamples']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraMinSamples = 3
+
         #Define a number of points camera will use to determine if UAV is in frame
         try:
             self._cameraInFrameAccuracy = settings['cameraInFrameAccuracy']
@@ -204,6 +309,16 @@ class LandingPlatformController():
             #If the dictionary value is not present, use defaults
             self._cameraInFrameAccuracy = 5 
 
+        #Define the fewest points the camera will use to determine if UAV is in frame
+        try:
+            self._cameraInFrameMinSamples = settings['cameraInFrameMinSamples']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraInFrameMinSamples = 3
+
+        #Running totals of decisions made and camera data points used for them, reported by done
+        self._sampleCounts = {'position': [0, 0], 'inFrame': [0, 0]}
+
         #Define a percentage of points at which the UAV is considered 'in frame'
         try:
             self._cameraInFrameThreshold = settings['cameraInFrameThreshold']
@@ -211,12 +326,12 @@ class LandingPlatformController():
             #If the dictionary value is not present, use defaults
             self._cameraInFrameThreshold = 0.5
 
-        #Define a value used to determine if a new coordinate transform is necessary
+        #The UAV frame rotation is now estimated over many moves, see rotationWindow, so coordTolerance has no effect
         try:
-            self._coordTolerance = settings['coordTolerance']
+            settings['coordTolerance']
+            self._log.warning("__init__ - coordTolerance is deprecated and ignored, see rotationWindow and rotationMaxStd")
         except (TypeError, KeyError):
-            #If the dictionary value is not present, use defaults
-            self._coordTolerance = 0.01 
+            pass
 
         #Define an integer value that determines the factor of the logarithmic function that determines if the UAV is on target
         try:
@@ -231,6 +346,167 @@ class LandingPlatformController():
         except (TypeError, KeyError):
             #If the dictionary value is not present, use defaults
             self._onTargetOffset = 2.0
+
+        #Define the fraction of the on target radius by which the UAV must be inside it to start descending
+        try:
+            self._onTargetHysteresis = settings['onTargetHysteresis']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._onTargetHysteresis = 0.2
+
+        #Define whether step landing descends along a planned profile
+        try:
+            self._descentProfile = settings['descentProfile']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._descentProfile = True
+
+        #Define the fraction of a lateral move expected to be left as error after it
+        try:
+            self._descentErrorFraction = settings['descentErrorFraction']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._descentErrorFraction = 0.2
+
+        #Define the time spent sampling the camera between moves in seconds
+        try:
+            self._descentStepOverhead = settings['descentStepOverhead']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._descentStepOverhead = 0.5
+
+        #Define how far inside the edge of the camera view a move may end, in meters per meter of height
+        try:
+            self._frameMargin = settings['frameMargin']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._frameMargin = 0.05
+
+        #Define the number of moves used to estimate the UAV frame rotation
+        try:
+            self._rotationWindow = settings['rotationWindow']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._rotationWindow = 10
+
+        #Define the number of moves needed before a rotation estimate is applied
+        try:
+            self._rotationMinPairs = settings['rotationMinPairs']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._rotationMinPairs = 3
+
+        #Define the largest standard error of a rotation estimate that will be applied in radians
+        try:
+            self._rotationMaxStd = settings['rotationMaxStd']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._rotationMaxStd = math.radians(10)
+
+        #Define whether a scale is fitted along with the rotation
+        try:
+            self._rotationFitScale = settings['rotationFitScale']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._rotationFitScale = False
+
+        #Define whether a translation is fitted along with the rotation
+        try:
+            self._rotationFitTranslation = settings['rotationFitTranslation']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._rotationFitTranslation = False
+
+        #Define the estimator used to combine camera data points into a position
+        try:
+            self._positionEstimator = settings['positionEstimator']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._positionEstimator = 'median'
+
+        #Define the fraction of the on target radius the position confidence radius must fall below to stop sampling
+        try:
+            self._positionConfidenceFraction = settings['positionConfidenceFraction']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._positionConfidenceFraction = 0.25
+
+        #Define the smallest standard error of a position estimate in pixels
+        try:
+            self._positionErrorFloor = settings['positionErrorFloor']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._positionErrorFloor = 0.5
+
+        #Define whether the Kalman filter estimate may be used in place of sampling the camera
+        try:
+            self._stateEstimator = settings['stateEstimator']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._stateEstimator = True
+
+        #Define the random acceleration assumed by the Kalman filter in m^2/s^3
+        try:
+            self._kalmanProcessNoise = settings['kalmanProcessNoise']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._kalmanProcessNoise = 0.5
+
+        #Define the standard deviation of a camera data point per meter of height in meters
+        try:
+            self._kalmanCameraStd = settings['kalmanCameraStd']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._kalmanCameraStd = 0.01
+
+        #Define the standard deviation of the odometry velocity in meters per second
+        try:
+            self._kalmanOdometryStd = settings['kalmanOdometryStd']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._kalmanOdometryStd = 0.05
+
+        #Define whether the age of camera data points is traced through to the move command
+        try:
+            self._latencyTracing = settings['latencyTracing']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._latencyTracing = True
+
+        #Define the directory flight recordings are written to
+        try:
+            self._flightRecordDir = settings['flightRecordDir']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._flightRecordDir = os.path.expanduser('~/arav_flights')
+
+        #Define the number of records a flight recording holds
+        try:
+            self._flightRecordCapacity = settings['flightRecordCapacity']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._flightRecordCapacity = 2**19
+
+        #Define whether metrics are kept
+        try:
+            self._metricsEnabled = settings['metrics']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._metricsEnabled = True
+
+        #Define the localhost port the metrics are served on
+        try:
+            self._metricsPort = settings['metricsPort']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._metricsPort = None
+
+        #Define the file the metrics are written to when done
+        try:
+            self._metricsFile = settings['metricsFile']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._metricsFile = None
             
         #End definition of class tolerance/accuracy values
 
@@ -312,6 +588,126 @@ class LandingPlatformController():
             #If the dictionary value is not present, use defaults
             self._yOff = self._yRange/2 
 
+        #Define the lens calibration intrinsics [fx, fy, cx, cy] in frame pixels
+        try:
+            self._cameraIntrinsics = settings['cameraIntrinsics']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraIntrinsics = None
+
+        #Define the lens calibration distortion coefficients [k1, k2, p1, p2, k3]
+        try:
+            self._cameraDistortion = settings['cameraDistortion']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraDistortion = None
+
+        #Define the directory used to cache undistortion lookup tables
+        try:
+            self._cameraModelCache = settings['cameraModelCache']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraModelCache = os.path.join(os.path.expanduser('~'), '.arav_camera_model')
+
+        #Define the camera mode used until the camera announces one
+        try:
+            self._cameraMode = CameraModel.MODES_BY_NAME[settings['cameraMode']]
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, build a QVGA window from the frame size and offset values
+            xWindow = int(round(self._xActive/4 - self._xOff))
+            yWindow = int(round(self._yActive/4 - self._yOff))
+            self._cameraMode = CameraModel.CameraMode('custom', None, self._xRange, self._yRange, 2, xWindow, yWindow)
+
+        #Define how the landing sequence is performed
+        try:
+            self._landingMode = settings['landingMode']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._landingMode = 'step'
+
+        #Define the rate velocity setpoints are sent at in closed loop landing in hertz
+        try:
+            self._setpointRate = settings['setpointRate']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._setpointRate = 30.0
+
+        #Define the closed loop landing controller gains [kp, ki, kd]
+        try:
+            self._velocityGains = settings['velocityGains']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._velocityGains = [1.0, 0.1, 0.2]
+
+        #Define the largest horizontal speed commanded in closed loop landing in m/s
+        try:
+            self._maxVelocity = settings['maxVelocity']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._maxVelocity = 0.3
+
+        #Define the largest velocity contributed by the integral term in closed loop landing in m/s
+        try:
+            self._integralLimit = settings['integralLimit']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._integralLimit = 0.1
+
+        #Define the longest time in each landing state in seconds
+        self._stateDeadlines = {LandingStateMachine.ACQUIRE: 30.0, LandingStateMachine.ALIGN: 60.0, LandingStateMachine.DESCEND: 60.0, LandingStateMachine.FINAL_OFFSET: 15.0, LandingStateMachine.TOUCHDOWN: 15.0}
+        try:
+            self._stateDeadlines.update(settings['stateDeadlines'])
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            pass
+
+        #Define the longest time the whole landing may take in seconds
+        try:
+            self._landingDeadline = settings['landingDeadline']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._landingDeadline = 180.0
+
+        #Define the UAV battery voltage below which the landing is aborted
+        try:
+            self._minBatteryVoltage = settings['minBatteryVoltage']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._minBatteryVoltage = 3.0
+
+        #Define the descent speed over the target in closed loop landing in m/s
+        try:
+            self._descentVelocity = settings['descentVelocity']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._descentVelocity = 0.1
+
+        #Define whether camera data points are corrected for the UAV attitude
+        try:
+            self._attitudeCompensation = settings['attitudeCompensation']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._attitudeCompensation = True
+
+        #Define the position of the tracked LEDs from the UAV center in the body frame in meters
+        try:
+            self._ledOffset = settings['ledOffset']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._ledOffset = [0.0, 0.0, -0.02]
+
+        #Tabulate the accuracy horn over the height range once for planning descents
+        self._descentPlanner = DescentPlanner(self._onTargetFactor, self._onTargetOffset, self._minHoverHeight, self._maxHoverHeight, self._uavVelocity,
+                                              self._descentErrorFraction, self._descentStepOverhead)
+        self._positionRadius = math.inf
+
+        #Commanded and observed moves are kept for the whole flight, so the UAV frame rotation estimate builds up over time
+        self._rotationEstimator = RotationEstimator(self._rotationWindow, self._rotationFitScale, self._rotationFitTranslation, self._rotationMinPairs)
+
+        #Build the pixel to world lookup tables for the mode once, models for other modes are built as they are announced
+        self._cameraModels = {}
+        self._cameraModel = self._getCameraModel(self._cameraMode)
+
         #End definitions of values to allow for pixel to world coordinate conversion
 
         #Begin definitions of values to manage/enable serial connection to the camera
@@ -343,20 +739,351 @@ class LandingPlatformController():
             #If the dictionary value is not present, use defaults
             self._serialLimiters = ['{','$','}']
 
+        #Define the number of camera data points kept by the background reader
+        try:
+            self._cameraBufferSize = settings['cameraBufferSize']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraBufferSize = 256
+
+        #Define the longest time to wait for fresh camera data points in seconds
+        try:
+            self._cameraTimeout = settings['cameraTimeout']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraTimeout = 2.0
+
+        #Define the packet format requested from the camera
+        try:
+            self._cameraPacketFormat = settings['cameraPacketFormat']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraPacketFormat = 'auto'
+
+        #Define the time to wait for the camera to answer a binary format request in seconds
+        try:
+            self._cameraNegotiateTimeout = settings['cameraNegotiateTimeout']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraNegotiateTimeout = 0.5
+
+        #Define the USB ids the camera may enumerate as, OpenMV and the STM32 virtual COM port
+        try:
+            self._cameraUsbIds = settings['cameraUsbIds']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraUsbIds = ['1209:abd1', '0483:5740']
+
+        #Define the file used to remember the last camera serial port
+        try:
+            self._cameraPortCache = settings['cameraPortCache']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraPortCache = os.path.expanduser('~/.arav_camera_port')
+
+        #Define the longest time a single pass of camera discovery may take in seconds
+        try:
+            self._cameraDiscoveryTimeout = settings['cameraDiscoveryTimeout']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraDiscoveryTimeout = 2.0
+
+        #Define the longest time the last known camera port is probed alone before every port is probed in seconds
+        try:
+            self._cameraCachedProbeTimeout = settings['cameraCachedProbeTimeout']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraCachedProbeTimeout = 0.5
+
+        #Define the longest time to wait for the camera to enumerate after power on in seconds
+        try:
+            self._cameraPowerTimeout = settings['cameraPowerTimeout']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraPowerTimeout = 5.0
+
+        #Define how often to check for the camera enumerating after power on in seconds
+        try:
+            self._cameraPowerPollInterval = settings['cameraPowerPollInterval']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraPowerPollInterval = 0.05
+
+        #Define an already open camera connection
+        try:
+            self._camera = settings['cameraSerial']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._camera = None
+
+        #Define whether the camera is read by a background thread
+        try:
+            self._cameraThread = settings['cameraThread']
+        except (TypeError, KeyError):
+            #If the dictionary value is not present, use defaults
+            self._cameraThread = True
+
+        #Build the codec for camera packets once, so the settings strings never need to be parsed again
+        self._cameraProtocol = CameraProtocol.CameraProtocol(self._cameraInitValue, self._cameraOutOfFrameValue, self._serialLimiters)
+
         #End definitions of values to manage/enable serial connection to the camera
 
-        #Turn the camera off, then on again to enter initial setup state
-        self._setCameraPin(1)
-        for i in range(5,0,-1):
-            time.sleep(1) #Sleep to allow the OS to setup USB
+        if(self._camera == None):
+            #Turn the camera off, then on again to enter initial setup state
+            if(self._powerUpCamera() == False):
+                self._log.warning("__init__ - Camera did not enumerate within %.1f s, searching for it until it answers", self._cameraPowerTimeout)
                 
-        #Create camera serial connection
-        self._camera = None
-        while(self._getCameraSerialConnection(self._cameraInitValue) == None):{"""Do Nothing"""}
-        self._camera = serial.Serial(port=self._getCameraSerialConnection(self._cameraInitValue))
+            #Create camera serial connection, backing off between passes that find nothing so the search does not spin
+            cameraPort = None
+            retryDelay = self._cameraPowerPollInterval
+            while(cameraPort == None):
+                cameraPort = self._getCameraSerialConnection(self._cameraInitValue)
+                if(cameraPort == None):
+                    time.sleep(retryDelay)
+                    retryDelay = min(2*retryDelay, self._cameraDiscoveryTimeout)
+            self._camera = serial.Serial(port=cameraPort)
+
+        #Send start string to camera value to begin operations, negotiating the packet format in the process
+        self._activePacketFormat = self._negotiatePacketFormat()
+        self._log.info("__init__ - Camera packet format = %s", self._activePacketFormat)
+
+        #Record everything the camera sends from here on
+        self._recorder = self._createFlightRecorder()
+        self._metrics = self._createMetrics()
+
+        #Begin draining the camera in the background, only data points newer than the last movement are used for decisions
+        self._lastMovementTime = time.monotonic()
+        self._cameraReader = CameraReader(self._camera, self._cameraProtocol, self._cameraBufferSize, self._activePacketFormat, self._cameraThread, self._recorder,
+                                         self._metrics, self._log)
+        if(self._cameraThread):
+            self._cameraReader.start()
+        self._eventLoop = None
+
+        #Set from any thread to make the landing abort at its next tick
+        self._stopRequested = threading.Event()
+
+        #Track the UAV between camera queries by fusing every camera data point with the UAV odometry as they arrive
+        self._tracker = KalmanTracker(self._kalmanProcessNoise)
+        self._lastTrackedFix = None
+        self._cameraReader.addListener(self._trackCameraMode)
+        self._cameraReader.addListener(self._trackCameraFixes)
+
+        #Trace camera data points through each stage up to the move command they result in
+        self._latency = None
+        self._decision = None
+        if(self._latencyTracing):
+            self._latency = LatencyTracer()
+            self._cameraReader.addListener(self._latency.recordFixes)
+        if(self._recorder != None):
+            self._cameraReader.addListener(self._recorder.recordFixes)
+        if(hasattr(self._uav, 'addTelemetryListener')):
+            self._uav.addTelemetryListener(self._trackTelemetry)
+            if(self._recorder != None):
+                self._uav.addTelemetryListener(self._recorder.recordTelemetry)
+        if(self._metrics != None and hasattr(self._uav, 'attachMetrics')):
+            self._uav.attachMetrics(self._metrics)
+
+    def attachEventLoop(self, loop):
+        """
+        Function:    attachEventLoop
+        Purpose:     Move camera reading from the background thread onto an asyncio event loop
+        Inputs:      loop - an asyncio event loop
+        Outputs:     None
+        Description: The background reader thread is stopped and the camera file descriptor is registered with the loop
+                     using add_reader, so packets are decoded on the loop thread as soon as they arrive. The blocking query
+                     functions keep working, so the landing sequence can still be run in an executor alongside other tasks.
+        """
+        if(self._eventLoop != None):
+            return
+        self._cameraReader.stop()
+        self._camera.timeout = 0
+        self._eventLoop = loop
+        self._eventLoop.add_reader(self._camera.fileno(), self._pollEventLoop)
+        return
 
-        #Send start string to camera value to begin operations
-        self._camera.write(self._cameraStartString.encode())
+    def _pollEventLoop(self):
+        """
+        Function:    _pollEventLoop
+        Purpose:     Read the camera when the event loop sees data waiting on it
+        Inputs:      None
+        Outputs:     None
+        Description: A failed descriptor stays readable, so once the camera connection has failed the loop stops watching it rather
+                     than poll it on every pass.
+        """
+        self._cameraReader.poll()
+        if(self._cameraReader.failed):
+            self.detachEventLoop()
+        return
+
+    def detachEventLoop(self):
+        """
+        Function:    detachEventLoop
+        Purpose:     Stop reading the camera from the event loop
+        Inputs:      None
+        Outputs:     None
+        Description: Must be called from the event loop thread, which is also true of done once a loop is attached.
+                     Camera data is no longer collected after this call.
+        """
+        if(self._eventLoop != None):
+            self._eventLoop.remove_reader(self._camera.fileno())
+            self._eventLoop = None
+        return
+
+    async def cameraFixes(self, maxQueue=256):
+        """
+        Function:    cameraFixes
+        Purpose:     Stream camera data points as they arrive
+        Inputs:      maxQueue - an integer value denoting how many data points may wait for the consumer before the oldest are dropped
+        Outputs:     yields CameraFix values, use as "async for fix in lpc.cameraFixes()"
+        Description: Works whether the camera is read by the background thread or by an event loop through attachEventLoop.
+        """
+        async for fix in AsyncStreams.callbackStream(self._cameraReader.addListener, self._cameraReader.removeListener, maxQueue):
+            yield fix
+
+    def pollCamera(self):
+        """
+        Function:    pollCamera
+        Purpose:     Read whatever the camera has sent without waiting
+        Inputs:      None
+        Outputs:     an integer number of data points stored
+        Description: Only for use with cameraThread off, by whatever drives the controller, so data points are timestamped
+                     as they arrive rather than when they are next waited for.
+        """
+        return self._cameraReader.poll()
+
+    def _createFlightRecorder(self):
+        """
+        Function:    _createFlightRecorder
+        Purpose:     Open a new flight recording in flightRecordDir
+        Inputs:      None
+        Outputs:     a FlightRecorder.FlightRecorder value, or None if recording is disabled or the file could not be created
+        Description: Recordings are named by the wall clock time they were started. Failure to create one is not an error,
+                     the flight simply goes unrecorded.
+        """
+        if(self._flightRecordDir == None):
+            return None
+        path = os.path.join(self._flightRecordDir, datetime.datetime.now().strftime('flight-%Y%m%d-%H%M%S.rec'))
+        try:
+            os.makedirs(self._flightRecordDir, exist_ok=True)
+            flags = FlightRecorder.FLAG_BINARY_PACKETS if self._activePacketFormat == CameraProtocol.FORMAT_BINARY else 0
+            recorder = FlightRecorder.FlightRecorder(path, self._flightRecordCapacity, time.monotonic(), flags)
+        except OSError as error:
+            self._log.warning("_createFlightRecorder - Unable to record to %s, %s", path, error)
+            return None
+        self._log.info("_createFlightRecorder - Recording to %s", path)
+        return recorder
+
+    def _createMetrics(self):
+        """
+        Function:    _createMetrics
+        Purpose:     Create the metrics kept by the controller and start serving them
+        Inputs:      None
+        Outputs:     a Metrics.MetricsRegistry value, or None if metrics are disabled
+        Description: A port that cannot be listened on only disables the server, the metrics are still kept.
+        """
+        self._metricsServer = None
+        if(self._metricsEnabled == False):
+            return None
+        metrics = Metrics.MetricsRegistry()
+        self._inFrameTime = metrics.histogram('in_frame_check_seconds', 'Time taken to decide whether the UAV is in the camera frame')
+        self._moveTime = metrics.histogram('uav_move_seconds', 'Time taken by each blocking move of the UAV')
+        self._stateIterations = dict()
+        self._iterationCount = 0
+        if(self._metricsPort != None):
+            try:
+                self._metricsServer = Metrics.MetricsServer(metrics, self._metricsPort)
+                self._log.info("_createMetrics - Serving metrics on http://127.0.0.1:%d/metrics", self._metricsServer.port)
+            except OSError as error:
+                self._log.warning("_createMetrics - Unable to serve metrics on port %s, %s", self._metricsPort, error)
+        return metrics
+
+    def _recordCommand(self, command, x=0.0, y=0.0, z=0.0, velocity=0.0):
+        """
+        Function:    _recordCommand
+        Purpose:     Keep a command sent to the UAV in the flight recording, along with the decision it acted on
+        Inputs:      command - an integer value, one of the FlightRecorder COMMAND values
+                     x - a floating point value, the x-distance or velocity of the command
+                     y - a floating point value, the y-distance or velocity of the command
+                     z - a floating point value, the z-distance or velocity of the command
+                     velocity - a floating point value, the speed of a move command
+        Outputs:     None
+        Description: Does nothing when flight recording is disabled.
+        """
+        if(self._recorder != None):
+            decisionId = self._decision.id if self._decision != None else None
+            self._recorder.recordCommand(time.monotonic(), command, x, y, z, velocity, decisionId)
+        return
+
+    def _recordReading(self, reading, value):
+        """
+        Function:    _recordReading
+        Purpose:     Keep a value read back from the UAV in the flight recording
+        Inputs:      reading - an integer value, one of the FlightRecorder READ values
+                     value - the value read from the UAV
+        Outputs:     the value, unchanged
+        Description: Recorded so that a replay can give the controller the same answers. Does nothing when flight recording is disabled.
+        """
+        if(self._recorder != None):
+            self._recorder.recordReading(time.monotonic(), reading, value)
+        return value
+
+    def getStateEstimate(self, timestamp=None):
+        """
+        Function:    getStateEstimate
+        Purpose:     Get the Kalman filter estimate of the UAV position and velocity
+        Inputs:      timestamp - a floating point value in the time.monotonic() time base, defaults to now
+        Outputs:     a StateEstimator.StateEstimate value, or None if nothing has been measured yet
+        Description: Does not block or touch the serial connection.
+        """
+        if(timestamp == None):
+            timestamp = time.monotonic()
+        return self._tracker.predict(timestamp)
+
+    def _trackCameraFixes(self, fixes):
+        """
+        Function:    _trackCameraFixes
+        Purpose:     Feed new camera data points to the Kalman filter
+        Inputs:      fixes - a list of CameraFix values
+        Outputs:     None
+        Description: Called by the camera reader for every new list of data points. Data points are converted to world
+                     coordinates at the current hover height, and status codes are skipped.
+        """
+        height = self._hoverHeight
+        if(height == None):
+            return
+        std = self._kalmanCameraStd*max(height, self._minHoverHeight)
+        valid = [fix for fix in fixes if fix.status == CameraProtocol.CameraStatus.FIX]
+        if(len(valid) == 0):
+            return
+        xPoints, yPoints = self._fixesToWorld(valid, height)
+        for fix, xPos, yPos in zip(valid, xPoints.tolist(), yPoints.tolist()):
+            self._tracker.updateCamera(fix.timestamp, xPos, yPos, std)
+        self._lastTrackedFix = valid[-1]
+        return
+
+    def _traceDecision(self, fixes):
+        """
+        Function:    _traceDecision
+        Purpose:     Record the camera data points a position decision was made from
+        Inputs:      fixes - a list of CameraFix values
+        Outputs:     None
+        Description: The decision is kept until the next one, and every move sent in the meantime is traced back to it.
+        """
+        if(self._latency != None):
+            self._decision = self._latency.decide(fixes)
+        return
+
+    def _trackTelemetry(self, packets):
+        """
+        Function:    _trackTelemetry
+        Purpose:     Feed new UAV odometry to the Kalman filter
+        Inputs:      packets - a list of UAVController.TelemetryPacket values
+        Outputs:     None
+        Description: Called on the Crazyflie logging thread for every log packet.
+        """
+        for packet in packets:
+            self._tracker.updateOdometry(packet.timestamp, packet.data["stateEstimate.x"], packet.data["stateEstimate.y"], self._uavOffsetAngle, self._kalmanOdometryStd)
+        return
 
     def _getUAVPosition(self):
         """
@@ -364,61 +1091,78 @@ class LandingPlatformController():
         Purpose:     Get the most up-to-date UAV position in rectangular coordinates
         Inputs:      None
         Outputs:     _uavPos - a list floasts that represent the x, y, z position of the UAV
-        Description: This function attempts to grab a number of data points, determined by cameraAccuracy value, and convert them to world coordinates.
-                     These coordinates are then averaged to reduce positional errors. Once averaged, they are placed into the uavPos data member which
-                     is then reported to the calling function. 
+        Description: This function converts camera data points received since the UAV last moved to world coordinates and feeds them, one at
+                     a time as they arrive, into a streaming robust estimator chosen by positionEstimator. Sampling stops once the confidence
+                     radius of the estimate is below positionConfidenceFraction of the on target radius for the current height and
+                     at least cameraMinSamples data points have been used, once cameraAccuracy data points have been used, or once
+                     cameraTimeout passes. The radius shrinks with the noise of the data points and widens with height, so close
+                     to the pad few data points are needed. The estimate is placed into the uavPos data
+                     member which is then reported to the calling function. If no data point held a position, uavPos is left unchanged.
+                     If stateEstimator is enabled and the Kalman filter has seen the camera within cameraTimeout and is already
+                     confident to the same tolerance, its estimate is used at once instead. Raises IOError if the camera
+                     connection has failed.
         """
         if(self._camera == None):
             return 
         
-        #Find the default value for the camera, this indicates non-detection
-        xValDummy = int(self._cameraOutOfFrameValue[self._cameraOutOfFrameValue.rfind(self._serialLimiters[0])+1:self._cameraOutOfFrameValue.rfind(self._serialLimiters[1])])
-        yValDummy = int(self._cameraOutOfFrameValue[self._cameraOutOfFrameValue.rfind(self._serialLimiters[1])+1:self._cameraOutOfFrameValue.rfind(self._serialLimiters[2])])
-        
         #Get update height
         self._uavPos[2] = self._uavGetHeight()
-        xPoints = [0]
-        yPoints = [0]
-        
-        #Flush serial buffer to insure that most recent data points are grabbed
-        self._camera.reset_input_buffer()
-   
-        for i in range(0, int(self._cameraAccuracy)):
-            #Workaround currently
-            #Until the last value in the initial value is found, read characters
-            while(self._camera.read(1).decode('ascii') != self._cameraInitValue[-1]):{} #Need to fix this to a limiter
+        tolerance = self._positionConfidenceFraction*self._onTargetRadius()
+
+        #Use the Kalman filter estimate when it is recent and confident enough
+        if(self._stateEstimator):
+            now = time.monotonic()
+            state = self._tracker.predict(now)
+            if(state != None and state.lastFixTime != None and now - state.lastFixTime < self._cameraTimeout):
+                radius = 1.96*math.sqrt(2)*state.positionStd
+                if(radius < tolerance):
+                    self._log.debug("_getUAVPosition - Kalman estimate used, confidence radius = %s, tolerance = %s", radius, tolerance)
+                    self._uavPos[0] = state.x
+                    self._uavPos[1] = state.y
+                    self._positionRadius = radius
+                    self._updatedPosition = True
+                    self._traceDecision([self._lastTrackedFix] if self._lastTrackedFix != None else [])
+                    self._countSamples('position', 0)
+                    return self._uavPos
+
+        #The error floor is given in pixels, which grow with height
+        pixelSize = self._uavPos[2]*max(self._cameraModel.xScale, self._cameraModel.yScale) if self._uavPos[2] != None else 0.0
+        estimator = PositionEstimator(self._positionEstimator, errorFloor=self._positionErrorFloor*pixelSize)
+        deadline = time.monotonic() + self._cameraTimeout
+        since = self._lastMovementTime
+        used = []
         
-            #Read serial data for largest possible string length from camera
-            posString = self._camera.read(len(self._cameraInitValue)).decode('ascii')
-            #Throw away any characters after the final limiter value
-            posString = posString[posString.find(self._serialLimiters[0]):posString.find(self._serialLimiters[2])+1]
-        
-            if(len(posString) > 0):
-                if(posString[0] == self._serialLimiters[0]):                    
-                    #Find the limiter positions to properly split string into x & y components
-                    initIndex=posString.rfind(self._serialLimiters[0])
-                    splitIndex=posString.rfind(self._serialLimiters[1])
-                    lastIndex=posString.rfind(self._serialLimiters[2])
-            
-                    #Convert both positions to integer values
-                    xPos = int(posString[(initIndex+1):splitIndex])
-                    yPos = int(posString[(splitIndex+1):lastIndex])
-
-                    #If values are less than dummy values, append to array
-                    if((xPos <= xValDummy) and (yPos <= yValDummy)):
-                        #Convert from pixels to world coordinates with conversion function
-                        xPos, yPos = self._pixelConversion(xPos, yPos, self._uavPos[2])
-                        #Append to list for potential averaging
-                        xPoints.append(xPos)
-                        yPoints.append(yPos)
-            else:
-                #If a proper value was not found, flush the input buffer again
-                self._camera.reset_input_buffer()
+        while(estimator.count < self._cameraAccuracy):
+            #Query the background reader for data points received since the last query, waiting for at least one
+            fixes = self._cameraReader.waitForFixes(1, since, max(0, deadline - time.monotonic()))
+            if(len(fixes) == 0):
+                break
+            fixes = self._cameraReader.getFixesSince(since)
+            since = fixes[-1].timestamp
+
+            #Only data points that hold a position are used, status codes are skipped, and the newest are kept when more arrived than are needed
+            valid = self._cameraProtocol.summarize(fixes).fixes[-(self._cameraAccuracy - estimator.count):]
+            if(len(valid) > 0):
+                #Convert the whole window from pixels to world coordinates at once
+                xPoints, yPoints = self._fixesToWorld(valid, self._uavPos[2])
+                for xPos, yPos in zip(xPoints.tolist(), yPoints.tolist()):
+                    estimator.add(xPos, yPos)
+                used.extend(valid)
+
+            if(estimator.count >= self._cameraMinSamples and estimator.confidenceRadius() < tolerance):
+                break
+
+        #The confidence radius is worked out again only when it will be written
+        if(self._log.isEnabledFor(logging.DEBUG)):
+            self._log.debug("_getUAVPosition - samples = %d, confidence radius = %s, tolerance = %s", estimator.count, estimator.confidenceRadius(), tolerance)
+        self._countSamples('position', estimator.count)
                 
-        #Update the UAV x,y positions with the averages from camera                
-        if((len(xPoints) > 0) and (len(yPoints) > 0)):
-            self._uavPos[0] = math.fsum(xPoints)/len(xPoints)
-            self._uavPos[1] = math.fsum(yPoints)/len(yPoints)
+        self._traceDecision(used)
+
+        #Update the UAV x,y positions with the estimate from camera                
+        if(estimator.count > 0):
+            self._uavPos[0], self._uavPos[1] = estimator.estimate()
+            self._positionRadius = estimator.confidenceRadius()
             self._updatedPosition = True
         else:
             self._updatedPosition = False
@@ -431,57 +1175,61 @@ class LandingPlatformController():
         Purpose:     Determine if the UAV is within the frame of the camera
         Inputs:      None
         Outputs:     a boolean value indicating if the UAV is within the frame
-        Description: This function parses camera data points in a similar manner to _getUAVPosition, but forgoes the conversion to world coordinates. So long as the coordinates are not
-                     an error coordinate, 900 and above, they are considered a valid position value. If the ratio of valid to invalid position values is greater than the cameraInFrameThreshold
-                     value, the function will report True. Otherwise, it will report false to the caller. 
+        Description: This function looks at the status of recent camera data points rather than their coordinates. Data points holding
+                     a position, and data points reporting too many blobs (901), both show that the UAV is in view. Data points reporting
+                     nothing in view (900) count against the UAV being in frame. Data points sent while the camera is resetting its
+                     background (902) or in standby (904) say nothing about the UAV, so they are skipped and more data points are
+                     gathered in their place. Data points are gathered until a one-sided 95% confidence interval of the out of frame
+                     ratio lies wholly on one side of the cameraInFrameThreshold value, between cameraInFrameMinSamples and
+                     cameraInFrameAccuracy data points, so a UAV that is plainly in or out of view is decided early.
+                     If the ratio of out of frame data points is no greater than the cameraInFrameThreshold
+                     value, the function will report True. Otherwise, it will report false to the caller. Raises IOError
+                     if the camera connection has failed, rather than reporting the UAV out of frame.
         """
-        #Find the default value for the camera, this indicates non-detectionx
-        xValDummy = int(self._cameraOutOfFrameValue[self._cameraOutOfFrameValue.rfind(self._serialLimiters[0])+1:self._cameraOutOfFrameValue.rfind(self._serialLimiters[1])])
-        yValDummy = int(self._cameraOutOfFrameValue[self._cameraOutOfFrameValue.rfind(self._serialLimiters[1])+1:self._cameraOutOfFrameValue.rfind(self._serialLimiters[2])])
-        
-        #Create blank arrays
-        xPoints = [xValDummy]
-        yPoints = [yValDummy]
         inFrame = False
-
-        #Flush serial buffer to insure that most recent data points are grabbed
-        self._camera.reset_input_buffer()
+        requested = int(self._cameraInFrameMinSamples)
+        if(self._metrics != None):
+            checkStart = time.monotonic()
+
+        #Query the background reader for data points received since the UAV last moved
+        while(True):
+            fixes = self._cameraReader.waitForFixes(requested, self._lastMovementTime, self._cameraTimeout, newest=True)
+            counts = self._cameraProtocol.summarize(fixes).counts
+            seen = counts[CameraProtocol.CameraStatus.FIX] + counts[CameraProtocol.CameraStatus.TOO_MANY_BLOBS]
+            missing = counts[self._cameraProtocol.noneStatus]
+            #Stop once enough informative data points are found, or the camera has stopped sending
+            if(seen + missing >= self._cameraInFrameAccuracy or len(fixes) < requested):
+                break
+            #Stop early once the ratio is confidently on one side of the threshold
+            if(seen + missing >= self._cameraInFrameMinSamples):
+                low, high = fractionInterval(missing, seen + missing, 1.645)
+                if(high <= self._cameraInFrameThreshold or low > self._cameraInFrameThreshold):
+                    break
+            requested += max(1, int(self._cameraInFrameMinSamples) - (seen + missing))
+
+        self._log.debug("_uavInFrame - samples = %d, status counts = %s", seen + missing, counts)
+        self._countSamples('inFrame', seen + missing)
         
-        for i in range(0, int(self._cameraInFrameAccuracy)):
-            #Workaround currently
-            #Until the last value in the initial value is found, read characters
-            while(self._camera.read(1).decode('ascii') != self._cameraInitValue[-1]):{} #Need to fix this to a limiter
-            
-            #Read serial data for largest possible string length from camera
-            posString = self._camera.read(len(self._cameraInitValue)).decode('ascii')
-            posString = posString[posString.find(self._serialLimiters[0]):posString.find(self._serialLimiters[2])+1]
-            
-            #If a proper position string was grabbed, process it
-            if(len(posString) > 0):
-                if(posString[0] == self._serialLimiters[0]):                    
-                    initIndex=posString.rfind(self._serialLimiters[0])
-                    splitIndex=posString.rfind(self._serialLimiters[1])
-                    lastIndex=posString.rfind(self._serialLimiters[2])
-            
-                    #Convert both positions to integer values
-                    xPos = int(posString[(initIndex+1):splitIndex])
-                    yPos = int(posString[(splitIndex+1):lastIndex])
-                    
-                    #Append to list for potential averaging
-                    xPoints.append(xPos)
-                    yPoints.append(yPos)
-            else:
-                #If a proper value was not found, flush the input buffer again
-                self._camera.reset_input_buffer()
-
-        print("LPC: _uavInFrame - xPoints =" + str(xPoints), file=self._debugFile)
-        print("LPC: _uavInFrame - yPoints =" + str(yPoints), file=self._debugFile)
-        
-        if(xPoints.count(xValDummy) <= len(xPoints)*self._cameraInFrameThreshold and yPoints.count(yValDummy) <= len(yPoints)*self._cameraInFrameThreshold):
+        if(seen + missing > 0 and missing <= (seen + missing)*self._cameraInFrameThreshold):
             inFrame = True
-            
+
+        if(self._metrics != None):
+            self._inFrameTime.record(time.monotonic() - checkStart)
         return inFrame
     
+    def _countSamples(self, decision, samples):
+        """
+        Function:    _countSamples
+        Purpose:     Add a decision to the running sample totals
+        Inputs:      decision - a string value, 'position' or 'inFrame'
+                     samples - an integer value, the number of camera data points the decision used
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._sampleCounts[decision][0] += 1
+        self._sampleCounts[decision][1] += samples
+        return
+
     def _pixelConversion(self, x_pixel, y_pixel, distance):
         """
         Function:    _pixelConversion
@@ -493,14 +1241,83 @@ class LandingPlatformController():
                      x - a floating point value denoting the x-coordinate of the UAV in the world frame
                      y - a floating point value denoting the y-coordinate of the UAV in the world frame
         Description: This function uses the distance from the camera, focal length, pixel size, and lengths of the sensors to convert pixel coordinates
-                     to world coordinates. 
+                     to world coordinates. The per-pixel terms are looked up from the camera model tables built in __init__.
         """
-        k = distance/self._focalLength
-        xPixSize = 2*(self._xImage/self._xSensor)
-        yPixSize = 2*(self._yImage/self._ySensor) #Temporary fix corresponding to QVGA vs VGA pixel
-        x = k*xPixSize*(x_pixel - self._xOff)
-        y = k*yPixSize*(y_pixel - self._yOff)
-        return x,y
+        return self._cameraModel.pixelToWorld(x_pixel, y_pixel, distance)
+
+    def _fixesToWorld(self, fixes, height):
+        """
+        Function:    _fixesToWorld
+        Purpose:     Convert camera data points into world coordinates of the UAV center
+        Inputs:      fixes - a list of CameraFix values holding positions
+                     height - a floating point value denoting the height in meters of the UAV center above the camera
+        Outputs:     a tuple of x, y NumPy arrays in meters
+        Description: The camera sees the LEDs, not the UAV center. While the UAV tilts to translate, the LED offset from
+                     the center swings with it, which moves the LEDs both across the frame and toward or away from the
+                     camera. With attitudeCompensation on, the attitude at each capture time is interpolated from the UAV
+                     attitude log and the rotated LED offset is removed. Without attitude data, or with the setting off,
+                     the LEDs are assumed to be at the UAV center.
+        """
+        xPixels = [fix.x for fix in fixes]
+        yPixels = [fix.y for fix in fixes]
+        attitude = None
+        if(self._attitudeCompensation and hasattr(self._uav, 'getAttitude')):
+            attitude = self._uav.getAttitude([self._cameraReader.captureTime(fix) for fix in fixes])
+        if(attitude == None):
+            return self._pixelConversionBatch(xPixels, yPixels, height)
+
+        xOffset, yOffset, zOffset = CameraModel.bodyOffsetInCamera(attitude[0], attitude[1], attitude[2], self._ledOffset, self._uavOffsetAngle)
+        xPoints, yPoints = self._pixelConversionBatch(xPixels, yPixels, height + zOffset)
+        return xPoints - xOffset, yPoints - yOffset
+
+    def _getCameraModel(self, mode):
+        """
+        Function:    _getCameraModel
+        Purpose:     Get the camera model for a camera mode
+        Inputs:      mode - a CameraModel.CameraMode value
+        Outputs:     a CameraModel.CameraModel value
+        Description: Models are kept once built, so switching back and forth between modes does not rebuild the tables.
+        """
+        if(mode.name not in self._cameraModels):
+            self._cameraModels[mode.name] = CameraModel.CameraModel(mode, self._focalLength, self._xImage, self._yImage, self._xSensor, self._ySensor, self._xActive, self._yActive,
+                                                                    self._cameraIntrinsics, self._cameraDistortion, self._cameraModelCache)
+        return self._cameraModels[mode.name]
+
+    def _trackCameraMode(self, fixes):
+        """
+        Function:    _trackCameraMode
+        Purpose:     Follow the mode and ROI announced by the camera
+        Inputs:      fixes - a list of CameraFix values
+        Outputs:     None
+        Description: Called by the camera reader for every new list of data points, ahead of anything that converts them.
+                     The camera sends its mode after the start string and then periodically, and an ROI origin whenever
+                     its window moves. An unknown mode is reported and ignored.
+        """
+        for fix in fixes:
+            if(fix.status == CameraProtocol.CameraStatus.MODE):
+                mode = CameraModel.MODES_BY_ID.get(fix.y)
+                if(mode == None):
+                    self._log.warning("_trackCameraMode - Unknown camera mode %s", fix.y)
+                elif(mode is not self._cameraModel.mode):
+                    self._cameraModel = self._getCameraModel(mode)
+                    self._log.info("_trackCameraMode - Camera mode = %s", mode)
+            elif(fix.status == CameraProtocol.CameraStatus.ROI_X):
+                self._cameraModel.setRoi(xRoi=fix.y)
+            elif(fix.status == CameraProtocol.CameraStatus.ROI_Y):
+                self._cameraModel.setRoi(yRoi=fix.y)
+        return
+
+    def _pixelConversionBatch(self, x_pixels, y_pixels, distances):
+        """
+        Function:    _pixelConversionBatch
+        Purpose:     Convert many pixel coordinates into world coordinates at once
+        Inputs:      x_pixels - a list or array of integer x-coordinates
+                     y_pixels - a list or array of integer y-coordinates
+                     distances - a floating point value, or a list or array with one value per coordinate, denoting the distance in meters of the UAV from the camera
+        Outputs:     a tuple of x, y NumPy arrays in meters
+        Description: Same conversion as _pixelConversion done as a single vectorized operation.
+        """
+        return self._cameraModel.toWorld(x_pixels, y_pixels, distances)
 
     def _calculateOffset(self):
         """
@@ -526,7 +1343,7 @@ class LandingPlatformController():
         Outputs:     a floating point value representing the z-coordinate 
         Description: This function uses the UAV controller object's getHeight function to grab the most up-to-date height value.
         """
-        self._hoverHeight = self._uav.getHeight()
+        self._hoverHeight = self._recordReading(FlightRecorder.READ_HEIGHT, self._uav.getHeight())
         return self._hoverHeight
 
     def _sendMovement(self, xDis, yDis, zDis):
@@ -540,22 +1357,35 @@ class LandingPlatformController():
         Description: This function checks if a movement vector is not zero, then sends the x, y, z distance values to the UAV
                      via the UAV objects move function. 
         """
-        #If there is a movement to make
-        if( (xDis+yDis+zDis) != 0 and (zDis + self._hoverHeight) <= self._maxHoverHeight):
+        #If there is a movement to make, any axis may be non-zero now that moves combine lateral and vertical distances
+        if( (xDis != 0 or yDis != 0 or zDis != 0) and (zDis + self._hoverHeight) <= self._maxHoverHeight):
+            #Trace the move back to the camera data points behind it
+            if(self._latency != None):
+                record = self._latency.move(self._decision, [xDis, yDis, zDis])
+                self._log.debug("_sendMovement - decision = %s, fixes = %s", record.decisionId, record.fixIds)
             #Send movement to UAV, UAV controller class will delay an appropriate time while the UAV moves
+            self._recordCommand(FlightRecorder.COMMAND_MOVE, xDis, yDis, zDis, self._uavVelocity)
+            if(self._metrics != None):
+                moveStart = time.monotonic()
             self._uav.move(xDis, yDis, zDis, self._uavVelocity)
+            if(self._metrics != None):
+                self._moveTime.record(time.monotonic() - moveStart)
+            self._recordCommand(FlightRecorder.COMMAND_DONE)
             #Update hover height
             self._hoverHeight += zDis
+            #Camera data points received before this time no longer describe the UAV position
+            self._lastMovementTime = time.monotonic()
         
         return
 
-    def _sendToHome(self, xPos, yPos):
+    def _sendToHome(self, xPos, yPos, zDis=0):
         """
         Function:    _sendToHome
         Purpose:     Instruct the UAV to move to certain coordinates
         Inputs:      xPos - a floating point value denoting the x-dimension coordinate
                      yPos - a floating point value denoting the y-dimension coordinate
-        Outputs:     None
+                     zDis - a floating point value denoting the distance, in meters, to move along the z-axis at the same time
+        Outputs:     a list of x, y floating point values, the total distance commanded in the UAV frame in meters
         Description: This function uses the provided position values to calculate a distance that the UAV needs to move to
                      be centered over the landing position. In the process of calculating the distances, the current UAV frame
                      offset angle is used to mathematically transform the world coordinates into UAV frame coordinates that are
@@ -566,31 +1396,43 @@ class LandingPlatformController():
                      coordinate by the sine of the UAV frame offset angle and summing this with the Y-dimension world coordinate multiplied by the
                      cosine of the UAV frame offset angle. These transformed coordinates are then subtracted from their respective landing position
                      coordinate to determine the overall distance the UAV needs to move within the UAV frame of reference. 
+                     The move is shortened if it would end within frameMargin of the edge of the camera view, so the UAV is
+                     not lost. If it still leaves the view, the move is backed off ten percent at a time until it is seen.
         """
         #Make copy of world coordinates
-        print("LPC: _sendToHome - self._landingPos =" + str(self._landingPos), file=self._debugFile)
+        self._log.debug("_sendToHome - self._landingPos = %s", self._landingPos)
         temp = [xPos, yPos]
         worldCoords = temp.copy()
-        print("LPC: _sendToHome - worldCoords =" + str(worldCoords), file=self._debugFile)
+        self._log.debug("_sendToHome - worldCoords = %s", worldCoords)
         #Transform the world coordinates to the UAV frame coordinates
         transformX = worldCoords[0]*math.cos(self._uavOffsetAngle) + worldCoords[1]*math.sin(self._uavOffsetAngle)
         transformY = -worldCoords[0]*math.sin(self._uavOffsetAngle) + worldCoords[1]*math.cos(self._uavOffsetAngle)
-        print("LPC: _sendToHome - transform =" + str(transformX) + "," + str(transformY), file=self._debugFile)
-        print("LPC: _sendToHome - self._landingPos =" + str(self._landingPos), file=self._debugFile)
+        self._log.debug("_sendToHome - transform = %s,%s", transformX, transformY)
 
-        temp = [self._landingPos[0] - transformX, self._landingPos[1] - transformY, 0]
+        temp = [self._landingPos[0] - transformX, self._landingPos[1] - transformY, zDis]
         distances = temp.copy()
-        print("LPC: _sendToHome - distances =" + str(distances), file=self._debugFile)
+        self._log.debug("_sendToHome - distances = %s", distances)
+
+        #Clip the move, as the camera will see it, to the part of the camera view that stays inside the margin
+        seenX = distances[0]*math.cos(self._uavOffsetAngle) - distances[1]*math.sin(self._uavOffsetAngle)
+        seenY = distances[0]*math.sin(self._uavOffsetAngle) + distances[1]*math.cos(self._uavOffsetAngle)
+        length = math.hypot(seenX, seenY)
+        maxStep = self._cameraModel.maxStep(xPos, yPos, seenX, seenY, self._hoverHeight + min(0, zDis), self._frameMargin)
+        if(length > maxStep):
+            self._log.debug("_sendToHome - Clipping move from %s to %s", length, maxStep)
+            distances = [distances[0]*maxStep/length, distances[1]*maxStep/length, distances[2]]
 
         #Instruct UAV to move distances determined
         self._sendMovement(distances[0], distances[1], distances[2])
+        commanded = [distances[0], distances[1]]
         
         #To prevent leaving of the camera frame, reduce previous movement by 10% if UAV is not in frame
-        while(self._uavInFrame() == False and (distances[0]+distances[1]+distances[2]) != 0):
-            print("LPC: _sendToHome - UAV Not in Frame", file=self._debugFile)
+        while(self._uavInFrame() == False and (distances[0] != 0 or distances[1] != 0)):
+            self._log.debug("_sendToHome - UAV Not in Frame")
             self._sendMovement(-0.1*distances[0], -0.1*distances[1], 0*distances[2])
+            commanded = [commanded[0] - 0.1*distances[0], commanded[1] - 0.1*distances[1]]
             
-        return
+        return commanded
     
     def engageFlightRoutine(self):
         """
@@ -605,113 +1447,521 @@ class LandingPlatformController():
                      potential applications. 
         """
         if(self._flightPlan == None):
-            print("LPC: engageFlightRoutine - Beginning", file=self._debugFile)
+            self._log.info("engageFlightRoutine - Beginning")
+            self._recordCommand(FlightRecorder.COMMAND_LAUNCH)
             self._uav.launch()  
-            while(self._uavInFrame() == False):
-                print("LPC: engageFlightRoutine - UAV going up", file=self._debugFile)
-                self._sendMovement(0, 0, 0.5)
-            if(self._uavInFrame() == False):
-                print("LPC: engageFlightRoutine - UAV Not in frame. Landing at current position.", file=self._debugFile)
-                return
-            print("LPC: engageFlightRoutine - Ending and beginning landing sequence.", file=self._debugFile)
-            self._performLandingSequence()
+            self._recordCommand(FlightRecorder.COMMAND_DONE)
+            #Camera data points from before and during the climb no longer describe the UAV position
+            self._lastMovementTime = time.monotonic()
+            machine = self.createLandingMachine()
+            while(True):
+                try:
+                    finalState = machine.run(self._setpointRate)
+                    break
+                except IOError:
+                    if(self._cameraReader.failed == False):
+                        raise
+                    #The camera link failed during a tick, _guardCamera aborts the landing on the next one
+                    self._log.error("engageFlightRoutine - Camera connection lost in %s", machine.state)
+            self._log.info("engageFlightRoutine - Ending in %s", finalState)
+            for state, seconds in machine.timeInState().items():
+                self._log.info("engageFlightRoutine - %s = %.2f s", state, seconds)
         else:
             #Need to implement reading from a CSV file and sending values to UAV. 
+            pass
         return
 
-    def done(self):
+    def createLandingMachine(self):
         """
-        Function:    done
-        Purpose:     Halt all class activities
+        Function:    createLandingMachine
+        Purpose:     Build the state machine that lands the UAV
         Inputs:      None
+        Outputs:     a LandingStateMachine value, ready to be ticked
+        Description: The UAV must already be airborne. engageFlightRoutine runs the machine at setpointRate, but it may
+                     instead be ticked by the caller, for example from an event loop next to other tasks. The ALIGN and
+                     DESCEND states follow landingMode. In closedLoop mode every tick sends one velocity setpoint and
+                     returns at once. In step mode a tick makes one blocking move, as the UAV controller waits for moves
+                     to finish, so the machine can only be preempted between moves.
+        """
+        machine = LandingStateMachine.LandingStateMachine(deadline=self._landingDeadline)
+        if(self._landingMode == 'closedLoop'):
+            align, descend = self._tickAlignClosedLoop, self._tickDescendClosedLoop
+        else:
+            align, descend = self._tickAlignStep, self._tickDescendStep
+        deadlines = self._stateDeadlines
+        machine.addState(LandingStateMachine.ACQUIRE, self._tickAcquire, enter=self._enterAcquire, deadline=deadlines.get(LandingStateMachine.ACQUIRE))
+        machine.addState(LandingStateMachine.ALIGN, align, deadline=deadlines.get(LandingStateMachine.ALIGN))
+        machine.addState(LandingStateMachine.DESCEND, descend, deadline=deadlines.get(LandingStateMachine.DESCEND))
+        machine.addState(LandingStateMachine.FINAL_OFFSET, self._tickFinalOffset, enter=self._enterFinalOffset, deadline=deadlines.get(LandingStateMachine.FINAL_OFFSET))
+        machine.addState(LandingStateMachine.TOUCHDOWN, self._tickTouchdown, deadline=deadlines.get(LandingStateMachine.TOUCHDOWN))
+        machine.addState(LandingStateMachine.CHARGE, self._tickFinished)
+        machine.addState(LandingStateMachine.ABORT, self._tickFinished, enter=self._enterAbort)
+        if(self._metrics != None):
+            #Counted by the first guard, as guards run on every tick before the state does
+            machine.addGuard(self._countIteration)
+            machine.addTransitionHook(self._recordIterations)
+        machine.addGuard(self._guardStop)
+        machine.addGuard(self._guardCamera)
+        machine.addGuard(self._guardBattery)
+        machine.addTransitionHook(self._logTransition)
+        if(self._recorder != None):
+            machine.addTransitionHook(self._recorder.recordTransition)
+
+        self._velocityController = VelocityController(self._velocityGains, self._maxVelocity, self._integralLimit, self._descentVelocity)
+        self._lastTickTime = None
+        self._uavLost = False
+        self._descentStart = None
+        self._descentPrediction = None
+        self._descentSteps = 0
+        return machine
+
+    def _logTransition(self, transition):
+        """
+        Function:    _logTransition
+        Purpose:     Report a change of landing state
+        Inputs:      transition - a LandingStateMachine.Transition value
         Outputs:     None
-        Description: See Purpose.
+        Description: See purpose.
         """
-        self._uav.land()
-        self._uav.done()
-        self._camera.close()
-        GPIO.cleanup()
+        self._log.info("_logTransition - %s -> %s (%s)", transition.previous, transition.next, transition.reason)
         return
-    
-    def _performLandingSequence(self):
+
+    def _countIteration(self, now, state):
+        """
+        Function:    _countIteration
+        Purpose:     Count a tick of the landing state machine
+        Inputs:      now - a floating point value, the current time
+                     state - a string value, the current landing state
+        Outputs:     None, so the tick carries on
+        Description: Added as the first guard when metrics are kept, as guards run on every tick before the state does. The count is
+                     recorded and cleared by _recordIterations on every change of state.
+        """
+        self._iterationCount += 1
+        return None
+
+    def _recordIterations(self, transition):
+        """
+        Function:    _recordIterations
+        Purpose:     Record how many ticks the landing spent in the state it has left
+        Inputs:      transition - a LandingStateMachine.Transition value
+        Outputs:     None
+        Description: See purpose.
+        """
+        if(transition.previous != None):
+            histogram = self._stateIterations.get(transition.previous)
+            if(histogram == None):
+                histogram = self._metrics.histogram('landing_state_iterations', 'Ticks of the landing state machine spent in each visit to a state',
+                                                    lowest=1, highest=1e6, state=transition.previous)
+                self._stateIterations[transition.previous] = histogram
+            histogram.record(self._iterationCount)
+        self._iterationCount = 0
+        return
+
+    def requestStop(self):
         """
-        Function:    _performLandingSequence
-        Purpose:     Align UAV with desired coordinates, once aligned safely land the UAV
+        Function:    requestStop
+        Purpose:     Ask a running landing to abort and land the UAV where it is
         Inputs:      None
         Outputs:     None
-        Description: This function determines the current UAV position, then calculates the desired position.
-                     The desired position is then used to move the UAV, after the movement completes the actual
-                     UAV position is determined. The movement vectors are compared for magnitude, if they are within
-                     the threshold determined by coordTolerance the algorithm determines that a new transform is not
-                     necessary. If not within the threshold, the angle between the two vectors is calculated and set
-                     as the UAV frame angle offset variable. This operation continues until the UAV is determined to be
-                     on target by the uavOnTarget function. Once on target, the UAV height is reduced by ten percent
-                     of the current value. This operation continues until the UAV height is less than the minHoverHeight
-                     at which point the UAV is instructed to land at the final position. 
-        """
-
-        #Perform landing sequence while the current hover height is greater than the minimum hover height
-        while((self._hoverHeight >= self._minHoverHeight)):
-            #Get current position and save to temp variable, then copy to actual variable to prevent erroneous overwriting
-            temp = self._getUAVPosition()
-            print("LPC: _performLandingSequence - updatedPosition =" + str(self._updatedPosition), file=self._debugFile)
-            #START STATEMENT
-            if(temp != None):
-                startPos = temp.copy()
-            print("LPC: _performLandingSequence - startPos1 =" + str(startPos), file=self._debugFile)
-
-            if(self._uavInBoundary(startPos) == False):
-                #self._moveUAVInsideBoundary(startPos)
-                print("LPC: _performLandingSequence - UAV not in boundary")
-            
-            offset = self._calculateOffset()
-            print("LPC: _performLandingSequence - Offset =" + str(offset), file=self._debugFile)
-            
-            #If the magnitude is greater than the desired accuracy value, move the UAV in the X-Y plane
-            if(self._uavOnTarget(offset) == False):
-                temp = [startPos[0]+offset[0], startPos[1]+offset[1], offset[2]]
-                expectedPos = temp.copy()
-                print("LPC: _performLandingSequence - expecetdPos =" + str(expectedPos), file=self._debugFile)
-                self._sendToHome(startPos[0], startPos[1])
-
-                #After movement, get the new UAV position so that the offset can be determined
-                temp = self._getUAVPosition()
-                if(temp != None):
-                    endPos = temp.copy()
-                print("LPC: _performLandingSequence - endPos =" + str(endPos), file=self._debugFile)
-                        
-                #After movement, make sure the UAV is aligned properly
-                percentDiffX = expectedPos[0]/math.fabs(expectedPos[0] - endPos[0])
-                percentDiffY = expectedPos[1]/math.fabs(expectedPos[1] - endPos[1])
-                #If percent difference is greater than threshold and the angle is zero, create new transform
-                if((percentDiffX > self._coordTolerance or percentDiffY > self._coordTolerance) and self._uavOffsetAngle == 0):
-                    print("LPC: _performLandingSequence - Creating new transform", file=self._debugFile)
-                    self._createCoordinateTransform(startPos, expectedPos, endPos)
-                elif((percentDiffX > self._coordTolerance or percentDiffY > self._coordTolerance) and self._uavOffsetAngle != 0):
-                    print("LPC: _performLandingSequence - Resetting Angle", file=self._debugFile)
-                    print("LPC: _performLandingSequence - offsetAngle =" + str(self._uavOffsetAngle), file=self._debugFile)
-                    self._uavOffsetAngle = 0
-                #self._alignUAV(startPos, expectedPos, endPos)
-                
-            #Otherwise, move the UAV in the -Z direction
-            else:
-                self._sendMovement(0, 0, 0.1*offset[2]) 
+        Description: Safe to call from any thread or a signal handler. The landing state machine aborts at its next tick,
+                     which in step landing mode is once the current move has finished, and engageFlightRoutine then returns.
+                     done must only be called once it has.
+        """
+        self._stopRequested.set()
+        return
+
+    def _guardStop(self, now, state):
+        """
+        Function:    _guardStop
+        Purpose:     Abort the landing once a stop has been requested with requestStop
+        Inputs:      now - a floating point value, the current time
+                     state - a string value, the current landing state
+        Outputs:     LandingStateMachine.ABORT, or None to carry on
+        Description: See purpose.
+        """
+        if(self._stopRequested.is_set() and state != LandingStateMachine.ABORT):
+            self._log.warning("_guardStop - Stop requested in %s", state)
+            return LandingStateMachine.ABORT
+        return None
+
+    def _guardCamera(self, now, state):
+        """
+        Function:    _guardCamera
+        Purpose:     Abort the landing when the camera connection has failed
+        Inputs:      now - a floating point value, the current time
+                     state - a string value, the current landing state
+        Outputs:     LandingStateMachine.ABORT, or None to carry on
+        Description: Without the camera the UAV cannot be told apart from one that is out of frame, so it is landed where
+                     it is rather than left climbing to look for itself.
+        """
+        if(self._cameraReader.failed and state != LandingStateMachine.ABORT):
+            self._log.warning("_guardCamera - Camera connection failed in %s", state)
+            return LandingStateMachine.ABORT
+        return None
+
+    def _guardBattery(self, now, state):
+        """
+        Function:    _guardBattery
+        Purpose:     Abort the landing when the UAV battery is too low to keep searching for the target
+        Inputs:      now - a floating point value, the current time
+                     state - a string value, the current landing state
+        Outputs:     LandingStateMachine.ABORT, or None to carry on
+        Description: Only checked before the UAV is over the target, once the final adjustment has begun it is finished.
+        """
+        if(self._minBatteryVoltage == None or state not in (LandingStateMachine.ACQUIRE, LandingStateMachine.ALIGN, LandingStateMachine.DESCEND)):
+            return None
+        voltage = self._getBatteryLevel()
+        if(voltage != None and voltage < self._minBatteryVoltage):
+            self._log.warning("_guardBattery - Battery at %s V", voltage)
+            return LandingStateMachine.ABORT
+        return None
+
+    def _closedLoopState(self, now):
+        """
+        Function:    _closedLoopState
+        Purpose:     Get the Kalman filter estimate if the camera has seen the UAV recently
+        Inputs:      now - a floating point value, the current time
+        Outputs:     a StateEstimator.StateEstimate value, or None if no camera data point has arrived within cameraTimeout
+        Description: See purpose.
+        """
+        state = self._tracker.predict(now)
+        if(state == None or state.lastFixTime == None or now - state.lastFixTime > self._cameraTimeout):
+            return None
+        return state
+
+    def _streamVelocity(self, velocity):
+        """
+        Function:    _streamVelocity
+        Purpose:     Send a camera frame velocity setpoint to the UAV
+        Inputs:      velocity - a list of vx, vy, vz floating point values in the camera frame, in meters per second
+        Outputs:     None
+        Description: The velocity is transformed into the UAV frame as in _sendToHome.
+        """
+        velocityX = velocity[0]*math.cos(self._uavOffsetAngle) + velocity[1]*math.sin(self._uavOffsetAngle)
+        velocityY = -velocity[0]*math.sin(self._uavOffsetAngle) + velocity[1]*math.cos(self._uavOffsetAngle)
+        self._recordCommand(FlightRecorder.COMMAND_VELOCITY, velocityX, velocityY, velocity[2])
+        self._uav.setVelocity(velocityX, velocityY, velocity[2])
+        self._lastMovementTime = time.monotonic()
+        return
+
+    def _enterAcquire(self, now):
+        """
+        Function:    _enterAcquire
+        Purpose:     Start looking for the UAV again
+        Inputs:      now - a floating point value, the current time
+        Outputs:     None
+        Description: The velocity controller integral terms are cleared, as they no longer describe where the UAV is.
+        """
+        self._velocityController.reset()
+        return
+
+    def _tickAcquire(self, now):
+        """
+        Function:    _tickAcquire
+        Purpose:     Climb until the camera sees the UAV
+        Inputs:      now - a floating point value, the current time
+        Outputs:     the next landing state, or None to stay
+        Description: Climbing widens the camera view. In closedLoop mode the UAV climbs at descentVelocity up to
+                     maxHoverHeight, in step mode it climbs half a meter per tick as before.
+        """
+        if(self._landingMode == 'closedLoop'):
+            height = self._uavGetHeight()
+            if(self._closedLoopState(now) != None):
+                return LandingStateMachine.ALIGN
+            if(self._uavLost == False):
+                self._log.debug("_tickAcquire - UAV Not in Frame")
+                self._uavLost = True
+            self._streamVelocity((0.0, 0.0, self._descentVelocity if height != None and height < self._maxHoverHeight else 0.0))
+        else:
+            if(self._uavInFrame()):
+                return LandingStateMachine.ALIGN
+            self._log.debug("_tickAcquire - UAV going up")
+            self._sendMovement(0, 0, 0.5)
+        return None
+
+    def _tickClosedLoop(self, now, descending):
+        """
+        Function:    _tickClosedLoop
+        Purpose:     Send one velocity setpoint towards the landing position
+        Inputs:      now - a floating point value, the current time
+                     descending - a boolean value, allow the controller to descend while on target
+        Outputs:     the next landing state, or None to stay
+        Description: The Kalman filter estimate is extrapolated to now and handed to the velocity controller. The UAV
+                     descends only while within the on target radius for its height, faster the closer it is to the
+                     center, and starts descending only once inside it by onTargetHysteresis. Once below minHoverHeight
+                     and on target, the final offset is next.
+        """
+        dt = now - self._lastTickTime if self._lastTickTime != None else 1.0/self._setpointRate
+        self._lastTickTime = now
+        height = self._uavGetHeight()
+        state = self._closedLoopState(now)
+        if(state == None):
+            return LandingStateMachine.ACQUIRE
+        self._uavLost = False
+        if(height == None):
+            self._streamVelocity((0.0, 0.0, 0.0))
+            return None
+
+        radius = self._onTargetRadius()
+        onTarget = math.hypot(self._landingPos[0] - state.x, self._landingPos[1] - state.y) < (radius if descending else (1 - self._onTargetHysteresis)*radius)
+        if(onTarget and height <= self._minHoverHeight):
+            return LandingStateMachine.FINAL_OFFSET
+        if(onTarget != descending):
+            return LandingStateMachine.DESCEND if onTarget else LandingStateMachine.ALIGN
+
+        velocity = self._velocityController.update(state, self._landingPos, radius, dt)
+        if(descending == False):
+            velocity = (velocity[0], velocity[1], 0.0)
+        self._traceDecision([self._lastTrackedFix] if self._lastTrackedFix != None else [])
+        if(self._latency != None):
+            self._latency.move(self._decision, velocity)
+        self._streamVelocity(velocity)
+        return None
+
+    def _tickAlignClosedLoop(self, now):
+        """
+        Function:    _tickAlignClosedLoop
+        Purpose:     Move over the landing position without descending in closedLoop landing mode
+        Inputs:      now - a floating point value, the current time
+        Outputs:     the next landing state, or None to stay
+        Description: See _tickClosedLoop.
+        """
+        return self._tickClosedLoop(now, False)
+
+    def _tickDescendClosedLoop(self, now):
+        """
+        Function:    _tickDescendClosedLoop
+        Purpose:     Descend while staying over the landing position in closedLoop landing mode
+        Inputs:      now - a floating point value, the current time
+        Outputs:     the next landing state, or None to stay
+        Description: See _tickClosedLoop.
+        """
+        return self._tickClosedLoop(now, True)
+
+    def _tickAlignStep(self, now):
+        """
+        Function:    _tickAlignStep
+        Purpose:     Make one move towards the landing position
+        Inputs:      now - a floating point value, the current time
+        Outputs:     the next landing state, or None to stay
+        Description: This function determines the current UAV position and moves the UAV towards the landing position.
+                     Once the UAV is on target by the uavOnTarget function, DESCEND is next. With descentProfile on, the
+                     move also descends, and DESCEND is next, whenever the planner expects the UAV to be within the
+                     horn at a lower height after the move.
+        """
+        startPos, startUpdated, offset = self._startStep("_tickAlignStep")
+        if(self._uavOnTarget(offset)):
+            return LandingStateMachine.DESCEND
+
+        if(self._descentProfile):
+            dx, dy, dz = self._descentPlanner.nextMove(self._hoverHeight, offset[0], offset[1], self._positionRadius)
+            if(dz < 0):
+                self._stepTowardsTarget(startPos, startUpdated, dz)
+                return LandingStateMachine.DESCEND
+
+        self._stepTowardsTarget(startPos, startUpdated, 0)
+        return None
+
+    def _tickDescendStep(self, now):
+        """
+        Function:    _tickDescendStep
+        Purpose:     Descend while the UAV stays on target
+        Inputs:      now - a floating point value, the current time
+        Outputs:     the next landing state, or None to stay
+        Description: With descentProfile on, each move corrects the lateral error and descends as far as the descent
+                     planner allows, in one combined move. Otherwise, or when the planner allows no descent, the UAV height
+                     is reduced by ten percent while it is on target. Once the UAV height is less than the minHoverHeight,
+                     FINAL_OFFSET is next. If the UAV has drifted off target and cannot descend, ALIGN is next.
+        """
+        if(self._hoverHeight < self._minHoverHeight or (self._descentProfile and self._descentPlanner.atBottom(self._hoverHeight))):
+            return LandingStateMachine.FINAL_OFFSET
+        startPos, startUpdated, offset = self._startStep("_tickDescendStep")
+
+        if(self._descentProfile):
+            dx, dy, dz = self._descentPlanner.nextMove(self._hoverHeight, offset[0], offset[1], self._positionRadius)
+            if(dz < 0):
+                self._stepTowardsTarget(startPos, startUpdated, dz)
+                return None
+
+        if(self._uavOnTarget(offset, True) == False):
+            return LandingStateMachine.ALIGN
+        self._sendMovement(0, 0, 0.1*offset[2])
+        self._descentSteps += 1
+        return None
+
+    def _startStep(self, caller):
+        """
+        Function:    _startStep
+        Purpose:     Get the UAV position and offset before a step move
+        Inputs:      caller - a string value, the name of the calling function for debug messages
+        Outputs:     a tuple of the start position list, whether it was updated, and the offset list
+        Description: The first step of a landing also predicts how many moves and how long the descent will take, which
+                     is compared with the actual landing once the final offset is reached.
+        """
+        #Get current position, then copy it to prevent erroneous overwriting
+        self._getUAVPosition()
+        self._log.debug("%s - updatedPosition = %s", caller, self._updatedPosition)
+        startPos = self._uavPos.copy()
+        startUpdated = self._updatedPosition
+        self._log.debug("%s - startPos = %s", caller, startPos)
+
+        if(self._uavInBoundary(startPos) == False):
+            #self._moveUAVInsideBoundary(startPos)
+            self._log.debug("%s - UAV not in boundary", caller)
+
+        offset = self._calculateOffset()
+        self._log.debug("%s - Offset = %s", caller, offset)
+
+        if(self._descentStart == None and self._descentProfile):
+            self._descentStart = time.monotonic()
+            self._descentPrediction = self._descentPlanner.predict(self._hoverHeight, math.hypot(offset[0], offset[1]), self._positionRadius if math.isfinite(self._positionRadius) else 0.0)
+            self._log.info("%s - Predicted descent = %s", caller, self._descentPrediction)
+        return startPos, startUpdated, offset
+
+    def _stepTowardsTarget(self, startPos, startUpdated, zDis):
+        """
+        Function:    _stepTowardsTarget
+        Purpose:     Move the UAV over the landing position, optionally descending at the same time
+        Inputs:      startPos - a list of x, y, z floating point values, the UAV position before the move
+                     startUpdated - a boolean value, whether startPos came from fresh camera data points
+                     zDis - a floating point value denoting the distance, in meters, to move along the z-axis
+        Outputs:     None
+        Description: After the movement completes the actual UAV position is determined. The commanded move and the move
+                     seen by the camera are added to the rotation estimator, and the UAV frame angle offset variable is
+                     updated from it once the estimate is confident.
+        """
+        commanded = self._sendToHome(startPos[0], startPos[1], zDis)
+        self._descentSteps += 1
+
+        #After movement, get the new UAV position so that the offset can be determined
+        self._getUAVPosition()
+        endPos = self._uavPos.copy()
+        self._log.debug("_stepTowardsTarget - endPos = %s", endPos)
+
+        #After movement, refine the UAV frame rotation with the commanded and observed moves
+        if(startUpdated and self._updatedPosition):
+            self._updateCoordinateTransform(commanded, startPos, endPos)
+        return
+
+    def _enterFinalOffset(self, now):
+        """
+        Function:    _enterFinalOffset
+        Purpose:     Stop the descent before the final adjustment
+        Inputs:      now - a floating point value, the current time
+        Outputs:     None
+        Description: In closedLoop mode the UAV is brought to a hover. In step mode with descentProfile on, the actual descent is
+                     reported against the one predicted by the descent planner.
+        """
+        if(self._landingMode == 'closedLoop'):
+            self._recordCommand(FlightRecorder.COMMAND_VELOCITY)
+            self._uav.setVelocity(0, 0, 0)
+            self._lastMovementTime = time.monotonic()
+        elif(self._descentStart != None):
+            self._log.info("_enterFinalOffset - Descent took %d moves in %.2f s, predicted %d moves in %.2f s", self._descentSteps, now - self._descentStart,
+                           self._descentPrediction.steps, self._descentPrediction.duration)
 
         #Turn on the charging pad
         self._setPadPin(1)
+        return
 
-        #Perform final position adjustment
+    def _tickFinalOffset(self, now):
+        """
+        Function:    _tickFinalOffset
+        Purpose:     Make the final position adjustment by landingOffset
+        Inputs:      now - a floating point value, the current time
+        Outputs:     LandingStateMachine.TOUCHDOWN
+        Description: See purpose.
+        """
         self._sendMovement(self._landingOffset[0], self._landingOffset[1], self._landingOffset[2])
-        
-        #Perform Landing Operations Here
+        return LandingStateMachine.TOUCHDOWN
+
+    def _tickTouchdown(self, now):
+        """
+        Function:    _tickTouchdown
+        Purpose:     Land the UAV on the platform
+        Inputs:      now - a floating point value, the current time
+        Outputs:     LandingStateMachine.CHARGE
+        Description: See purpose.
+        """
+        self._recordCommand(FlightRecorder.COMMAND_LAND)
         self._uav.land()
+        self._recordCommand(FlightRecorder.COMMAND_DONE)
+        self._lastMovementTime = time.monotonic()
+        return LandingStateMachine.CHARGE
+
+    def _tickFinished(self, now):
+        """
+        Function:    _tickFinished
+        Purpose:     Stay in a final landing state
+        Inputs:      now - a floating point value, the current time
+        Outputs:     None
+        Description: See purpose.
+        """
+        return None
+
+    def _enterAbort(self, now):
+        """
+        Function:    _enterAbort
+        Purpose:     Land the UAV where it is
+        Inputs:      now - a floating point value, the current time
+        Outputs:     None
+        Description: In closedLoop mode the streamed velocity is stopped first.
+        """
+        self._log.warning("_enterAbort - Landing at current position.")
+        if(self._landingMode == 'closedLoop'):
+            self._recordCommand(FlightRecorder.COMMAND_VELOCITY)
+            self._uav.setVelocity(0, 0, 0)
+        self._recordCommand(FlightRecorder.COMMAND_LAND)
+        self._uav.land()
+        self._recordCommand(FlightRecorder.COMMAND_DONE)
+        self._lastMovementTime = time.monotonic()
         return
 
-    def _uavOnTarget(self, offsetVector):
+    def done(self):
+        """
+        Function:    done
+        Purpose:     Halt all class activities
+        Inputs:      None
+        Outputs:     None
+        Description: See Purpose.
+        """
+        self._recordCommand(FlightRecorder.COMMAND_LAND)
+        self._uav.land()
+        self._recordCommand(FlightRecorder.COMMAND_DONE)
+        if(hasattr(self._uav, 'removeTelemetryListener')):
+            self._uav.removeTelemetryListener(self._trackTelemetry)
+            if(self._recorder != None):
+                self._uav.removeTelemetryListener(self._recorder.recordTelemetry)
+        self._uav.done()
+        self._cameraReader.stop()
+        self.detachEventLoop()
+        self._camera.close()
+        if(self._recorder != None):
+            count = self._recorder.close()
+            self._log.info("done - flight recording of %d records in %s", count, self._recorder.path)
+        if(self._latency != None and self._log.isEnabledFor(logging.INFO)):
+            self._log.info("done - latency in ms\n%s", self._latency.formatReport())
+        for decision, (decisions, samples) in self._sampleCounts.items():
+            if(decisions > 0):
+                self._log.info("done - %s decisions = %d, samples per decision = %.2f", decision, decisions, samples/decisions)
+        GPIO.cleanup()
+        if(self._metricsServer != None):
+            self._metricsServer.stop()
+        if(self._metrics != None and self._metricsFile != None):
+            try:
+                self._metrics.dump(self._metricsFile)
+                self._log.info("done - metrics written to %s", self._metricsFile)
+            except OSError as error:
+                self._log.warning("done - Unable to write metrics to %s, %s", self._metricsFile, error)
+        self._debugLog.close(self._ownsDebugStream)
+        return
+    
+    def _uavOnTarget(self, offsetVector, descending=False):
         """
         Function:    _uavOnTarget
         Purpose:     Determine if the UAV is within the target area for its specific height
         Inputs:      offsetVector - a list of floating point values representing the <dX, dY> necessary for the UAV to move to reach the center point
+                     descending - a boolean value, the UAV is already descending and keeps the full radius rather than the radius less onTargetHysteresis
         Outputs:     a boolean value indicating whether the UAV is within the target area for its specific height
         Description: _uavOnTarget determines if the UAV is within the appropriate offset from the target point by calculating the offset vector
                      magnitude and comparing it to a value calculated by solving the function h = log_{k}(r) for the radius, r, where h is the 
@@ -722,50 +1972,60 @@ class LandingPlatformController():
         offsetMag = math.sqrt(math.pow(offsetVector[0],2) + math.pow(offsetVector[1],2))
 
         #Assumes the _uavHoverHeight variable has been recently updated
-        maxOffset = math.pow(self._onTargetFactor, self._hoverHeight - self._onTargetOffset)
+        maxOffset = self._onTargetRadius()
+        if(descending == False):
+            maxOffset *= 1 - self._onTargetHysteresis
 
-        print("LPC: _uavOnTarget - maxOffset =" + str(maxOffset), file=self._debugFile)
+        self._log.debug("_uavOnTarget - maxOffset = %s", maxOffset)
         
         #If the maximum offset allowed at the UAV height is greater than current offset, return true
         if(maxOffset > offsetMag):
             return True
         return False
 
+    def _onTargetRadius(self):
+        """
+        Function:    _onTargetRadius
+        Purpose:     Calculate the radius of the accuracy horn at the current height
+        Inputs:      None
+        Outputs:     a floating point value denoting the largest offset, in meters, at which the UAV is considered on target
+        Description: Solves h = log_{k}(r) for r, offset by onTargetOffset in height. Assumes the _hoverHeight variable has been recently updated.
+        """
+        return math.pow(self._onTargetFactor, self._hoverHeight - self._onTargetOffset)
+
     def _uavInBoundary(self, position):
         """
-        Function:    _uavOnTarget
-        Purpose:     Determine if the UAV is within the target area for its specific height
-        Inputs:      positionVector - a list of floating point values representing the <x, y> position of the UAV
+        Function:    _uavInBoundary
+        Purpose:     Determine if the UAV is within the boundary area for its specific height
+        Inputs:      position - a list of floating point values representing the <x, y> position of the UAV
         Outputs:     a boolean value indicating whether the UAV is within the boundary area for its specific height
-        Description: This function uses the given position vector to determine if the UAV is within the boundary
-                     for its current height. This is accomplished by using the pixel conversion function to determine
-                     the distance at height for pixel coordinate <255,255>. 
+        Description: This function uses the given position vector to determine if the UAV is within the camera view
+                     for its current height, less frameMargin. The footprint of the view is traced once by the camera
+                     model and scaled by the height, so this does not convert any pixels.
         """
-        #Calculate the boundary radius by using the viewing angle and the maxHoverHeight to create a triangle
-        boundaryRadius = min(self._pixelConversion(255,255,self._hoverHeight))
-        
-        #Calculate the positional radius from the center by calculating the magnitude of the x,y vector
-        positionRadius = math.sqrt(math.pow(position[0],2) + math.pow(position[1],2))
+        inBoundary = self._cameraModel.contains(position[0], position[1], self._hoverHeight, self._frameMargin)
+        self._log.debug("_uavInBoundary - inBoundary = %s", inBoundary)
+        return inBoundary
 
-        print("LPC: _uavInBoundary - boundaryRadius = " + str(boundaryRadius), file=self._debugFile)
-        print("LPC: _uavInBoundary - positionRadius = " + str(positionRadius), file=self._debugFile)
-        
-        #If the position is outside boundary, return false. Otherwise, true.
-        if(positionRadius > boundaryRadius):
-            return False
-        return True
-
-    def _createCoordinateTransform(self, startPosition, expectedPosition, endPosition):
+    def _updateCoordinateTransform(self, commanded, startPosition, endPosition):
         """
-        Function:    _createCoordinateTransform
-        Purpose:     Calculate the necessary angle to allow for UAV coordinates to be transformed from camera coordinates
-        Inputs:      startPosition - a list of values indicating the starting <x, y> coordinates of the UAV in the view of the camera
-                     expectedPosition - a list of values indicating expected <x, y> coordinates of the UAV in the view of the camera
-                     actualVector - a list of values indicating the actual <x, y> coordinates of the UAV in the view of the camera
+        Function:    _updateCoordinateTransform
+        Purpose:     Refine the angle that allows for UAV coordinates to be transformed from camera coordinates
+        Inputs:      commanded - a list of values indicating the <x, y> distance the UAV was instructed to move in its own frame
+                     startPosition - a list of values indicating the starting <x, y> coordinates of the UAV in the view of the camera
+                     endPosition - a list of values indicating the actual <x, y> coordinates of the UAV in the view of the camera after the move
         Outputs:     The offset angle in degrees
-        Description: This function calculates the UAV frame offset angle by using atan2. 
+        Description: The move is added to the sliding window rotation estimator, which fits the rotation over every move in
+                     the window rather than a single one. The UAV frame offset angle is only replaced once rotationMinPairs
+                     moves are in the window and the standard error of the fit is below rotationMaxStd, and is otherwise kept, so one bad move cannot undo the estimate.
         """
-        self._uavOffsetAngle = math.atan2(expectedPosition[0]*endPosition[1] - expectedPosition[1]*endPosition[0], expectedPosition[0]*endPosition[0] - expectedPosition[1]*endPosition[1])
+        observed = [endPosition[0] - startPosition[0], endPosition[1] - startPosition[1]]
+        self._rotationEstimator.add(commanded, observed)
+        transform = self._rotationEstimator.estimate()
+        self._log.debug("_updateCoordinateTransform - transform = %s", transform)
+        if(transform != None and transform.angleStd < self._rotationMaxStd):
+            self._frameTransform = transform
+            self._uavOffsetAngle = transform.angle
         return math.degrees(self._uavOffsetAngle)
                         
     def _alignUAV(self, startPosition, expectedPosition, endPosition):
@@ -805,13 +2065,13 @@ class LandingPlatformController():
         internalVal = (math.pow(magnitudeExpected,2) + math.pow(magnitudeActual,2) - math.pow(magnitudeDiff,2))/(2*magnitudeExpected*magnitudeActual)
         angle = math.degrees(math.acos(internalVal))
         
-        print("LPC: _alignUAV - startCoord =" + str(startPosition), file=self._debugFile)
-        print("LPC: _alignUAV - expectedChange =" + str(expectedPosition), file=self._debugFile)
-        print("LPC: _alignUAV - actual =" + str(endPosition), file=self._debugFile)
-        print("LPC: _alignUAV - (magE, magA, magD) =" + str(magnitudeExpected) + "," + str(magnitudeActual) + "," + str(magnitudeDiff), file=self._debugFile)
-        print("LPC: _alignUAV - internalVal =" + str(internalVal), file=self._debugFile)
-        print("LPC: _alignUAV - angle =" + str(angle), file=self._debugFile)
-        print("LPC: _alignUAV - _uavOffsetAngle =" + str(self._uavOffsetAngle), file=self._debugFile)
+        self._log.debug("_alignUAV - startCoord = %s", startPosition)
+        self._log.debug("_alignUAV - expectedChange = %s", expectedPosition)
+        self._log.debug("_alignUAV - actual = %s", endPosition)
+        self._log.debug("_alignUAV - (magE, magA, magD) = %s,%s,%s", magnitudeExpected, magnitudeActual, magnitudeDiff)
+        self._log.debug("_alignUAV - internalVal = %s", internalVal)
+        self._log.debug("_alignUAV - angle = %s", angle)
+        self._log.debug("_alignUAV - _uavOffsetAngle = %s", self._uavOffsetAngle)
 
         #Reduce angle to below 360 while preserving original sign value
         #This step is likely unnecessary as math.cos should return a value from zero to two pi
@@ -823,7 +2083,10 @@ class LandingPlatformController():
         elif(angle < -180):
             angle = angle + 360
 
+        self._recordCommand(FlightRecorder.COMMAND_ROTATE, self._uavOffsetAngle)
         self._uav.rotate(self._uavOffsetAngle)
+        self._recordCommand(FlightRecorder.COMMAND_DONE)
+        self._lastMovementTime = time.monotonic()
         self._uavOffsetAngle = 0
 
         #After alignment, if the UAV is not inside the vision cone, increase the height to preserve <x, y> position
@@ -841,42 +2104,175 @@ class LandingPlatformController():
         Outputs:     a floating point value denote the battery percentage from zero to one hundred
         Description: Makes use of the UAV controller's built-in function to query the battery level
         """
-        return self._uav.getBatteryLevel()
+        return self._recordReading(FlightRecorder.READ_BATTERY, self._uav.getBatteryLevel())
    
     def _getCameraSerialConnection(self, expectedVals):
         """
-        Function:    _getAllSerialPorts
+        Function:    _getCameraSerialConnection
         Purpose:     Find the currently connected camera module by analyzing a series of serial values
-        Inputs:      expectedVals - an array of values that are expected to come from the serial connection
-                     offsetVal - an integer representing extra characters to pull in that are not part of expected values
-        Outputs:     A string that represents the port that has the camera connection
-        Description: Finds the camera serial connection based on the expected values. 
-        Note:        Performs a priming read which will discard the first value sent.
+        Inputs:      expectedVals - a string that is expected to come from the serial connection
+        Outputs:     A string that represents the port that has the camera connection, or None if it was not found
+        Description: Finds the camera serial connection based on the expected values. The port the camera was last found on is
+                     probed alone first, for at most cameraCachedProbeTimeout seconds, as it is nearly always still right. If
+                     it is not, every candidate port is probed at the same time on a thread pool, and the whole pass is limited
+                     to cameraDiscoveryTimeout seconds. The first port to send the expected values wins and is saved to the
+                     port cache. The other probes are then told to stop, and are waited for so that none still has its port
+                     open once this returns.
+        Note:        The bytes read while probing are discarded.
         """
+        startTime = time.monotonic()
+        deadline = startTime + self._cameraDiscoveryTimeout
+        expectedPacket = expectedVals.encode('ascii')
                
         #Create a blank camera port
         cameraPort = None
         
-        #Get all available serial ports
+        #Try the last known camera port on its own before opening every other port
         availablePorts = self._getAllSerialPorts()
+        cachedPort = self._readCachedCameraPort()
+        if(cachedPort in availablePorts):
+            cameraPort = self._probeSerialPort(cachedPort, expectedPacket, min(deadline, startTime + self._cameraCachedProbeTimeout))
         
         #For all ports returned, create a test connection and look for expected values
-        for port in availablePorts:
-            
+        if(cameraPort == None and len(availablePorts) > 0):
+            stop = threading.Event()
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(availablePorts))
+            pending = set(executor.submit(self._probeSerialPort, port, expectedPacket, deadline, stop) for port in availablePorts)
+            while(len(pending) > 0 and cameraPort == None):
+                done, pending = concurrent.futures.wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=concurrent.futures.FIRST_COMPLETED)
+                if(len(done) == 0):
+                    break
+                for future in done:
+                    if(future.result() != None):
+                        #If expected values are found, assign the string value of the port
+                        cameraPort = future.result()
+                        break
+            #Stop the remaining probes and wait for them to close their ports, each notices within one read timeout
+            stop.set()
+            executor.shutdown(wait=True)
+
+        if(cameraPort != None):
+            self._writeCachedCameraPort(cameraPort)
+            self._log.info("_getCameraSerialConnection - probed %d ports, found %s in %.3f s", len(availablePorts), cameraPort, time.monotonic() - startTime)
+        else:
+            self._log.debug("_getCameraSerialConnection - probed %d ports, found nothing in %.3f s", len(availablePorts), time.monotonic() - startTime)
+        return cameraPort
+
+    def _probeSerialPort(self, port, expectedPacket, deadline, stop=None):
+        """
+        Function:    _probeSerialPort
+        Purpose:     Check if a single serial port is sending the expected values
+        Inputs:      port - a string naming the serial port
+                     expectedPacket - a bytes value that is expected to come from the serial connection
+                     deadline - a floating point value in the time.monotonic() time base after which the probe gives up
+                     stop - a threading.Event value that makes the probe give up once set, or None
+        Outputs:     the port string if the expected values were read, otherwise None
+        Description: Runs on the discovery thread pool. Any failure to open or read the port counts as not found.
+        """
+        try:
             test = serial.Serial(port, timeout=0.01)
-            timeoutCount = 0
-            while(test.read(1).decode('ascii') != expectedVals[-1] and timeoutCount <= len(expectedVals)*4):
-                timeoutCount += 1
-                
-            if(test.read(len(expectedVals)).decode('ascii') == expectedVals):
-                #If expected values are found, assign the string value of the port
-                cameraPort = port
-        
+        except (OSError, serial.SerialException):
+            return None
+
+        received = bytearray()
+        found = False
+        try:
+            while(time.monotonic() < deadline and found == False and (stop == None or stop.is_set() == False)):
+                received += test.read(max(1, test.in_waiting))
+                found = expectedPacket in received
+                #Only the tail can still hold the start of the expected values
+                del received[:-len(expectedPacket)]
+        except (OSError, serial.SerialException):
+            found = False
+        finally:
             test.close()
-                
-        #Return the last found serial connection as a string value
-        return cameraPort
-        
+
+        if(found == True):
+            return port
+        return None
+
+    def _readCachedCameraPort(self):
+        """
+        Function:    _readCachedCameraPort
+        Purpose:     Read the serial port the camera was last found on
+        Inputs:      None
+        Outputs:     a string naming the port, or None if there is no cache
+        Description: See purpose.
+        """
+        if(self._cameraPortCache == None):
+            return None
+        try:
+            with open(self._cameraPortCache, 'r') as cacheFile:
+                return cacheFile.read().strip()
+        except OSError:
+            return None
+
+    def _writeCachedCameraPort(self, port):
+        """
+        Function:    _writeCachedCameraPort
+        Purpose:     Remember the serial port the camera was found on
+        Inputs:      port - a string naming the port
+        Outputs:     None
+        Description: Failure to write the cache is not an error, discovery will simply not be able to use it next time.
+        """
+        if(self._cameraPortCache == None):
+            return
+        try:
+            with open(self._cameraPortCache, 'w') as cacheFile:
+                cacheFile.write(port)
+        except OSError:
+            self._log.warning("_writeCachedCameraPort - could not write %s", self._cameraPortCache)
+        return
+
+    def _getUsbId(self, port):
+        """
+        Function:    _getUsbId
+        Purpose:     Find the USB vendor and product id of a serial port on linux
+        Inputs:      port - a string naming the serial port, such as /dev/ttyACM0
+        Outputs:     a string of the form 'vendor:product' in lowercase hex, or None if the port is not a USB device
+        Description: Follows the sysfs device link of the tty up through its parents until the USB device holding the
+                     idVendor and idProduct attributes is found. Nothing is opened on the port itself.
+        """
+        devicePath = os.path.join('/sys/class/tty', os.path.basename(port), 'device')
+        if(os.path.exists(devicePath) == False):
+            return None
+        devicePath = os.path.realpath(devicePath)
+        while(devicePath.startswith('/sys/devices') == True):
+            try:
+                with open(os.path.join(devicePath, 'idVendor')) as vendorFile, open(os.path.join(devicePath, 'idProduct')) as productFile:
+                    return vendorFile.read().strip().lower() + ':' + productFile.read().strip().lower()
+            except OSError:
+                devicePath = os.path.dirname(devicePath)
+        return None
+
+    def _negotiatePacketFormat(self):
+        """
+        Function:    _negotiatePacketFormat
+        Purpose:     Take the camera out of standby and agree on the packet format it will send
+        Inputs:      None
+        Outputs:     a string value, one of the CameraProtocol FORMAT values, that the camera is now sending
+        Description: Unless ascii is requested, the binary start string is sent first. A camera that supports the binary
+                     format answers with binary packets, which are recognized by their sync word and CRC. A camera that
+                     does not support it stays in standby, in which case the regular start string is sent and the ASCII
+                     format is used.
+        """
+        if(self._cameraPacketFormat != CameraProtocol.FORMAT_ASCII):
+            self._camera.write(CameraProtocol.BINARY_START_STRING.encode())
+            self._camera.timeout = 0.05
+            received = bytearray()
+            deadline = time.monotonic() + self._cameraNegotiateTimeout
+            while(time.monotonic() < deadline):
+                received += self._camera.read(max(1, self._camera.in_waiting))
+                index = received.find(CameraProtocol.BINARY_SYNC)
+                while(index >= 0 and len(received) - index >= CameraProtocol.BINARY_PACKET_LENGTH):
+                    if(CameraProtocol.decodeBinaryPacket(received, index) != None):
+                        return CameraProtocol.FORMAT_BINARY
+                    index = received.find(CameraProtocol.BINARY_SYNC, index + 1)
+            self._log.warning("_negotiatePacketFormat - Camera did not answer binary request, using ascii")
+
+        self._camera.write(self._cameraStartString.encode())
+        return CameraProtocol.FORMAT_ASCII
+
     def _getAllSerialPorts(self):
         """
         Function: _getAllSerialPorts
@@ -885,6 +2281,7 @@ class LandingPlatformController():
         Outputs:  array of all found ports represented as strings
         Credit:   Thomas, https://stackoverflow.com/questions/12090503/listing-available-com-ports-with-python
         Edits:    Joseph Haun
+        Note:     On linux with cameraUsbIds set, ports are filtered by their USB ids from sysfs and no port is opened.
         """
         #Create blank arrays for eventual contents
         availablePorts = []
@@ -900,6 +2297,10 @@ class LandingPlatformController():
         else:
             #If a known Operating System is not found, raise an exception
             raise EnvironmentError("_getAllSerialPorts: Operating System not supported")
+
+        #On linux the USB ids are available without opening anything, so only matching ports are kept
+        if(sys.platform.startswith("linux") == True and len(self._cameraUsbIds) > 0 and os.path.isdir('/sys/class/tty') == True):
+            return sorted(port for port in possiblePorts if self._getUsbId(port) in self._cameraUsbIds)
         
         for port in possiblePorts:
             try:
@@ -914,6 +2315,51 @@ class LandingPlatformController():
             
         return availablePorts
 
+    def _powerUpCamera(self):
+        """
+        Function:    _powerUpCamera
+        Purpose:     Power cycle the camera and wait until the OS has set up its USB serial port
+        Inputs:      None
+        Outputs:     a boolean value indicating if a new camera serial port appeared before cameraPowerTimeout
+        Description: On linux the camera ports present beforehand are noted and the camera is held off until they are
+                     gone, for at most cameraPowerTimeout seconds, so a port left from before the power cycle is never
+                     taken for the camera coming up. The camera is then turned on and the sysfs tty list is polled every
+                     cameraPowerPollInterval seconds for a port with one of the cameraUsbIds that was not still present
+                     when it was turned on. Nothing is opened while polling. Where the USB ids cannot be read, the
+                     camera is held off for cameraPowerPollInterval and the full cameraPowerTimeout is waited instead.
+        """
+        startTime = time.monotonic()
+        self._setCameraPin(0)
+
+        if(sys.platform.startswith("linux") == False or len(self._cameraUsbIds) == 0 or os.path.isdir('/sys/class/tty') == False):
+            time.sleep(self._cameraPowerPollInterval)
+            self._setCameraPin(1)
+            time.sleep(self._cameraPowerTimeout) #Sleep to allow the OS to setup USB
+            return True
+
+        #Hold the camera off until its old ports are removed
+        deadline = startTime + self._cameraPowerTimeout
+        oldPorts = set(self._getAllSerialPorts())
+        while(len(oldPorts) > 0 and time.monotonic() < deadline):
+            time.sleep(self._cameraPowerPollInterval)
+            oldPorts &= set(self._getAllSerialPorts())
+        if(len(oldPorts) > 0):
+            self._log.warning("_powerUpCamera - %s still present with the camera off", sorted(oldPorts))
+
+        #Turn the camera on and wait for a port that was not there while it was off
+        self._setCameraPin(1)
+        powerOnTime = time.monotonic()
+        deadline = powerOnTime + self._cameraPowerTimeout
+        enumerated = False
+        while(enumerated == False and time.monotonic() < deadline):
+            if(len(set(self._getAllSerialPorts()) - oldPorts) > 0):
+                enumerated = True
+            else:
+                time.sleep(self._cameraPowerPollInterval)
+
+        self._log.info("_powerUpCamera - enumerated = %s after %.3f s off and %.3f s on", enumerated, powerOnTime - startTime, time.monotonic() - powerOnTime)
+        return enumerated
+
     def _setCameraPin(self, state):
         """
         Function: _toggleCameraPower
@@ -0,0 +1,259 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      LandingStateMachine
+Purpose:   This file contains the state machine that drives the LandingPlatformController class
+           through a landing. Each state has a tick function that does a bounded amount of work
+           and names the next state, so the machine never waits inside a loop of its own and
+           can be ticked at a fixed rate alongside other work in the same process.
+
+           ACQUIRE      - climb until the camera sees the UAV
+           ALIGN        - move over the landing point while holding height
+           DESCEND      - come down while staying over the landing point
+           FINAL_OFFSET - charging pad on, final position adjustment
+           TOUCHDOWN    - land on the pad
+           CHARGE       - on the pad, finished
+           ABORT        - land at the current position, finished
+
+           A state that outlives its deadline is left for its timeout state, ABORT by default.
+           Guards run before every tick and may force a transition, for example on low battery.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import collections
+import time
+
+ACQUIRE = 'ACQUIRE'
+ALIGN = 'ALIGN'
+DESCEND = 'DESCEND'
+FINAL_OFFSET = 'FINAL_OFFSET'
+TOUCHDOWN = 'TOUCHDOWN'
+CHARGE = 'CHARGE'
+ABORT = 'ABORT'
+
+STATES = (ACQUIRE, ALIGN, DESCEND, FINAL_OFFSET, TOUCHDOWN, CHARGE, ABORT)
+
+#States the machine stops in
+FINAL_STATES = (CHARGE, ABORT)
+
+#A change of state, reason is 'tick', 'deadline' or 'guard'. A deadline is that of the state or of the whole landing
+Transition = collections.namedtuple('Transition', ['timestamp', 'previous', 'next', 'reason'])
+
+#The functions and deadline of one state
+StateSpec = collections.namedtuple('StateSpec', ['tick', 'enter', 'exit', 'deadline', 'timeoutState'])
+
+class LandingStateMachine():
+
+    def __init__(self, initial=ACQUIRE, finalStates=FINAL_STATES, deadline=None, timeoutState=ABORT, maxTransitions=1000):
+        """
+        Function:    __init__
+        Purpose:     Setup an empty landing state machine
+        Inputs:      initial - a string value, the state the machine starts in
+                     finalStates - a list of string values, the states in which the machine is finished
+                     deadline - a floating point value, the longest time before the machine is finished in seconds, None for no limit
+                     timeoutState - a string value, the state entered once the deadline passes
+                     maxTransitions - an integer value, the number of latest transitions kept for getTransitions
+        Outputs:     None
+        Description: States are added with addState. The initial state is entered on the first tick, so its enter
+                     function and deadlines are timed from when the machine actually starts. Unlike the deadline of a
+                     state, the machine deadline is not restarted by transitions, so a machine that keeps moving between
+                     states still finishes.
+        """
+        self._specs = dict()
+        self._guards = []
+        self._hooks = []
+        self._initial = initial
+        self._finalStates = tuple(finalStates)
+        self._deadline = deadline
+        self._timeoutState = timeoutState
+        self._state = None
+        self._startedAt = None
+        self._enteredAt = None
+        self._timeInState = collections.defaultdict(float)
+        self._transitions = collections.deque(maxlen=maxTransitions)
+
+    def addState(self, state, tick, enter=None, exit=None, deadline=None, timeoutState=ABORT):
+        """
+        Function:    addState
+        Purpose:     Define the behaviour of a state
+        Inputs:      state - a string value, the name of the state
+                     tick - a function taking the current time and returning the next state, or None to stay
+                     enter - a function taking the current time, called once when the state is entered
+                     exit - a function taking the current time, called once when the state is left
+                     deadline - a floating point value, the longest time to stay in the state in seconds, None for no limit
+                     timeoutState - a string value, the state entered once the deadline passes
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._specs[state] = StateSpec(tick, enter, exit, deadline, timeoutState)
+        return
+
+    def addGuard(self, guard):
+        """
+        Function:    addGuard
+        Purpose:     Add a check that runs before every tick
+        Inputs:      guard - a function taking the current time and state, returning a state to force or None
+        Outputs:     None
+        Description: Guards are not run once the machine is finished.
+        """
+        self._guards.append(guard)
+        return
+
+    def addTransitionHook(self, hook):
+        """
+        Function:    addTransitionHook
+        Purpose:     Add a function called on every change of state
+        Inputs:      hook - a function taking a Transition value
+        Outputs:     None
+        Description: Hooks run after the previous state's exit function and before the next state's enter function.
+        """
+        self._hooks.append(hook)
+        return
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def finished(self):
+        return self._state in self._finalStates
+
+    def timeInState(self, now=None):
+        """
+        Function:    timeInState
+        Purpose:     Report the total time spent in each state
+        Inputs:      now - a floating point value in the time.monotonic() time base, defaults to now
+        Outputs:     a dictionary of state names to floating point values in seconds
+        Description: Time in the current state is included up to now.
+        """
+        if(now == None):
+            now = time.monotonic()
+        totals = dict(self._timeInState)
+        if(self._state != None):
+            totals[self._state] = totals.get(self._state, 0.0) + (now - self._enteredAt)
+        return totals
+
+    def getTransitions(self):
+        """
+        Function:    getTransitions
+        Purpose:     Get the latest changes of state
+        Inputs:      None
+        Outputs:     a list of Transition values ordered from oldest to newest
+        Description: Only the latest maxTransitions are kept, so a machine moving back and forth does not grow without bound.
+        """
+        return list(self._transitions)
+
+    def _transition(self, now, state, reason):
+        """
+        Function:    _transition
+        Purpose:     Leave the current state and enter another
+        Inputs:      now - a floating point value, the current time
+                     state - a string value, the state to enter
+                     reason - a string value, what caused the transition
+        Outputs:     None
+        Description: A transition to the current state restarts it, including its deadline.
+        """
+        if(state not in self._specs):
+            raise KeyError("LSM: _transition - unknown state " + str(state))
+        previous = self._state
+        if(previous != None):
+            self._timeInState[previous] += now - self._enteredAt
+            if(self._specs[previous].exit != None):
+                self._specs[previous].exit(now)
+        self._state = state
+        self._enteredAt = now
+        transition = Transition(now, previous, state, reason)
+        self._transitions.append(transition)
+        for hook in self._hooks:
+            hook(transition)
+        if(self._specs[state].enter != None):
+            self._specs[state].enter(now)
+        return
+
+    def tick(self, now=None):
+        """
+        Function:    tick
+        Purpose:     Advance the machine by one step
+        Inputs:      now - a floating point value in the time.monotonic() time base, defaults to now
+        Outputs:     a string value, the state after the step
+        Description: The first tick enters the initial state. After that the guards are run, then the deadline of the
+                     machine and of the current state are checked, then the state's tick function is run. Only one of these can cause a
+                     transition per tick, and the new state is not ticked until the next call, so every tick does a
+                     bounded amount of work.
+        """
+        if(now == None):
+            now = time.monotonic()
+        if(self._state == None):
+            self._startedAt = now
+            self._transition(now, self._initial, 'tick')
+            return self._state
+        if(self.finished):
+            return self._state
+
+        for guard in self._guards:
+            forced = guard(now, self._state)
+            if(forced != None and forced != self._state):
+                self._transition(now, forced, 'guard')
+                return self._state
+
+        if(self._deadline != None and now - self._startedAt > self._deadline):
+            self._transition(now, self._timeoutState, 'deadline')
+            return self._state
+
+        spec = self._specs[self._state]
+        if(spec.deadline != None and now - self._enteredAt > spec.deadline):
+            self._transition(now, spec.timeoutState, 'deadline')
+            return self._state
+
+        nextState = spec.tick(now)
+        if(nextState != None):
+            self._transition(now, nextState, 'tick')
+        return self._state
+
+    def run(self, rate, clock=None, sleep=None):
+        """
+        Function:    run
+        Purpose:     Tick the machine at a fixed rate until it is finished
+        Inputs:      rate - a floating point value, the number of ticks per second
+                     clock - a function returning the current time in seconds, defaults to time.monotonic
+                     sleep - a function that waits a number of seconds, defaults to time.sleep
+        Outputs:     a string value, the final state
+        Description: Ticks are scheduled on a fixed grid so the rate does not drift. If a tick overruns, the grid is
+                     restarted from the current time rather than ticking back to back to catch up.
+        """
+        clock = clock or time.monotonic
+        sleep = sleep or time.sleep
+        period = 1.0/rate
+        nextTime = clock()
+        while(self.finished == False):
+            self.tick(clock())
+            nextTime += period
+            delay = nextTime - clock()
+            if(delay > 0):
+                sleep(delay)
+            else:
+                nextTime = clock()
+        return self._state
@@ -0,0 +1,167 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      LatencyTracer
+Purpose:   This file contains the tracer used by the LandingPlatformController class to measure
+           how old a camera fix is at each point between the camera and the UAV radio.
+
+           capture->usb    - camera capture tick to the host reading the packet from USB
+           usb->parse      - host reading the packet to the fix being parsed and available
+           parse->decision - newest fix available to the position decision that used it
+           decision->radio - position decision to the move command being sent to the UAV
+
+           The camera clock and host clock share no origin, so capture->usb is measured against
+           the fastest packet seen so far. It reports the delay above that minimum, which is what
+           varies with camera load, and is only available for binary packets that carry a tick.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import collections
+import itertools
+import time
+
+import numpy as np
+
+STAGES = ('capture->usb', 'usb->parse', 'parse->decision', 'decision->radio')
+
+#Percentiles reported for each stage
+PERCENTILES = (50, 90, 99)
+
+#A position decision, fixIds are the ids of the camera fixes it was made from
+Decision = collections.namedtuple('Decision', ['id', 'timestamp', 'fixIds'])
+
+#A move command sent to the UAV and the decision it acted on
+MoveRecord = collections.namedtuple('MoveRecord', ['timestamp', 'decisionId', 'fixIds', 'distance'])
+
+#Latency percentiles for one stage, in seconds
+StageReport = collections.namedtuple('StageReport', ['stage', 'count', 'percentiles', 'max'])
+
+class LatencyTracer():
+
+    def __init__(self, maxSamples=4096):
+        """
+        Function:    __init__
+        Purpose:     Setup the latency tracer
+        Inputs:      maxSamples - an integer value denoting how many of the latest samples are kept for each stage
+        Outputs:     None
+        Description: Samples are kept in bounded deques, which may be appended to from the camera reader thread and the
+                     landing thread without a lock.
+        """
+        self._samples = {stage: collections.deque(maxlen=maxSamples) for stage in STAGES}
+        self._decisions = collections.deque(maxlen=maxSamples)
+        self._moves = collections.deque(maxlen=maxSamples)
+        self._decisionIds = itertools.count()
+        self._clockOffset = None
+
+    def recordFixes(self, fixes):
+        """
+        Function:    recordFixes
+        Purpose:     Record the camera and parsing latency of new fixes
+        Inputs:      fixes - a list of CameraFix values
+        Outputs:     None
+        Description: Meant to be registered as a camera reader listener.
+        """
+        for fix in fixes:
+            self._samples['usb->parse'].append(fix.timestamp - fix.receiveTime)
+            if(fix.tick != None):
+                #Host receive time minus camera capture time, which is the clock offset plus the latency
+                delay = fix.receiveTime - fix.tick/1000.0
+                if(self._clockOffset == None or delay < self._clockOffset):
+                    self._clockOffset = delay
+                self._samples['capture->usb'].append(delay - self._clockOffset)
+        return
+
+    def decide(self, fixes):
+        """
+        Function:    decide
+        Purpose:     Record a position decision
+        Inputs:      fixes - a list of the CameraFix values the decision was made from
+        Outputs:     a Decision value, to be handed to move once the decision is acted on
+        Description: The parse->decision latency is measured from the newest fix, which is how stale the decision is.
+        """
+        now = time.monotonic()
+        decision = Decision(next(self._decisionIds), now, tuple(fix.id for fix in fixes))
+        if(len(fixes) > 0):
+            self._samples['parse->decision'].append(now - max(fix.timestamp for fix in fixes))
+        self._decisions.append(decision)
+        return decision
+
+    def move(self, decision, distance):
+        """
+        Function:    move
+        Purpose:     Record a move command about to be sent to the UAV
+        Inputs:      decision - the Decision value the move acts on, or None if the move was not based on a decision
+                     distance - a list of x, y, z floating point values the UAV is told to move
+        Outputs:     a MoveRecord value
+        Description: See purpose.
+        """
+        now = time.monotonic()
+        if(decision == None):
+            record = MoveRecord(now, None, (), tuple(distance))
+        else:
+            record = MoveRecord(now, decision.id, decision.fixIds, tuple(distance))
+            self._samples['decision->radio'].append(now - decision.timestamp)
+        self._moves.append(record)
+        return record
+
+    def report(self):
+        """
+        Function:    report
+        Purpose:     Summarize the latency of every stage
+        Inputs:      None
+        Outputs:     a list of StageReport values in pipeline order, stages without samples are left out
+        Description: See purpose.
+        """
+        reports = []
+        for stage in STAGES:
+            samples = np.fromiter(self._samples[stage], dtype=float)
+            if(len(samples) == 0):
+                continue
+            reports.append(StageReport(stage, len(samples), dict(zip(PERCENTILES, np.percentile(samples, PERCENTILES).tolist())), float(samples.max())))
+        return reports
+
+    def formatReport(self):
+        """
+        Function:    formatReport
+        Purpose:     Summarize the latency of every stage as text
+        Inputs:      None
+        Outputs:     a string value with one line per stage, in milliseconds
+        Description: See purpose.
+        """
+        lines = ["%-16s %8s " % ("stage", "count") + " ".join("%9s" % ("p" + str(p)) for p in PERCENTILES) + " %9s" % "max"]
+        for stage in self.report():
+            lines.append("%-16s %8d " % (stage.stage, stage.count) + " ".join("%9.2f" % (1000*stage.percentiles[p]) for p in PERCENTILES) + " %9.2f" % (1000*stage.max))
+        return "\n".join(lines)
+
+    def getMoves(self):
+        """
+        Function:    getMoves
+        Purpose:     Get the recent move commands and the fixes behind them
+        Inputs:      None
+        Outputs:     a list of MoveRecord values ordered from oldest to newest
+        Description: See purpose.
+        """
+        return list(self._moves)
@@ -0,0 +1,298 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      Metrics
+Purpose:   This file contains the counters and histograms used to instrument the LandingPlatformController
+           and UAVController classes, and the means to read them out in the Prometheus text format, over
+           HTTP on localhost or as a file.
+
+           Histograms are kept the way an HDR histogram keeps them. Every power of two is split into a
+           fixed number of equal sub-buckets, so a value lands in its bucket with one math.frexp call and
+           a list increment, and every percentile is exact to within the sub-bucket width, about 3% of
+           the value with the default 32 sub-buckets, however wide the range of values.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import http.server
+import math
+import os
+import threading
+
+#Quantiles written for every histogram
+QUANTILES = (0.5, 0.9, 0.99, 1.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _formatLabels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if(len(pairs) == 0):
+        return ''
+    return '{' + ','.join('%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in pairs) + '}'
+
+class Counter():
+
+    def __init__(self, name, labels=()):
+        """
+        Function:    __init__
+        Purpose:     Setup a counter that only ever increases
+        Inputs:      name - a string value, the Prometheus metric name
+                     labels - a tuple of (name, value) pairs
+        Outputs:     None
+        Description: See purpose.
+        """
+        self.name = name
+        self.labels = labels
+        self.value = 0
+
+    def add(self, amount=1):
+        self.value += amount
+        return
+
+    def format(self):
+        return ['%s%s %d' % (self.name, _formatLabels(self.labels), self.value)]
+
+class Histogram():
+
+    def __init__(self, name, labels=(), lowest=1e-6, highest=1e3, subBuckets=32):
+        """
+        Function:    __init__
+        Purpose:     Setup a histogram of values with a constant relative precision
+        Inputs:      name - a string value, the Prometheus metric name
+                     labels - a tuple of (name, value) pairs
+                     lowest - a floating point value, values at or below it are counted in the first bucket
+                     highest - a floating point value, values at or above it are counted in the last bucket
+                     subBuckets - an integer value, the number of buckets each power of two is split into
+        Outputs:     None
+        Description: The exact count, sum and maximum are kept beside the buckets. Recording takes no lock, so a value
+                     recorded from two threads at the same instant may be lost from a bucket, which only matters to the
+                     percentiles of something recorded from several threads at once.
+        """
+        self.name = name
+        self.labels = labels
+        self._lowest = lowest
+        self._subBuckets = subBuckets
+        self._scale = 2*subBuckets
+        self._minExponent = math.frexp(lowest)[1]
+        self._last = (math.frexp(highest)[1] - self._minExponent + 1)*subBuckets - 1
+        self._counts = [0]*(self._last + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        """
+        Function:    record
+        Purpose:     Add a value to the histogram
+        Inputs:      value - a floating point value
+        Outputs:     None
+        Description: See purpose.
+        """
+        self.count += 1
+        self.sum += value
+        if(value > self.max):
+            self.max = value
+        if(value <= self._lowest):
+            self._counts[0] += 1
+            return
+        mantissa, exponent = math.frexp(value)
+        index = (exponent - self._minExponent)*self._subBuckets + int((mantissa - 0.5)*self._scale)
+        self._counts[index if index < self._last else self._last] += 1
+        return
+
+    def _upperBound(self, index):
+        #The largest value that falls in a bucket
+        exponent = index//self._subBuckets + self._minExponent
+        return math.ldexp(0.5 + (index%self._subBuckets + 1)/self._scale, exponent)
+
+    def percentile(self, percent):
+        """
+        Function:    percentile
+        Purpose:     Find the value that a given percentage of the recorded values are at or below
+        Inputs:      percent - a floating point value from 0 to 100
+        Outputs:     a floating point value, or None if nothing has been recorded
+        Description: The upper edge of the bucket holding the percentile is reported, never above the largest value
+                     recorded, as an HDR histogram reports its highest equivalent value.
+        """
+        counts = list(self._counts)
+        total = sum(counts)
+        if(total == 0):
+            return None
+        target = max(1, math.ceil(total*percent/100.0))
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if(seen >= target):
+                return min(self._upperBound(index), self.max)
+        return self.max
+
+    def format(self):
+        lines = []
+        for quantile in QUANTILES:
+            value = self.percentile(100*quantile)
+            lines.append('%s%s %s' % (self.name, _formatLabels(self.labels, [('quantile', quantile)]), repr(float(value)) if value != None else 'NaN'))
+        lines.append('%s_sum%s %s' % (self.name, _formatLabels(self.labels), repr(float(self.sum))))
+        lines.append('%s_count%s %d' % (self.name, _formatLabels(self.labels), self.count))
+        return lines
+
+class MetricsRegistry():
+
+    def __init__(self, prefix='arav_'):
+        """
+        Function:    __init__
+        Purpose:     Setup an empty set of metrics
+        Inputs:      prefix - a string value put in front of every metric name
+        Outputs:     None
+        Description: Metrics are created on first use and kept in the order they were created.
+        """
+        self._prefix = prefix
+        self._metrics = dict()
+        self._help = dict()
+        self._lock = threading.Lock()
+
+    def _get(self, kind, metricType, name, help, labels, options):
+        name = self._prefix + name
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if(metric == None):
+            with self._lock:
+                metric = self._metrics.get(key)
+                if(metric == None):
+                    metric = kind(name, key[1], **options)
+                    self._help.setdefault(name, (metricType, help))
+                    self._metrics[key] = metric
+        return metric
+
+    def counter(self, name, help='', **labels):
+        """
+        Function:    counter
+        Purpose:     Get a counter, creating it if needed
+        Inputs:      name - a string value, the metric name without the registry prefix
+                     help - a string value describing the metric
+                     labels - string values that tell apart metrics of the same name
+        Outputs:     a Counter value
+        Description: Callers should keep the counter rather than look it up again for every count.
+        """
+        return self._get(Counter, 'counter', name, help, labels, dict())
+
+    def histogram(self, name, help='', lowest=1e-6, highest=1e3, **labels):
+        """
+        Function:    histogram
+        Purpose:     Get a histogram, creating it if needed
+        Inputs:      name - a string value, the metric name without the registry prefix
+                     help - a string value describing the metric
+                     lowest - a floating point value, the smallest value told apart from zero
+                     highest - a floating point value, the largest value told apart from those above it
+                     labels - string values that tell apart metrics of the same name
+        Outputs:     a Histogram value
+        Description: Histograms are written as Prometheus summaries, with the QUANTILES, sum and count.
+        """
+        return self._get(Histogram, 'summary', name, help, labels, {'lowest': lowest, 'highest': highest})
+
+    def formatPrometheus(self):
+        """
+        Function:    formatPrometheus
+        Purpose:     Write every metric in the Prometheus text exposition format
+        Inputs:      None
+        Outputs:     a string value
+        Description: See purpose.
+        """
+        byName = dict()
+        for (name, labels), metric in list(self._metrics.items()):
+            byName.setdefault(name, []).append(metric)
+        lines = []
+        for name, metrics in byName.items():
+            metricType, help = self._help[name]
+            lines.append('# HELP %s %s' % (name, help))
+            lines.append('# TYPE %s %s' % (name, metricType))
+            for metric in metrics:
+                lines.extend(metric.format())
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """
+        Function:    dump
+        Purpose:     Write every metric to a file in the Prometheus text exposition format
+        Inputs:      path - a string value
+        Outputs:     None
+        Description: The file is written beside its final name and renamed over it, so a reader such as the node
+                     exporter textfile collector never sees a partial file.
+        """
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as metricsFile:
+            metricsFile.write(self.formatPrometheus())
+        os.replace(temporary, path)
+        return
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if(self.path.split('?')[0] not in ('/', '/metrics')):
+            self.send_error(404)
+            return
+        body = self.server.registry.formatPrometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return
+
+    def log_message(self, format, *args):
+        #Scrapes would otherwise be written to stderr every few seconds
+        return
+
+class MetricsServer():
+
+    def __init__(self, registry, port, host='127.0.0.1'):
+        """
+        Function:    __init__
+        Purpose:     Serve a MetricsRegistry over HTTP for Prometheus to scrape
+        Inputs:      registry - a MetricsRegistry value
+                     port - an integer value, the TCP port to listen on, 0 picks a free port
+                     host - a string value, the address to listen on, localhost by default
+        Outputs:     None
+        Description: Requests are answered by a daemon thread. The metrics are formatted when they are scraped, so the
+                     landing loop does no work for the server between scrapes.
+        """
+        self._server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.registry = registry
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Function:    stop
+        Purpose:     Stop serving and release the port
+        Inputs:      None
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        return
@@ -1,6 +1,6 @@
 #Now with programmatic reseting
 
-import sensor, image, pyb, os, time
+import sensor, image, pyb, os, time, ustruct
 from pyb import USB_VCP
 
 
@@ -16,7 +16,7 @@ ir_led.off()
 
 
 def raise_error():
-    print('{901$901}')
+    send_packet(901, 901, 901)
     red_led.on()
     blue_led.off()
     green_led.off()
@@ -27,6 +27,41 @@ def pad_with_0(string_to_pad, target_length):
    return string_to_pad
 #print pad_with_n_chars("doggy",9,"y")
 
+#Binary packet format, must match Software/CameraProtocol.py
+#sync(2) frame(uint16) tick(uint32) x(uint16) y(uint16) status(uint16) crc(uint16)
+binary_output = False
+frame_count = 0
+capture_tick = 0
+
+def crc16(data):
+    #CRC-16/CCITT-FALSE
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc
+
+def send_packet(x, y, status=0):
+    #status is 0 for a valid point, otherwise x and y carry the status code
+    global frame_count
+    if binary_output:
+        body = ustruct.pack('<HIHHH', frame_count & 0xFFFF, capture_tick & 0xFFFFFFFF, x, y, status)
+        usb.send(b'\xa5\x5a' + body + ustruct.pack('<H', crc16(body)))
+    else:
+        print('{' + pad_with_0(str(x),3) + '$' + pad_with_0(str(y),3) + '}')
+    frame_count += 1
+
+#Camera mode announced to the host, must match CAMERA_MODES in Software/CameraModel.py
+CAMERA_MODE = 1 #qvga240, 240x240 window of QVGA
+MODE_INTERVAL = 30 #packets between mode announcements, so a host that missed the first one still finds the mode
+
+def send_mode():
+    send_packet(905, CAMERA_MODE, 905)
+
 
 
 TRIGGER_THRESHOLD = 5
@@ -66,11 +101,27 @@ print("Saved background image - Now frame differencing!")
 
 
 usb = USB_VCP()
+
+#Send standby code (904) until RasPi gives the go ahead
+#'start' selects the ascii packet format, 'bstrt' selects the binary packet format
 while(True):
+    print('{904$904}')
     cmd = usb.recv(5, timeout=100)
+    if (cmd == b'start'):
+        break
+    if (cmd == b'bstrt'):
+        binary_output = True
+        break
+send_mode()
+
+while(True):
+    #Only wait on the host when it has actually sent something, so the frame rate is not capped by the timeout
+    cmd = None
+    if usb.any():
+        cmd = usb.recv(5, timeout=10)
     if (cmd == b'reset'):
         cmd = "0"
-        print('{902$902}')
+        send_packet(902, 902, 902)
         red_led.on()
         green_led.off()
         blue_led.off()
@@ -79,6 +130,9 @@ while(True):
         extra_fb.replace(sensor.snapshot())
     clock.tick() # Track elapsed milliseconds between snapshots().
     img = sensor.snapshot() # Take a picture and return the image.
+    capture_tick = pyb.millis()
+    if frame_count % MODE_INTERVAL == 0:
+        send_mode()
 
     # Replace the image with the "abs(NEW-OLD)" frame difference.
     img = img.difference(extra_fb)
@@ -88,7 +142,7 @@ while(True):
     if len(blobs) > 1:
         raise_error()
     elif len(blobs) == 0:
-        print('{900$900}')
+        send_packet(900, 900, 900)
         red_led.off()
         blue_led.on()
         green_led.off()
@@ -113,14 +167,7 @@ while(True):
         ypos = blob.cy()
         img.draw_cross(xpos, ypos)
         img.draw_circle(blob.enclosing_circle(),color=RGBcolor)
-        xpos = pad_with_0(str(xpos),3)
-        ypos = pad_with_0(str(ypos),3)
-        #xpos = str(xpos).rjust(3,'0')
-        #ypos = str(ypos).rjust(3,'0')
-        #xpos = str(xpos).zfill(3)
-        #ypos = str(ypos).zfill(3)
-        print('{' + xpos + '$' + ypos + '}')
-        #print('{' + str(xpos) + '$' + str(ypos) + '}')
+        send_packet(xpos, ypos)
 
     #img.find_edges(image.EDGE_CANNY, threshold=(80, 100))
 
@@ -7,7 +7,7 @@ If there are 3 points, it will report midpoint between two most distant points (
 
 '''
 
-import sensor, image, pyb, os, time
+import sensor, image, pyb, os, time, ustruct
 from pyb import USB_VCP
 
 
@@ -23,7 +23,7 @@ ir_led.off()
 
 
 def raise_error():
-    print('{901$901}')
+    send_packet(901, 901, 901)
     red_led.on()
     blue_led.off()
     green_led.off()
@@ -34,6 +34,41 @@ def pad_with_0(string_to_pad, target_length):
    return string_to_pad
 #print pad_with_n_chars("doggy",9,"y")
 
+#Binary packet format, must match Software/CameraProtocol.py
+#sync(2) frame(uint16) tick(uint32) x(uint16) y(uint16) status(uint16) crc(uint16)
+binary_output = False
+frame_count = 0
+capture_tick = 0
+
+def crc16(data):
+    #CRC-16/CCITT-FALSE
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc
+
+def send_packet(x, y, status=0):
+    #status is 0 for a valid point, otherwise x and y carry the status code
+    global frame_count
+    if binary_output:
+        body = ustruct.pack('<HIHHH', frame_count & 0xFFFF, capture_tick & 0xFFFFFFFF, x, y, status)
+        usb.send(b'\xa5\x5a' + body + ustruct.pack('<H', crc16(body)))
+    else:
+        print('{' + pad_with_0(str(x),3) + '$' + pad_with_0(str(y),3) + '}')
+    frame_count += 1
+
+#Camera mode announced to the host, must match CAMERA_MODES in Software/CameraModel.py
+CAMERA_MODE = 0 #qvga, full QVGA frame
+MODE_INTERVAL = 30 #packets between mode announcements, so a host that missed the first one still finds the mode
+
+def send_mode():
+    send_packet(905, CAMERA_MODE, 905)
+
 
 thresholds = (255, 255) # thresholds for bright white light from IR.
 
@@ -63,9 +98,10 @@ clock = time.clock() # Tracks FPS.
 usb = USB_VCP()
 
 #Send standby code (904) until RasPi gives the go ahead
+#'start' selects the ascii packet format, 'bstrt' selects the binary packet format
 #comment out this while loop to start the camera spamming coords by default
 
-while(False):
+while(True):
     red_led.off()
     green_led.on()
     blue_led.on()
@@ -75,17 +111,25 @@ while(False):
     if (cmd == b'start'):
         cmd = "0"
         break
+    if (cmd == b'bstrt'):
+        cmd = "0"
+        binary_output = True
+        break
+send_mode()
 
 while(True):
     #clock.tick()
     img = sensor.snapshot()
+    capture_tick = pyb.millis()
+    if frame_count % MODE_INTERVAL == 0:
+        send_mode()
     blobs = img.find_blobs([(240, 255)], pixels_threshold=1, area_threshold=1, merge=False, margin=50) #red blobs
 
     if len(blobs) > 3:
         raise_error()
         continue
     elif len(blobs) == 0:
-        print('{900$900}')
+        send_packet(900, 900, 900)
         red_led.off()
         blue_led.on()
         green_led.off()
@@ -135,6 +179,4 @@ while(True):
         midpoint = ((blob_list[0][0] + blob_list[1][0])/2, (blob_list[0][1] + blob_list[1][1])/2)
     else:
         midpoint = blob_list[0]
-    xpos = pad_with_0(str(int(midpoint[0])),3)
-    ypos = pad_with_0(str(int(midpoint[1])),3)
-    print('{' + xpos + '$' + ypos + '}')
+    send_packet(int(midpoint[0]), int(midpoint[1]))
@@ -0,0 +1,550 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      PositionEstimator
+Purpose:   This file contains the streaming estimators used by the LandingPlatformController
+           class to turn a run of camera fixes into a single UAV position. Each estimator is
+           fed one sample at a time and can report its current estimate and the standard
+           error of that estimate after every sample, which lets the controller stop
+           sampling as soon as the estimate is good enough for the current height.
+
+           median  - running median kept in two heaps
+           trimmed - mean of the samples left after trimming a fraction from each end
+           mad     - mean of the samples within a number of scaled median absolute deviations of the median
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import heapq
+import math
+import random
+
+#Scale factor that turns a median absolute deviation into a standard deviation for normally distributed samples
+MAD_SCALE = 1.4826
+
+#Ratio of the standard error of a median to the standard error of a mean for normally distributed samples
+MEDIAN_EFFICIENCY = 1.2533
+
+class RunningMedian():
+
+    def __init__(self):
+        """
+        Function:    __init__
+        Purpose:     Setup a running median over a stream of samples
+        Inputs:      None
+        Outputs:     None
+        Description: The lower half of the samples is kept in a max-heap and the upper half in a min-heap, so each new
+                     sample costs O(log n) and the median is always available in O(1). A running variance is kept alongside
+                     with Welford's method to size the standard error.
+        """
+        self._lower = []
+        self._upper = []
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        """
+        Function:    add
+        Purpose:     Add a sample
+        Inputs:      value - a floating point sample
+        Outputs:     None
+        Description: See purpose.
+        """
+        if(len(self._lower) == 0 or value <= -self._lower[0]):
+            heapq.heappush(self._lower, -value)
+        else:
+            heapq.heappush(self._upper, value)
+
+        #Keep the lower heap equal to, or one larger than, the upper heap
+        if(len(self._lower) > len(self._upper) + 1):
+            heapq.heappush(self._upper, -heapq.heappop(self._lower))
+        elif(len(self._upper) > len(self._lower)):
+            heapq.heappush(self._lower, -heapq.heappop(self._upper))
+
+        self.count += 1
+        delta = value - self._mean
+        self._mean += delta/self.count
+        self._m2 += delta*(value - self._mean)
+        return
+
+    def estimate(self):
+        """
+        Function:    estimate
+        Purpose:     Report the median of the samples so far
+        Inputs:      None
+        Outputs:     a floating point value, or None if there are no samples
+        Description: See purpose.
+        """
+        if(self.count == 0):
+            return None
+        if(len(self._lower) > len(self._upper)):
+            return -self._lower[0]
+        return (self._upper[0] - self._lower[0])/2
+
+    def standardError(self):
+        """
+        Function:    standardError
+        Purpose:     Report the standard error of the median
+        Inputs:      None
+        Outputs:     a floating point value, infinite with fewer than two samples
+        Description: Uses the large sample approximation 1.2533*s/sqrt(n). The sample deviation is not itself robust, so outliers
+                     widen the error and delay an early stop rather than bias the estimate.
+        """
+        if(self.count < 2):
+            return math.inf
+        return MEDIAN_EFFICIENCY*math.sqrt(self._m2/(self.count - 1)/self.count)
+
+class _Node():
+
+    __slots__ = ('value', 'priority', 'left', 'right', 'size', 'sum', 'squares')
+
+    def __init__(self, value, priority):
+        self.value = value
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.size = 1
+        self.sum = value
+        self.squares = value*value
+
+def _update(node):
+    #Recompute the size and sums of a node from its children
+    node.size = 1
+    node.sum = node.value
+    node.squares = node.value*node.value
+    for child in (node.left, node.right):
+        if(child != None):
+            node.size += child.size
+            node.sum += child.sum
+            node.squares += child.squares
+    return
+
+def _split(node, value):
+    #Split a tree into the nodes below value and those at or above it
+    if(node == None):
+        return None, None
+    if(node.value < value):
+        node.right, right = _split(node.right, value)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, value)
+    _update(node)
+    return left, node
+
+def _insert(node, new):
+    #Insert a node where its priority puts it, splitting the subtree it replaces
+    if(node == None):
+        return new
+    if(new.priority > node.priority):
+        new.left, new.right = _split(node, new.value)
+        _update(new)
+        return new
+    if(new.value < node.value):
+        node.left = _insert(node.left, new)
+    else:
+        node.right = _insert(node.right, new)
+    _update(node)
+    return node
+
+class SampleTree():
+
+    def __init__(self):
+        """
+        Function:    __init__
+        Purpose:     Setup an empty order statistic tree of samples
+        Inputs:      None
+        Outputs:     None
+        Description: The samples are kept in a treap, a binary search tree balanced by random priorities, in which every
+                     node also holds the size, sum and sum of squares of its subtree. Adding a sample, finding the k-th
+                     smallest, counting the samples below a value and summing any run of the sorted samples are then all
+                     O(log n) expected. The priorities come from a fixed seed, so the same samples always build the same
+                     tree and the sums are rounded the same way every time.
+        """
+        self._root = None
+        self._random = random.Random(0)
+
+    def __len__(self):
+        return self._root.size if self._root != None else 0
+
+    def add(self, value):
+        """
+        Function:    add
+        Purpose:     Add a sample
+        Inputs:      value - a floating point sample
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._root = _insert(self._root, _Node(value, self._random.random()))
+        return
+
+    def select(self, k):
+        """
+        Function:    select
+        Purpose:     Find the k-th smallest sample
+        Inputs:      k - an integer value from 0 to the number of samples less one
+        Outputs:     a floating point value
+        Description: See purpose.
+        """
+        node = self._root
+        while(True):
+            leftSize = node.left.size if node.left != None else 0
+            if(k < leftSize):
+                node = node.left
+            elif(k == leftSize):
+                return node.value
+            else:
+                k -= leftSize + 1
+                node = node.right
+
+    def rank(self, value, inclusive=False):
+        """
+        Function:    rank
+        Purpose:     Count the samples below a value
+        Inputs:      value - a floating point value
+                     inclusive - a boolean value, also count the samples equal to the value
+        Outputs:     an integer value
+        Description: See purpose.
+        """
+        count = 0
+        node = self._root
+        while(node != None):
+            if(node.value < value or (inclusive and node.value == value)):
+                count += 1 + (node.left.size if node.left != None else 0)
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def _prefix(self, k):
+        #Sum and sum of squares of the k smallest samples
+        total = 0.0
+        squares = 0.0
+        node = self._root
+        while(node != None and k > 0):
+            leftSize = node.left.size if node.left != None else 0
+            if(k <= leftSize):
+                node = node.left
+                continue
+            if(node.left != None):
+                total += node.left.sum
+                squares += node.left.squares
+            total += node.value
+            squares += node.value*node.value
+            k -= leftSize + 1
+            node = node.right
+        return total, squares
+
+    def sums(self, low, high):
+        """
+        Function:    sums
+        Purpose:     Sum a run of the sorted samples
+        Inputs:      low - an integer value, the index of the first sample in sorted order
+                     high - an integer value, the index after the last sample in sorted order
+        Outputs:     a tuple of the sum and the sum of squares of the samples, floating point values
+        Description: See purpose.
+        """
+        highSum, highSquares = self._prefix(high)
+        lowSum, lowSquares = self._prefix(low)
+        return highSum - lowSum, highSquares - lowSquares
+
+def _variance(total, squares, count):
+    #Sample variance from a sum and sum of squares, never below zero from rounding
+    if(count < 2):
+        return math.inf
+    return max(0.0, (squares - total*total/count)/(count - 1))
+
+class TrimmedMean():
+
+    def __init__(self, trim=0.2):
+        """
+        Function:    __init__
+        Purpose:     Setup a trimmed mean over a stream of samples
+        Inputs:      trim - a floating point value from 0 to less than 0.5, the fraction of samples removed from each end
+        Outputs:     None
+        Description: Samples are kept in a SampleTree, so each new sample costs O(log n) and the trimmed mean and its
+                     standard error are read from a few order statistics and sums, also O(log n). Samples are stored less
+                     the first one, which keeps the sums of squares small enough not to lose the spread to rounding.
+        """
+        self._trim = trim
+        self._tree = SampleTree()
+        self._shift = 0.0
+        self.count = 0
+
+    def add(self, value):
+        """
+        Function:    add
+        Purpose:     Add a sample
+        Inputs:      value - a floating point sample
+        Outputs:     None
+        Description: See purpose.
+        """
+        if(self.count == 0):
+            self._shift = value
+        self._tree.add(value - self._shift)
+        self.count += 1
+        return
+
+    def estimate(self):
+        """
+        Function:    estimate
+        Purpose:     Report the trimmed mean of the samples so far
+        Inputs:      None
+        Outputs:     a floating point value, or None if there are no samples
+        Description: See purpose.
+        """
+        if(self.count == 0):
+            return None
+        cut = int(self._trim*self.count)
+        total, squares = self._tree.sums(cut, self.count - cut)
+        return self._shift + total/(self.count - 2*cut)
+
+    def standardError(self):
+        """
+        Function:    standardError
+        Purpose:     Report the standard error of the trimmed mean
+        Inputs:      None
+        Outputs:     a floating point value, infinite with fewer than two samples
+        Description: Uses the winsorized standard deviation divided by (1 - 2*trim)*sqrt(n). The winsorized samples are the
+                     kept samples plus cut copies of the smallest and of the largest of them, so their sums follow from
+                     the sums of the kept samples.
+        """
+        if(self.count < 2):
+            return math.inf
+        cut = int(self._trim*self.count)
+        total, squares = self._tree.sums(cut, self.count - cut)
+        low = self._tree.select(cut)
+        high = self._tree.select(self.count - cut - 1)
+        variance = _variance(total + cut*(low + high), squares + cut*(low*low + high*high), self.count)
+        return math.sqrt(variance)/((1 - 2*self._trim)*math.sqrt(self.count))
+
+class MadFilter():
+
+    def __init__(self, threshold=3.0):
+        """
+        Function:    __init__
+        Purpose:     Setup an outlier rejecting mean over a stream of samples
+        Inputs:      threshold - a floating point value, samples further than this many scaled MADs from the median are rejected
+        Outputs:     None
+        Description: Samples are kept in a SampleTree, so each new sample costs O(log n). The median is an order statistic
+                     and the inliers a run of the sorted samples, both O(log n). The median absolute deviation is found by
+                     a binary search over the sorted samples, O(log n) steps of O(log n) each. Samples are stored less the
+                     first one, as in TrimmedMean.
+        """
+        self._threshold = threshold
+        self._tree = SampleTree()
+        self._shift = 0.0
+        self._inlying = None
+        self.count = 0
+
+    def add(self, value):
+        """
+        Function:    add
+        Purpose:     Add a sample
+        Inputs:      value - a floating point sample
+        Outputs:     None
+        Description: See purpose.
+        """
+        if(self.count == 0):
+            self._shift = value
+        self._tree.add(value - self._shift)
+        self._inlying = None
+        self.count += 1
+        return
+
+    def _inliers(self):
+        """
+        Function:    _inliers
+        Purpose:     Summarize the samples that are not outliers
+        Inputs:      None
+        Outputs:     a tuple of the count, sum and sum of squares of the inlying samples, less the first sample
+        Description: Both the median and the median absolute deviation are read from the tree, without building the list
+                     of deviations. The summary is kept until the next sample, as estimate and standardError are called
+                     together.
+        """
+        if(self._inlying != None):
+            return self._inlying
+        median = self._median()
+        middle = (self.count - 1)//2
+        if(self.count % 2 == 1):
+            mad = self._deviation(median, middle)
+        else:
+            mad = (self._deviation(median, middle) + self._deviation(median, middle + 1))/2
+        limit = self._threshold*MAD_SCALE*mad
+        low = self._tree.rank(median - limit)
+        high = self._tree.rank(median + limit, inclusive=True)
+        total, squares = self._tree.sums(low, high)
+        self._inlying = (high - low, total, squares)
+        return self._inlying
+
+    def _deviation(self, median, k):
+        """
+        Function:    _deviation
+        Purpose:     Find the k-th smallest absolute deviation of the samples from the median
+        Inputs:      median - a floating point value, the median of the samples
+                     k - an integer value from 0 to count - 1
+        Outputs:     a floating point value
+        Description: The deviations of the samples below the median, read from the median down, and of those at or above
+                     it, read from the median up, are two sorted runs. The k-th smallest of both is found by a binary search
+                     for how many of the k + 1 smallest come from the lower run.
+        """
+        split = self._tree.rank(median)
+        lower = lambda i: median - self._tree.select(split - 1 - i)
+        upper = lambda j: self._tree.select(split + j) - median
+        low = max(0, k + 1 - (self.count - split))
+        high = min(split, k + 1)
+        while(low < high):
+            i = (low + high)//2
+            if(lower(i) < upper(k - i)):
+                low = i + 1
+            else:
+                high = i
+        #The k + 1 smallest are the first low of the lower run and the first k + 1 - low of the upper run
+        if(low == 0):
+            return upper(k)
+        if(low == k + 1):
+            return lower(k)
+        return max(lower(low - 1), upper(k - low))
+
+    def _median(self):
+        """
+        Function:    _median
+        Purpose:     Find the median of the samples
+        Inputs:      None
+        Outputs:     a floating point value, less the first sample
+        Description: See purpose.
+        """
+        middle = self.count//2
+        if(self.count % 2 == 1):
+            return self._tree.select(middle)
+        return (self._tree.select(middle - 1) + self._tree.select(middle))/2
+
+    def estimate(self):
+        """
+        Function:    estimate
+        Purpose:     Report the mean of the inlying samples so far
+        Inputs:      None
+        Outputs:     a floating point value, or None if there are no samples
+        Description: See purpose.
+        """
+        if(self.count == 0):
+            return None
+        count, total, squares = self._inliers()
+        return self._shift + total/count
+
+    def standardError(self):
+        """
+        Function:    standardError
+        Purpose:     Report the standard error of the mean of the inlying samples
+        Inputs:      None
+        Outputs:     a floating point value, infinite with fewer than two inlying samples
+        Description: See purpose.
+        """
+        if(self.count == 0):
+            return math.inf
+        count, total, squares = self._inliers()
+        if(count < 2):
+            return math.inf
+        return math.sqrt(_variance(total, squares, count)/count)
+
+def fractionInterval(count, total, z=1.96):
+    """
+    Function:    fractionInterval
+    Purpose:     Find a confidence interval for a fraction of samples
+    Inputs:      count - an integer value, the number of samples with the property
+                 total - an integer value, the number of samples
+                 z - a floating point value, the number of standard errors in the interval
+    Outputs:     a tuple of low, high floating point values from 0 to 1
+    Description: Uses the Wilson score interval, which unlike count/total +/- z*SE does not collapse to a single point
+                 when every sample agrees, so a handful of unanimous samples is not taken as certainty.
+    """
+    if(total == 0):
+        return 0.0, 1.0
+    fraction = count/total
+    spread = z*z/total
+    center = (fraction + spread/2)/(1 + spread)
+    half = z*math.sqrt(fraction*(1 - fraction)/total + spread/(4*total))/(1 + spread)
+    return max(0.0, center - half), min(1.0, center + half)
+
+#Estimators selectable through the positionEstimator setting
+ESTIMATORS = {'median': RunningMedian, 'trimmed': TrimmedMean, 'mad': MadFilter}
+
+class PositionEstimator():
+
+    def __init__(self, kind='median', z=1.96, errorFloor=0.0):
+        """
+        Function:    __init__
+        Purpose:     Setup a streaming estimate of an <x, y> position
+        Inputs:      kind - a string value naming one of the ESTIMATORS
+                     z - a floating point value, the number of standard errors in the reported confidence radius
+                     errorFloor - a floating point value, the smallest standard error reported for each axis
+        Outputs:     None
+        Description: One estimator is kept for each axis. Camera positions come from whole pixels, so a run of samples on
+                     the same pixel has no spread at all, and without a floor its standard error of zero would stop
+                     sampling at the minimum count however far the true position is from the pixel.
+        """
+        self._x = ESTIMATORS[kind]()
+        self._y = ESTIMATORS[kind]()
+        self._z = z
+        self._errorFloor = errorFloor
+
+    @property
+    def count(self):
+        return self._x.count
+
+    def add(self, x, y):
+        """
+        Function:    add
+        Purpose:     Add a position sample
+        Inputs:      x - a floating point x-coordinate
+                     y - a floating point y-coordinate
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._x.add(x)
+        self._y.add(y)
+        return
+
+    def estimate(self):
+        """
+        Function:    estimate
+        Purpose:     Report the current position estimate
+        Inputs:      None
+        Outputs:     a tuple of x, y floating point values, or None if there are no samples
+        Description: See purpose.
+        """
+        if(self.count == 0):
+            return None
+        return self._x.estimate(), self._y.estimate()
+
+    def confidenceRadius(self):
+        """
+        Function:    confidenceRadius
+        Purpose:     Report the radius of the confidence region around the estimate
+        Inputs:      None
+        Outputs:     a floating point value, infinite until there are enough samples
+        Description: z times the combined standard error of both axes, each no smaller than errorFloor.
+        """
+        return self._z*math.hypot(max(self._x.standardError(), self._errorFloor), max(self._y.standardError(), self._errorFloor))
@@ -0,0 +1,139 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      RotationEstimator
+Purpose:   This file contains the estimator used by the LandingPlatformController class to find
+           the rotation between the UAV frame and the camera frame. Each move gives a pair of
+           the displacement commanded in the UAV frame and the displacement the camera saw.
+           The rotation, and optionally a scale and translation, that best maps one onto the
+           other over a sliding window of pairs is solved in closed form (2-D Procrustes).
+
+           Only sums over the window are needed, so adding a pair and dropping the oldest are
+           both O(1). The sums are rebuilt from the window now and then to keep rounding error
+           from building up.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import collections
+import math
+
+#The fitted transform, observed = scale*R(angle)*commanded + translation.
+#rms is the root mean square residual in meters and angleStd the standard error of the angle in radians.
+FrameTransform = collections.namedtuple('FrameTransform', ['angle', 'scale', 'translation', 'rms', 'angleStd', 'count'])
+
+#Number of updates between rebuilding the sums from the window
+RESUM_INTERVAL = 256
+
+class RotationEstimator():
+
+    def __init__(self, window=20, fitScale=False, fitTranslation=False, minPairs=3):
+        """
+        Function:    __init__
+        Purpose:     Setup the sliding window frame rotation estimator
+        Inputs:      window - an integer value denoting how many of the latest pairs are fitted
+                     fitScale - a boolean value, fit a scale as well, for a UAV that moves short or long of its commands
+                     fitTranslation - a boolean value, fit a translation as well, for a constant drift added to every move
+                     minPairs - an integer value denoting how many pairs must be in the window before an estimate is given
+        Outputs:     None
+        Description: A single pair is always fitted with a residual near zero, so its standard error says nothing of how
+                     good the angle is. Estimates are held back until minPairs pairs, and never fewer pairs than leave at
+                     least one degree of freedom once the fitted values are taken out.
+        """
+        self._pairs = collections.deque()
+        self._window = int(window)
+        self._fitScale = fitScale
+        self._fitTranslation = fitTranslation
+        #Values fitted, the angle plus the scale and translation if they are fitted
+        self._used = 1 + (1 if fitScale else 0) + (2 if fitTranslation else 0)
+        self._minPairs = max(int(minPairs), self._used//2 + 1)
+        self._updates = 0
+        self._sums = [0.0]*9
+
+    def _pairSums(self, cx, cy, ox, oy):
+        #Terms summed over the window: count, commanded and observed means, dot and cross products, squared lengths
+        return (1.0, cx, cy, ox, oy, cx*ox + cy*oy, cx*oy - cy*ox, cx*cx + cy*cy, ox*ox + oy*oy)
+
+    def add(self, commanded, observed):
+        """
+        Function:    add
+        Purpose:     Add a commanded and observed displacement pair
+        Inputs:      commanded - a list of x, y floating point values, the displacement sent to the UAV in its own frame in meters
+                     observed - a list of x, y floating point values, the displacement seen by the camera in meters
+        Outputs:     None
+        Description: The oldest pair is dropped once the window is full.
+        """
+        pair = self._pairSums(commanded[0], commanded[1], observed[0], observed[1])
+        self._pairs.append(pair)
+        self._sums = [total + term for total, term in zip(self._sums, pair)]
+        if(len(self._pairs) > self._window):
+            dropped = self._pairs.popleft()
+            self._sums = [total - term for total, term in zip(self._sums, dropped)]
+
+        self._updates += 1
+        if(self._updates % RESUM_INTERVAL == 0):
+            self._sums = [math.fsum(column) for column in zip(*self._pairs)]
+        return
+
+    @property
+    def count(self):
+        return len(self._pairs)
+
+    def estimate(self):
+        """
+        Function:    estimate
+        Purpose:     Solve for the transform that best maps the commanded displacements onto the observed ones
+        Inputs:      None
+        Outputs:     a FrameTransform value, or None if there are fewer than minPairs pairs or they do not fix a rotation
+        Description: With the dot and cross product sums A and B of the (centered, if fitting translation) pairs, the best
+                     angle is atan2(B, A). The best scale is sqrt(A^2 + B^2)/C, where C is the commanded sum of squares.
+                     The residual then follows from the same sums without revisiting the pairs.
+        """
+        n, cx, cy, ox, oy, dot, cross, cc, oo = self._sums
+        if(n < self._minPairs):
+            return None
+        if(self._fitTranslation):
+            #Center both sets on their means
+            dot -= (cx*ox + cy*oy)/n
+            cross -= (cx*oy - cy*ox)/n
+            cc -= (cx*cx + cy*cy)/n
+            oo -= (ox*ox + oy*oy)/n
+        if(cc <= 1e-12):
+            return None
+
+        angle = math.atan2(cross, dot)
+        magnitude = math.hypot(dot, cross)
+        scale = magnitude/cc if self._fitScale else 1.0
+        residual = max(0.0, oo - 2*scale*magnitude + scale*scale*cc)
+
+        translation = (0.0, 0.0)
+        if(self._fitTranslation):
+            cosA, sinA = math.cos(angle), math.sin(angle)
+            translation = ((ox - scale*(cosA*cx - sinA*cy))/n, (oy - scale*(sinA*cx + cosA*cy))/n)
+
+        freedom = 2*n - self._used
+        rms = math.sqrt(residual/n)
+        angleStd = math.sqrt(residual/freedom/cc)/scale if scale > 0 else math.inf
+        return FrameTransform(angle, scale, translation, rms, angleStd, int(n))
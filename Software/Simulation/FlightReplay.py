@@ -0,0 +1,404 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      FlightReplay
+Purpose:   This file replays a FlightRecorder recording through the LandingPlatformController class
+           on a VirtualClock. The recorded camera bytes are handed to the controller at the times
+           they were originally read, UAV telemetry is delivered at the times it arrived, and reads
+           of the UAV height and battery are answered with the recorded values in order. Blocking
+           commands take as long as they originally did.
+
+           The replayed controller writes its own recording, and the commands and landing states
+           in it are compared with the original. With unchanged code and settings the two match
+           exactly, so a change to the parsing, conversion or decision code shows up as the first
+           command or state that differs.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import collections
+import glob
+import math
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from . import GPIOStub
+from .VirtualClock import VirtualClock
+
+#Same fields as UAVController.TelemetryPacket, which cannot be imported without cflib
+TelemetryPacket = collections.namedtuple('TelemetryPacket', ['timestamp', 'uavTimestamp', 'data'])
+
+#The comparison of a replay with its original recording. Divergences are the index of the first command or
+#transition that differs, or None. maxDifference is the largest difference in meters, or meters per second,
+#between commands that match, and maxTimeOffset the largest difference in when they were sent, in seconds.
+ReplayResult = collections.namedtuple('ReplayResult', ['path', 'identical', 'commands', 'replayedCommands', 'commandDivergence', 'maxDifference',
+                                                       'maxTimeOffset', 'transitions', 'replayedTransitions', 'transitionDivergence', 'simulatedTime', 'elapsed'])
+
+#Controller settings used unless overridden, a camera read by the clock rather than a thread
+DEFAULT_SETTINGS = {
+    'cameraThread': False,
+    'cameraPortCache': None,
+}
+
+class ReplayCamera():
+
+    def __init__(self, clock, timestamps, reads, prelude=b''):
+        """
+        Function:    __init__
+        Purpose:     Setup a serial stand-in that gives back recorded camera reads
+        Inputs:      clock - a VirtualClock value
+                     timestamps - a list of floating point values, when each read returned
+                     reads - a list of bytes values, the bytes returned by each read
+                     prelude - a bytes value available at once, answering the packet format negotiation
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._clock = clock
+        self._timestamps = timestamps
+        self._reads = reads
+        self._index = 0
+        self._buffer = bytearray(prelude)
+        self.timeout = None
+
+    def nextEvent(self):
+        if(self._index < len(self._timestamps)):
+            return self._timestamps[self._index]
+        return None
+
+    def _deliver(self):
+        #Make every read due by now available
+        now = self._clock.monotonic()
+        while(self._index < len(self._timestamps) and self._timestamps[self._index] <= now):
+            self._buffer += self._reads[self._index]
+            self._index += 1
+        return
+
+    def _waitForData(self):
+        #Advance the clock to the next read, or until the timeout runs out
+        self._deliver()
+        if(len(self._buffer) > 0):
+            return
+        wait = 0.1 if self.timeout == None else self.timeout
+        due = self.nextEvent()
+        if(due != None):
+            wait = min(wait, due - self._clock.monotonic())
+        self._clock.advance(wait)
+        self._deliver()
+        return
+
+    @property
+    def in_waiting(self):
+        self._deliver()
+        return len(self._buffer)
+
+    def read(self, size=1):
+        self._waitForData()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def readinto(self, buffer):
+        self._waitForData()
+        count = min(len(buffer), len(self._buffer))
+        buffer[:count] = self._buffer[:count]
+        del self._buffer[:count]
+        return count
+
+    def write(self, data):
+        return len(data)
+
+    def reset_input_buffer(self):
+        self._buffer.clear()
+        return
+
+    def close(self):
+        return
+
+class ReplayUAV():
+
+    def __init__(self, clock, commands, readings, telemetry, FlightRecorder):
+        """
+        Function:    __init__
+        Purpose:     Setup a UAV stand-in that answers with a recorded flight
+        Inputs:      clock - a VirtualClock value
+                     commands - a NumPy array of FlightRecorder.COMMAND_DTYPE records from the original flight
+                     readings - a NumPy array of FlightRecorder.READING_DTYPE records from the original flight
+                     telemetry - a NumPy array of FlightRecorder.TELEMETRY_DTYPE records from the original flight
+                     FlightRecorder - the FlightRecorder module
+        Outputs:     None
+        Description: Blocking commands wait as long as the matching command of the original flight, in order. Once the
+                     original runs out, moves take their distance over their velocity, as a Crazyflie would.
+        """
+        self._clock = clock
+        self._durations = collections.deque()
+        blocking = (FlightRecorder.COMMAND_LAUNCH, FlightRecorder.COMMAND_MOVE, FlightRecorder.COMMAND_LAND, FlightRecorder.COMMAND_ROTATE)
+        started = None
+        for command in commands:
+            if(command['code'] in blocking):
+                started = float(command['timestamp'])
+            elif(command['code'] == FlightRecorder.COMMAND_DONE and started != None):
+                self._durations.append(float(command['timestamp']) - started)
+                started = None
+
+        self._heights = collections.deque(readings['value'][readings['code'] == FlightRecorder.READ_HEIGHT].tolist())
+        self._batteries = collections.deque(readings['value'][readings['code'] == FlightRecorder.READ_BATTERY].tolist())
+        self._telemetry = telemetry
+        self._telemetryIndex = 0
+        self._telemetryListeners = ()
+        self._height = 0.0
+        self._chargeCurrent = 0.0
+        self.airborne = False
+
+    def nextTelemetry(self):
+        if(self._telemetryIndex < len(self._telemetry)):
+            return float(self._telemetry['timestamp'][self._telemetryIndex])
+        return None
+
+    def deliverTelemetry(self):
+        """
+        Function:    deliverTelemetry
+        Purpose:     Give the telemetry listeners every packet due by now
+        Inputs:      None
+        Outputs:     None
+        Description: Called by the clock at every step, as the Crazyflie logging thread would call them.
+        """
+        now = self._clock.monotonic()
+        packets = []
+        while(self._telemetryIndex < len(self._telemetry) and self._telemetry['timestamp'][self._telemetryIndex] <= now):
+            record = self._telemetry[self._telemetryIndex]
+            data = {'pm.vbat': float(record['vbat']), 'stateEstimate.x': float(record['x']), 'stateEstimate.y': float(record['y']),
+                    'stateEstimate.z': float(record['z']), 'pm.chargeCurrent': float(record['chargeCurrent'])}
+            packets.append(TelemetryPacket(float(record['timestamp']), int(record['uavTimestamp']), data))
+            self._chargeCurrent = data['pm.chargeCurrent']
+            self._telemetryIndex += 1
+        if(len(packets) > 0):
+            for listener in self._telemetryListeners:
+                listener(packets)
+        return
+
+    def addTelemetryListener(self, callback):
+        self._telemetryListeners = self._telemetryListeners + (callback,)
+        return
+
+    def removeTelemetryListener(self, callback):
+        self._telemetryListeners = tuple(listener for listener in self._telemetryListeners if listener != callback)
+        return
+
+    def _block(self, duration):
+        #Wait as long as the original command took
+        if(len(self._durations) > 0):
+            duration = self._durations.popleft()
+        self._clock.sleep(duration)
+        return
+
+    def done(self):
+        self.airborne = False
+        return
+
+    def launch(self):
+        self.airborne = True
+        self._block(1.5)
+        self._height = 0.3
+        return
+
+    def land(self):
+        self._block(self._height/0.2)
+        self._height = 0.0
+        self.airborne = False
+        return
+
+    def move(self, distanceX, distanceY, distanceZ, velocity):
+        if(self.airborne == False):
+            self.launch()
+        self._block(math.sqrt(distanceX*distanceX + distanceY*distanceY + distanceZ*distanceZ)/velocity if velocity > 0 else 0.0)
+        self._height += distanceZ
+        return
+
+    def setVelocity(self, velocityX, velocityY, velocityZ):
+        if(self.airborne == False):
+            self.launch()
+        return
+
+    def rotate(self, degree):
+        if(self.airborne == False):
+            self.launch()
+        self._block(1.0)
+        return
+
+    def getHeight(self):
+        if(len(self._heights) > 0):
+            return self._heights.popleft()
+        return self._height
+
+    def getBatteryLevel(self):
+        if(len(self._batteries) > 0):
+            value = self._batteries.popleft()
+            return None if math.isnan(value) else value
+        return None
+
+    def isCharging(self):
+        return self._chargeCurrent
+
+def _firstBinaryPacket(stream, CameraProtocol):
+    #A copy of the first valid binary packet, to answer the format negotiation that happened before recording began
+    index = stream.find(CameraProtocol.BINARY_SYNC)
+    while(index >= 0):
+        if(len(stream) - index >= CameraProtocol.BINARY_PACKET_LENGTH and CameraProtocol.decodeBinaryPacket(stream, index) != None):
+            return bytes(stream[index:index + CameraProtocol.BINARY_PACKET_LENGTH])
+        index = stream.find(CameraProtocol.BINARY_SYNC, index + 1)
+    return b''
+
+def _compareCommands(original, replayed, FlightRecorder, tolerance):
+    #Index of the first command that differs, and the largest differences among those that match
+    original = original[original['code'] != FlightRecorder.COMMAND_DONE]
+    replayed = replayed[replayed['code'] != FlightRecorder.COMMAND_DONE]
+    count = min(len(original), len(replayed))
+    fields = ['x', 'y', 'z', 'velocity']
+    differences = np.zeros(count)
+    for field in fields:
+        differences = np.maximum(differences, np.abs(original[field][:count] - replayed[field][:count]))
+    same = (original['code'][:count] == replayed['code'][:count]) & (differences <= tolerance)
+    divergence = int(np.argmin(same)) if not same.all() else (count if len(original) != len(replayed) else None)
+    matched = count if divergence == None else divergence
+    maxDifference = float(differences[:matched].max()) if matched > 0 else 0.0
+    maxTimeOffset = float(np.abs(original['timestamp'][:matched] - replayed['timestamp'][:matched]).max()) if matched > 0 else 0.0
+    return len(original), len(replayed), divergence, maxDifference, maxTimeOffset
+
+def _compareTransitions(original, replayed):
+    #Index of the first change of state that differs
+    count = min(len(original), len(replayed))
+    same = (original['previous'][:count] == replayed['previous'][:count]) & (original['next'][:count] == replayed['next'][:count]) & \
+           (original['code'][:count] == replayed['code'][:count])
+    if(not same.all()):
+        return int(np.argmin(same))
+    if(len(original) != len(replayed)):
+        return count
+    return None
+
+def replay(path, settings=None, tolerance=1e-6):
+    """
+    Function:    replay
+    Purpose:     Re-run a recorded flight through the controller and compare its decisions with the original
+    Inputs:      path - a string value, a recording written by FlightRecorder
+                 settings - a dictionary of LandingPlatformController settings, which should match those of the original flight
+                 tolerance - a floating point value, the largest difference in a command value that still counts as the same
+    Outputs:     a ReplayResult value
+    Description: RPi.GPIO is replaced by GPIOStub, and the time module of the controller and its helpers is replaced by a
+                 virtual clock for the length of the replay. The clock starts when the original recording started, so
+                 every timestamp of the replay is comparable with the original. The replay recording is written to a
+                 temporary directory that is removed afterwards.
+    """
+    GPIOStub.install()
+    import CameraProtocol
+    import CameraStream
+    import FlightRecorder
+    import LandingPlatformController
+    import LandingStateMachine
+    import LatencyTracer
+    LandingPlatformController.GPIO = GPIOStub
+
+    started = time.perf_counter()
+    recording = FlightRecorder.FlightRecording(path)
+    records = np.array(recording.ordered())
+    commands = recording.select(FlightRecorder.KIND_COMMAND, records)
+    packets = recording.select(FlightRecorder.KIND_PACKET, records)
+    launches = commands['timestamp'][commands['code'] == FlightRecorder.COMMAND_LAUNCH]
+
+    #Packet records of one read share its timestamp
+    timestamps = []
+    reads = []
+    for packet in packets:
+        data = bytes(packet['data']).ljust(packet['length'], b'\x00')
+        if(len(timestamps) > 0 and timestamps[-1] == float(packet['timestamp'])):
+            reads[-1] += data
+        else:
+            timestamps.append(float(packet['timestamp']))
+            reads.append(data)
+
+    clock = VirtualClock(float(recording.header['startMonotonic']))
+    restore = clock.install([LandingPlatformController, CameraStream, LandingStateMachine, LatencyTracer])
+    directory = tempfile.mkdtemp(prefix='replay-')
+    try:
+        packetFormat = CameraProtocol.FORMAT_ASCII
+        prelude = b''
+        if(recording.flags & FlightRecorder.FLAG_BINARY_PACKETS):
+            packetFormat = CameraProtocol.FORMAT_BINARY
+            prelude = _firstBinaryPacket(b''.join(reads), CameraProtocol)
+        camera = ReplayCamera(clock, timestamps, reads, prelude)
+        uav = ReplayUAV(clock, commands, recording.select(FlightRecorder.KIND_READING, records), recording.select(FlightRecorder.KIND_TELEMETRY, records), FlightRecorder)
+
+        lpcSettings = dict(DEFAULT_SETTINGS)
+        lpcSettings.update(settings or dict())
+        lpcSettings.update({'uav': uav, 'cameraSerial': camera, 'cameraThread': False, 'cameraPacketFormat': packetFormat,
+                            'flightRecordDir': directory, 'flightRecordCapacity': max(1024, 2*recording.count)})
+        lpc = LandingPlatformController.LandingPlatformController(settings=lpcSettings)
+        clock.addListener(lpc.pollCamera)
+        clock.addListener(uav.deliverTelemetry)
+        clock.addEventSource(camera.nextEvent)
+        clock.addEventSource(uav.nextTelemetry)
+
+        #The camera was read in the background until the flight began
+        if(len(launches) > 0):
+            clock.sleep(float(launches[0]) - clock.monotonic())
+        lpc.engageFlightRoutine()
+        lpc.done()
+
+        replayed = FlightRecorder.FlightRecording(glob.glob(os.path.join(directory, '*.rec'))[0])
+        replayedRecords = np.array(replayed.ordered())
+        commandCount, replayedCount, commandDivergence, maxDifference, maxTimeOffset = _compareCommands(
+            commands, replayed.select(FlightRecorder.KIND_COMMAND, replayedRecords), FlightRecorder, tolerance)
+        transitions = recording.select(FlightRecorder.KIND_TRANSITION, records)
+        replayedTransitions = replayed.select(FlightRecorder.KIND_TRANSITION, replayedRecords)
+        transitionDivergence = _compareTransitions(transitions, replayedTransitions)
+        simulatedTime = clock.monotonic() - float(recording.header['startMonotonic'])
+    finally:
+        restore()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return ReplayResult(path, commandDivergence == None and transitionDivergence == None, commandCount, replayedCount, commandDivergence,
+                        maxDifference, maxTimeOffset, len(transitions), len(replayedTransitions), transitionDivergence, simulatedTime,
+                        time.perf_counter() - started)
+
+def formatResult(result):
+    """
+    Function:    formatResult
+    Purpose:     Describe a ReplayResult in one line
+    Inputs:      result - a ReplayResult value
+    Outputs:     a string value
+    Description: See purpose.
+    """
+    if(result.identical):
+        return "%s: identical, %d commands, %d transitions, %.1f s replayed in %.3f s" % (os.path.basename(result.path), result.commands,
+                                                                                        result.transitions, result.simulatedTime, result.elapsed)
+    parts = []
+    if(result.commandDivergence != None):
+        parts.append("commands differ from #%d (%d recorded, %d replayed)" % (result.commandDivergence, result.commands, result.replayedCommands))
+    if(result.transitionDivergence != None):
+        parts.append("transitions differ from #%d (%d recorded, %d replayed)" % (result.transitionDivergence, result.transitions, result.replayedTransitions))
+    return "%s: %s, max difference before that %.2e" % (os.path.basename(result.path), ", ".join(parts), result.maxDifference)
@@ -0,0 +1,81 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      GPIOStub
+Purpose:   This file stands in for the RPi.GPIO module so the LandingPlatformController class can
+           be run on a machine without GPIO pins. Output levels are recorded per pin, so the
+           simulated charging pad can tell whether it has been powered.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import sys
+import types
+
+BOARD = 10
+BCM = 11
+OUT = 0
+IN = 1
+LOW = 0
+HIGH = 1
+
+#Level of every pin set up as an output
+pins = dict()
+
+def setmode(mode):
+    return
+
+def setwarnings(flag):
+    return
+
+def setup(pin, direction, initial=LOW):
+    if(direction == OUT):
+        pins[pin] = initial
+    return
+
+def output(pin, state):
+    pins[pin] = HIGH if state else LOW
+    return
+
+def input(pin):
+    return pins.get(pin, LOW)
+
+def cleanup():
+    pins.clear()
+    return
+
+def install():
+    """
+    Function:    install
+    Purpose:     Make "import RPi.GPIO" load this module
+    Inputs:      None
+    Outputs:     None
+    Description: Replaces any real RPi.GPIO module, so a simulation run on a Raspberry Pi never drives its pins.
+    """
+    package = types.ModuleType('RPi')
+    package.GPIO = sys.modules[__name__]
+    sys.modules['RPi'] = package
+    sys.modules['RPi.GPIO'] = sys.modules[__name__]
+    return
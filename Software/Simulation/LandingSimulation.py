@@ -0,0 +1,151 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      LandingSimulation
+Purpose:   This file wires a SimulatedUAV and SimulatedCamera to a LandingPlatformController on a
+           VirtualClock, so a whole landing runs in one thread in a fraction of its flight time.
+           The camera is read by the clock between steps rather than by the background thread,
+           which keeps every run for a given seed identical.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import collections
+import math
+import random
+
+from . import GPIOStub
+from .VirtualClock import VirtualClock
+from .SimulatedUAV import SimulatedUAV
+from .SimulatedCamera import SimulatedCamera
+
+#The outcome of one simulated landing. error is the final distance from the pad center in meters,
+#simulatedTime is in virtual seconds and iterations counts the moves and velocity setpoints sent.
+SimulationResult = collections.namedtuple('SimulationResult', ['seed', 'charging', 'error', 'simulatedTime', 'iterations', 'frames'])
+
+#Controller settings used unless overridden, a camera that needs no discovery or format negotiation
+DEFAULT_SETTINGS = {
+    'cameraMode': 'qvga240',
+    'cameraPacketFormat': 'ascii',
+    'cameraThread': False,
+    'cameraPortCache': None,
+    'flightRecordDir': None,
+    'focalLength': 0.00265,
+    'xImage': 0.003984,
+    'yImage': 0.002952,
+    'xSensor': 656,
+    'ySensor': 488,
+    'xActive': 640,
+    'yActive': 480,
+}
+
+class LandingSimulation():
+
+    def __init__(self, seed=0, settings=None, uavOptions=None, cameraOptions=None, startRadius=0.12, maxFrameAngle=20.0, scaleError=0.05):
+        """
+        Function:    __init__
+        Purpose:     Build a controller, UAV and camera for one simulated landing
+        Inputs:      seed - an integer value that fixes every random choice of the run
+                     settings - a dictionary of LandingPlatformController settings overriding DEFAULT_SETTINGS
+                     uavOptions - a dictionary of SimulatedUAV arguments overriding the randomly drawn ones
+                     cameraOptions - a dictionary of SimulatedCamera arguments
+                     startRadius - a floating point value, the farthest the UAV starts from the pad in meters
+                     maxFrameAngle - a floating point value, the largest rotation between the UAV and camera frames in degrees
+                     scaleError - a floating point value, the largest fraction by which the UAV flies short or long of its commands
+        Outputs:     None
+        Description: RPi.GPIO is replaced by GPIOStub before the controller is imported, and the time module of the
+                     controller and its helpers is replaced by the virtual clock until close is called.
+        """
+        GPIOStub.install()
+        import CameraModel
+        import CameraStream
+        import LandingPlatformController
+        import LandingStateMachine
+        import LatencyTracer
+        LandingPlatformController.GPIO = GPIOStub
+
+        self.seed = seed
+        draw = random.Random(seed)
+        self.clock = VirtualClock()
+        self._restore = self.clock.install([LandingPlatformController, CameraStream, LandingStateMachine, LatencyTracer])
+
+        lpcSettings = dict(DEFAULT_SETTINGS)
+        lpcSettings.update(settings or dict())
+        self._padPosition = tuple(lpcSettings.get('landingPos', (0, 0, 0))[:2])
+        padPin = lpcSettings.get('padPowerPin', 8)
+
+        distance = startRadius*math.sqrt(draw.random())
+        bearing = draw.uniform(-math.pi, math.pi)
+        options = {
+            'position': (self._padPosition[0] + distance*math.cos(bearing), self._padPosition[1] + distance*math.sin(bearing), 0.0),
+            'frameAngle': math.radians(draw.uniform(-maxFrameAngle, maxFrameAngle)),
+            'scale': 1.0 + draw.uniform(-scaleError, scaleError),
+            'padPosition': self._padPosition,
+            'padPowered': lambda: GPIOStub.input(padPin) == GPIOStub.HIGH,
+            'seed': draw.random(),
+        }
+        options.update(uavOptions or dict())
+        self.uav = SimulatedUAV(self.clock, **options)
+
+        mode = CameraModel.MODES_BY_NAME[lpcSettings['cameraMode']]
+        model = CameraModel.CameraModel(mode, lpcSettings['focalLength'], lpcSettings['xImage'], lpcSettings['yImage'],
+                                        lpcSettings['xSensor'], lpcSettings['ySensor'], lpcSettings['xActive'], lpcSettings['yActive'])
+        cameraSettings = {'seed': draw.random()}
+        cameraSettings.update(cameraOptions or dict())
+        self.camera = SimulatedCamera(self.clock, self.uav, model, **cameraSettings)
+
+        lpcSettings['uav'] = self.uav
+        lpcSettings['cameraSerial'] = self.camera
+        self.lpc = LandingPlatformController.LandingPlatformController(settings=lpcSettings)
+        self.clock.addListener(self.lpc.pollCamera)
+
+    def run(self):
+        """
+        Function:    run
+        Purpose:     Fly the controller flight routine once
+        Inputs:      None
+        Outputs:     a SimulationResult value
+        Description: The result is read while the pad is still powered, before close turns it off.
+        """
+        start = self.clock.monotonic()
+        self.lpc.engageFlightRoutine()
+        x, y, z = self.uav.truePosition()
+        error = math.hypot(x - self._padPosition[0], y - self._padPosition[1])
+        return SimulationResult(self.seed, self.uav.isCharging() > 0, error, self.clock.monotonic() - start,
+                                self.uav.moves + self.uav.setpoints, self.camera.frames)
+
+    def close(self):
+        """
+        Function:    close
+        Purpose:     Shut the controller down and give the modules back their time module
+        Inputs:      None
+        Outputs:     None
+        Description: See purpose.
+        """
+        try:
+            self.lpc.done()
+        finally:
+            self._restore()
+        return
@@ -0,0 +1,155 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      SimulatedCamera
+Purpose:   This file contains a simulated OpenMV camera serial connection, for running the
+           LandingPlatformController class without a camera. Until the start string is written
+           the camera sends its standby packet. After that it sends one ASCII packet per frame,
+           projecting the simulated UAV position through the pinhole model of a CameraModel:
+
+           pixel = world/(height*scale) + center - window
+
+           Frames are generated lazily from the virtual time whenever the connection is read,
+           and a read that finds nothing waiting advances the clock like a serial timeout.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import random
+
+#Height below which the LEDs are too close to, or resting on, the camera housing to be tracked, in meters
+MIN_VISIBLE_HEIGHT = 0.05
+
+class SimulatedCamera():
+
+    def __init__(self, clock, uav, cameraModel, frameRate=60.0, pixelNoise=1.0, tooManyBlobsRate=0.01, startString='start',
+                 initValue='{904$904}\r\n', outOfFrameValue='{900$900}\r\n', tooManyBlobsValue='{901$901}\r\n', seed=None):
+        """
+        Function:    __init__
+        Purpose:     Setup a simulated camera in standby
+        Inputs:      clock - a VirtualClock value
+                     uav - a SimulatedUAV value
+                     cameraModel - a CameraModel.CameraModel value describing the mode the camera runs in
+                     frameRate - a floating point value, the number of packets sent per second
+                     pixelNoise - a floating point value, the standard deviation of each pixel coordinate in pixels
+                     tooManyBlobsRate - a floating point value from 0 to 1, the fraction of frames in which stray blobs hide the UAV
+                     startString - a string value, written by the controller to leave standby
+                     initValue - a string value, the packet sent in standby
+                     outOfFrameValue - a string value, the packet sent when the UAV is not in the frame
+                     tooManyBlobsValue - a string value, the packet sent when the UAV cannot be told apart
+                     seed - a value used to seed the random number generator
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._clock = clock
+        self._uav = uav
+        self._model = cameraModel
+        self._period = 1.0/frameRate
+        self._pixelNoise = pixelNoise
+        self._tooManyBlobsRate = tooManyBlobsRate
+        self._startString = startString.encode()
+        self._initPacket = initValue.encode()
+        self._outOfFramePacket = outOfFrameValue.encode()
+        self._tooManyBlobsPacket = tooManyBlobsValue.encode()
+        self._random = random.Random(seed)
+        self._buffer = bytearray()
+        self._nextFrame = clock.monotonic() + self._period
+        self._started = False
+        self.timeout = None
+        self.frames = 0
+
+    def _packet(self):
+        """
+        Function:    _packet
+        Purpose:     Build the packet for one frame at the current time
+        Inputs:      None
+        Outputs:     a bytes value
+        Description: The pixel is rounded after adding noise and must land inside the mode window to be sent.
+        """
+        if(self._started == False):
+            return self._initPacket
+        x, y, z = self._uav.truePosition()
+        if(z < MIN_VISIBLE_HEIGHT):
+            return self._outOfFramePacket
+        if(self._random.random() < self._tooManyBlobsRate):
+            return self._tooManyBlobsPacket
+        model = self._model
+        u = int(round(x/(z*model.xScale) + model.xCenter - model.xWindow + self._random.gauss(0, self._pixelNoise)))
+        v = int(round(y/(z*model.yScale) + model.yCenter - model.yWindow + self._random.gauss(0, self._pixelNoise)))
+        if(0 <= u < model.mode.width and 0 <= v < model.mode.height):
+            return b'{%03d$%03d}\r\n' % (u, v)
+        return self._outOfFramePacket
+
+    def _generate(self):
+        #Send every frame due by now
+        now = self._clock.monotonic()
+        while(self._nextFrame <= now):
+            self._buffer += self._packet()
+            self._nextFrame += self._period
+            self.frames += 1
+        return
+
+    def _waitForData(self):
+        #Advance the clock to the next frame, or until the timeout runs out
+        self._generate()
+        if(len(self._buffer) > 0):
+            return
+        wait = self._nextFrame - self._clock.monotonic()
+        if(self.timeout != None):
+            wait = min(wait, self.timeout)
+        self._clock.advance(wait)
+        self._generate()
+        return
+
+    @property
+    def in_waiting(self):
+        self._generate()
+        return len(self._buffer)
+
+    def read(self, size=1):
+        self._waitForData()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def readinto(self, buffer):
+        self._waitForData()
+        count = min(len(buffer), len(self._buffer))
+        buffer[:count] = self._buffer[:count]
+        del self._buffer[:count]
+        return count
+
+    def write(self, data):
+        if(data.strip() == self._startString):
+            self._started = True
+            self._buffer.clear()
+        return len(data)
+
+    def reset_input_buffer(self):
+        self._buffer.clear()
+        return
+
+    def close(self):
+        return
@@ -0,0 +1,289 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      SimulatedUAV
+Purpose:   This file contains a simulated UAV with the same interface as the UAVController class,
+           for running the LandingPlatformController class without a Crazyflie. Its pose is kept
+           in the camera frame and integrated lazily up to the virtual time whenever it is read.
+
+           frame offset - commands are rotated by frameAngle and scaled by scale before they are flown
+           latency      - commands take effect latency seconds after they are sent
+           drift        - a wind velocity that wanders as a first order random process
+           noise        - the reported height scatters around the true height
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import collections
+import math
+import random
+
+#Longest time the pose is integrated over in one piece, so the wind changes smoothly, in seconds
+INTEGRATION_STEP = 0.02
+
+#Crazyflie Motion Commander take off and landing defaults
+TAKE_OFF_HEIGHT = 0.3
+TAKE_OFF_VELOCITY = 0.2
+LANDING_VELOCITY = 0.2
+
+class SimulatedUAV():
+
+    def __init__(self, clock, position=(0.0, 0.0, 0.0), frameAngle=0.0, scale=1.0, latency=0.05, windStd=0.01, windTime=2.0,
+                 heightNoise=0.005, padPosition=(0.0, 0.0), padRadius=0.05, padPowered=None, seed=None):
+        """
+        Function:    __init__
+        Purpose:     Setup a simulated UAV resting on the ground
+        Inputs:      clock - a VirtualClock value
+                     position - a list of x, y, z floating point values, the starting position in the camera frame in meters
+                     frameAngle - a floating point value, the rotation from the UAV frame to the camera frame in radians
+                     scale - a floating point value, the distance flown per meter commanded
+                     latency - a floating point value, the delay before a command takes effect in seconds
+                     windStd - a floating point value, the standard deviation of the wind along each axis in meters per second
+                     windTime - a floating point value, the time over which the wind changes in seconds
+                     heightNoise - a floating point value, the standard deviation of the reported height in meters
+                     padPosition - a list of x, y floating point values, the center of the charging pad in the camera frame in meters
+                     padRadius - a floating point value, how far from the pad center the UAV still charges in meters
+                     padPowered - a function taking no arguments that returns whether the pad is powered, None for always
+                     seed - a value used to seed the random number generator
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._clock = clock
+        self._random = random.Random(seed)
+        self._position = [float(value) for value in position]
+        self.frameAngle = frameAngle
+        self.scale = scale
+        self.latency = latency
+        self._windStd = windStd
+        self._windTime = windTime
+        self._heightNoise = heightNoise
+        self._padPosition = padPosition
+        self._padRadius = padRadius
+        self._padPowered = padPowered
+        self._wind = [0.0, 0.0]
+        self._velocity = (0.0, 0.0, 0.0)
+        self._pending = collections.deque()
+        self._time = clock.monotonic()
+        self._takeOffPosition = list(self._position)
+        self.airborne = False
+        self.flightTime = 0.0
+        self.moves = 0
+        self.setpoints = 0
+
+    def _advance(self):
+        """
+        Function:    _advance
+        Purpose:     Integrate the pose up to the current virtual time
+        Inputs:      None
+        Outputs:     None
+        Description: Pending commands are applied at the time they take effect. While airborne the UAV flies its
+                     commanded velocity plus the wind, and it never goes below the ground.
+        """
+        now = self._clock.monotonic()
+        while(self._time < now):
+            end = min(now, self._time + INTEGRATION_STEP)
+            if(len(self._pending) > 0):
+                end = min(end, max(self._time, self._pending[0][0]))
+            dt = end - self._time
+            if(self.airborne and dt > 0):
+                self._position[0] += (self._velocity[0] + self._wind[0])*dt
+                self._position[1] += (self._velocity[1] + self._wind[1])*dt
+                self._position[2] = max(0.0, self._position[2] + self._velocity[2]*dt)
+                decay = math.exp(-dt/self._windTime)
+                spread = self._windStd*math.sqrt(1 - decay*decay)
+                self._wind = [wind*decay + self._random.gauss(0, spread) for wind in self._wind]
+                self.flightTime += dt
+            self._time = end
+            while(len(self._pending) > 0 and self._pending[0][0] <= self._time):
+                self._velocity = self._pending.popleft()[1]
+        return
+
+    def _command(self, velocity, delay=0.0):
+        #Schedule a velocity in the camera frame to take effect after the latency and the given delay
+        self._advance()
+        self._pending.append((self._clock.monotonic() + self.latency + delay, velocity))
+        return
+
+    def _toCamera(self, x, y):
+        #Rotate and scale a vector from the UAV frame into the camera frame
+        cosA, sinA = math.cos(self.frameAngle), math.sin(self.frameAngle)
+        return self.scale*(cosA*x - sinA*y), self.scale*(sinA*x + cosA*y)
+
+    def truePosition(self):
+        """
+        Function:    truePosition
+        Purpose:     Get the simulated position, which the real UAV cannot report
+        Inputs:      None
+        Outputs:     a tuple of x, y, z floating point values in the camera frame in meters
+        Description: See purpose.
+        """
+        self._advance()
+        return tuple(self._position)
+
+    def done(self):
+        self._advance()
+        self.airborne = False
+        return
+
+    def launch(self):
+        """
+        Function:    launch
+        Purpose:     Take off to the default height
+        Inputs:      None
+        Outputs:     None
+        Description: Blocks for the length of the climb, like the Motion Commander take_off function.
+        """
+        self._advance()
+        self.airborne = True
+        self._takeOffPosition = list(self._position)
+        duration = max(0.0, TAKE_OFF_HEIGHT - self._position[2])/TAKE_OFF_VELOCITY
+        self._command((0.0, 0.0, TAKE_OFF_VELOCITY))
+        self._command((0.0, 0.0, 0.0), duration)
+        self._clock.sleep(self.latency + duration)
+        return
+
+    def land(self):
+        """
+        Function:    land
+        Purpose:     Descend to the ground at the current position
+        Inputs:      None
+        Outputs:     None
+        Description: The wind no longer moves the UAV once it is on the ground.
+        """
+        self._advance()
+        duration = self._position[2]/LANDING_VELOCITY
+        self._pending.clear()
+        self._command((0.0, 0.0, -LANDING_VELOCITY))
+        self._command((0.0, 0.0, 0.0), duration)
+        self._clock.sleep(self.latency + duration)
+        self._advance()
+        self._position[2] = 0.0
+        self.airborne = False
+        self._wind = [0.0, 0.0]
+        return
+
+    def move(self, distanceX, distanceY, distanceZ, velocity):
+        """
+        Function:    move
+        Purpose:     Move a distance from the current point
+        Inputs:      distanceX - a floating point value, the distance along the UAV x-axis in meters
+                     distanceY - a floating point value, the distance along the UAV y-axis in meters
+                     distanceZ - a floating point value, the distance along the z-axis in meters
+                     velocity - a floating point value, the speed along the move in meters per second
+        Outputs:     None
+        Description: Blocks until the move is finished, like the Motion Commander move_distance function.
+        """
+        if(self.airborne == False):
+            self.launch()
+
+        self.moves += 1
+        distance = math.sqrt(distanceX*distanceX + distanceY*distanceY + distanceZ*distanceZ)
+        if(distance == 0 or velocity <= 0):
+            return
+        duration = distance/velocity
+        cameraX, cameraY = self._toCamera(distanceX/duration, distanceY/duration)
+        self._command((cameraX, cameraY, distanceZ/duration))
+        self._command((0.0, 0.0, 0.0), duration)
+        self._clock.sleep(self.latency + duration)
+        return
+
+    def setVelocity(self, velocityX, velocityY, velocityZ):
+        """
+        Function:    setVelocity
+        Purpose:     Set the velocity without waiting
+        Inputs:      velocityX - a floating point value, the velocity along the UAV x-axis in meters per second
+                     velocityY - a floating point value, the velocity along the UAV y-axis in meters per second
+                     velocityZ - a floating point value, the velocity along the z-axis in meters per second
+        Outputs:     None
+        Description: See purpose.
+        """
+        if(self.airborne == False):
+            self.launch()
+
+        self.setpoints += 1
+        cameraX, cameraY = self._toCamera(velocityX, velocityY)
+        self._command((cameraX, cameraY, velocityZ))
+        return
+
+    def rotate(self, degree):
+        """
+        Function:    rotate
+        Purpose:     Turn the UAV about its vertical axis
+        Inputs:      degree - a floating point value in degrees, positive to the left
+        Outputs:     None
+        Description: Turning the UAV turns its frame against the camera frame. Blocks for one second like UAVController.
+        """
+        if(self.airborne == False):
+            self.launch()
+
+        self._advance()
+        self.frameAngle += math.radians(degree)
+        self._clock.sleep(1)
+        return
+
+    def getBatteryLevel(self):
+        """
+        Function:    getBatteryLevel
+        Purpose:     Report the battery voltage
+        Inputs:      None
+        Outputs:     a floating point value in volts
+        Description: The voltage falls linearly with time in the air, from a full 4.2 volt cell to about 3.5 volts after
+                     seven minutes.
+        """
+        self._advance()
+        return 4.2 - 0.0017*self.flightTime
+
+    def getHeight(self):
+        self._advance()
+        return max(0.0, self._position[2] + self._random.gauss(0, self._heightNoise))
+
+    def getPosition(self):
+        """
+        Function:    getPosition
+        Purpose:     Report the onboard position estimate
+        Inputs:      None
+        Outputs:     a tuple of x, y, z floating point values in meters, in the UAV frame from its take off point
+        Description: The commanded frame is recovered exactly, so unlike the real UAV this estimate does not drift.
+        """
+        self._advance()
+        dx = (self._position[0] - self._takeOffPosition[0])/self.scale
+        dy = (self._position[1] - self._takeOffPosition[1])/self.scale
+        cosA, sinA = math.cos(self.frameAngle), math.sin(self.frameAngle)
+        return (cosA*dx + sinA*dy, -sinA*dx + cosA*dy, self._position[2])
+
+    def isCharging(self):
+        """
+        Function:    isCharging
+        Purpose:     Report the charge current
+        Inputs:      None
+        Outputs:     a floating point value in amps
+        Description: The UAV charges when it rests within padRadius of the pad center and the pad is powered.
+        """
+        self._advance()
+        offset = math.hypot(self._position[0] - self._padPosition[0], self._position[1] - self._padPosition[1])
+        powered = self._padPowered == None or self._padPowered()
+        if(self.airborne == False and offset <= self._padRadius and powered):
+            return 0.5
+        return 0.0
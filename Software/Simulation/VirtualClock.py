@@ -0,0 +1,135 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      VirtualClock
+Purpose:   This file contains the clock used to run the LandingPlatformController class faster
+           than real time. It stands in for the time module of the modules it is installed
+           into, so time.monotonic() reads the virtual time and time.sleep() advances it
+           instantly. Sleeping advances in small steps and calls the registered listeners at
+           each one, so simulated hardware keeps producing data while the controller waits.
+           Event sources can ask for a step to end exactly when their next event is due.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+
+class VirtualClock():
+
+    def __init__(self, start=0.0, step=0.01):
+        """
+        Function:    __init__
+        Purpose:     Setup a virtual clock
+        Inputs:      start - a floating point value, the time the clock starts at in seconds
+                     step - a floating point value, the longest time a sleep advances between calls to the listeners in seconds
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._now = float(start)
+        self._step = step
+        self._listeners = []
+        self._sources = []
+
+    def monotonic(self):
+        return self._now
+
+    def time(self):
+        return self._now
+
+    def perf_counter(self):
+        return self._now
+
+    def addListener(self, callback):
+        """
+        Function:    addListener
+        Purpose:     Register a function called every time a sleep advances the clock
+        Inputs:      callback - a function taking no arguments
+        Outputs:     None
+        Description: Listeners are how the simulation polls the camera while the controller sleeps.
+        """
+        self._listeners.append(callback)
+        return
+
+    def addEventSource(self, nextEvent):
+        """
+        Function:    addEventSource
+        Purpose:     Register a function giving the time of the next event due from some hardware
+        Inputs:      nextEvent - a function taking no arguments that returns a time in seconds, or None if nothing is due
+        Outputs:     None
+        Description: Sleeps end a step at the earliest event due within it, so the listeners see each event at exactly
+                     the time it is due rather than up to a step late.
+        """
+        self._sources.append(nextEvent)
+        return
+
+    def advance(self, seconds):
+        """
+        Function:    advance
+        Purpose:     Move the clock forward without calling the listeners
+        Inputs:      seconds - a floating point value
+        Outputs:     None
+        Description: Used by simulated hardware that blocks, such as a serial read waiting for its timeout, which is
+                     itself called from a listener and so must not call back into it.
+        """
+        if(seconds > 0):
+            self._now += seconds
+        return
+
+    def sleep(self, seconds):
+        """
+        Function:    sleep
+        Purpose:     Move the clock forward, calling the listeners at every step
+        Inputs:      seconds - a floating point value
+        Outputs:     None
+        Description: A drop in replacement for time.sleep.
+        """
+        end = self._now + max(0.0, seconds)
+        while(self._now < end):
+            step = min(end, self._now + self._step)
+            for nextEvent in self._sources:
+                due = nextEvent()
+                if(due != None and self._now < due < step):
+                    step = due
+            self._now = step
+            for listener in self._listeners:
+                listener()
+        return
+
+    def install(self, modules):
+        """
+        Function:    install
+        Purpose:     Make modules use this clock in place of the time module
+        Inputs:      modules - a list of modules that imported time
+        Outputs:     a function taking no arguments that restores the time module
+        Description: Only the module attribute is replaced, so the modules must call time.monotonic() and time.sleep()
+                     rather than having imported the functions themselves.
+        """
+        replaced = [(module, module.time) for module in modules]
+        for module in modules:
+            module.time = self
+
+        def restore():
+            for module, original in replaced:
+                module.time = original
+        return restore
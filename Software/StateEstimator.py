@@ -0,0 +1,199 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      StateEstimator
+Purpose:   This file contains the constant velocity Kalman filter used by the LandingPlatformController
+           class to track the UAV in the camera world frame. Camera fixes update the position, and
+           the Crazyflie stateEstimate odometry updates the velocity, each as they arrive on their
+           own thread. The controller can then ask for the position and velocity at any time
+           without waiting on the camera.
+
+           State vector: [x, y, vx, vy] in meters and meters per second, camera world frame
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import collections
+import math
+import threading
+
+import numpy as np
+
+#Position and velocity of the UAV at a particular host time, positionStd is the standard deviation of the position along each axis
+StateEstimate = collections.namedtuple('StateEstimate', ['timestamp', 'x', 'y', 'vx', 'vy', 'positionStd', 'lastFixTime'])
+
+class KalmanTracker():
+
+    def __init__(self, processNoise=0.5, initialStd=10.0):
+        """
+        Function:    __init__
+        Purpose:     Setup a constant velocity Kalman filter for the UAV x-y position
+        Inputs:      processNoise - a floating point value, the spectral density of the random acceleration in m^2/s^3
+                     initialStd - a floating point value, the standard deviation in meters and meters per second of the starting state
+        Outputs:     None
+        Description: Every matrix is allocated once here and updated in place, so a measurement does not allocate
+                     beyond a few small temporaries. All public functions take a lock, since camera fixes and odometry
+                     arrive on different threads.
+        """
+        self._processNoise = processNoise
+        self._lock = threading.Lock()
+
+        self._x = np.zeros(4)
+        self._P = np.eye(4)*initialStd**2
+        self._F = np.eye(4)
+        self._Q = np.zeros((4, 4))
+        self._I = np.eye(4)
+        self._scratch = np.zeros((4, 4))
+
+        #Camera fixes measure position, odometry differences measure velocity
+        self._hPosition = np.array([[1.0, 0, 0, 0], [0, 1.0, 0, 0]])
+        self._hVelocity = np.array([[0, 0, 1.0, 0], [0, 0, 0, 1.0]])
+        self._z = np.zeros(2)
+        self._R = np.zeros((2, 2))
+
+        self._time = None
+        self._lastFixTime = None
+        self._lastOdometry = None
+
+    def _propagate(self, timestamp):
+        """
+        Function:    _propagate
+        Purpose:     Move the filter state forward to a new time
+        Inputs:      timestamp - a floating point value in the time.monotonic() time base
+        Outputs:     None
+        Description: Measurements older than the filter state are applied at the current filter time rather than
+                     rewinding the filter, which is accurate to within one packet interval. Must hold the lock.
+        """
+        if(self._time == None):
+            self._time = timestamp
+            return
+        dt = timestamp - self._time
+        if(dt <= 0):
+            return
+        self._time = timestamp
+
+        self._F[0, 2] = dt
+        self._F[1, 3] = dt
+
+        #Discrete white noise acceleration model, independent along each axis
+        q = self._processNoise
+        self._Q[0, 0] = self._Q[1, 1] = q*dt**3/3
+        self._Q[0, 2] = self._Q[2, 0] = self._Q[1, 3] = self._Q[3, 1] = q*dt**2/2
+        self._Q[2, 2] = self._Q[3, 3] = q*dt
+
+        #F is identity apart from the dt terms, so the state is moved directly
+        self._x[0] += dt*self._x[2]
+        self._x[1] += dt*self._x[3]
+        np.matmul(self._F, self._P, out=self._scratch)
+        np.matmul(self._scratch, self._F.T, out=self._P)
+        self._P += self._Q
+        return
+
+    def _correct(self, H, variance):
+        """
+        Function:    _correct
+        Purpose:     Apply the measurement held in _z to the filter state
+        Inputs:      H - a 2x4 NumPy array mapping the state to the measurement
+                     variance - a floating point value, the variance of each measured axis
+        Outputs:     None
+        Description: Standard Kalman update using the Joseph form so the covariance stays symmetric. Must hold the lock.
+        """
+        self._R[0, 0] = self._R[1, 1] = variance
+        S = H @ self._P @ H.T + self._R
+        K = self._P @ H.T @ np.linalg.inv(S)
+        self._x += K @ (self._z - H @ self._x)
+        np.subtract(self._I, K @ H, out=self._scratch)
+        self._P[:] = self._scratch @ self._P @ self._scratch.T + K @ self._R @ K.T
+        return
+
+    def updateCamera(self, timestamp, x, y, std):
+        """
+        Function:    updateCamera
+        Purpose:     Feed a camera fix to the filter
+        Inputs:      timestamp - a floating point value in the time.monotonic() time base
+                     x - a floating point value, the world x-coordinate of the UAV in meters
+                     y - a floating point value, the world y-coordinate of the UAV in meters
+                     std - a floating point value, the standard deviation of the fix in meters
+        Outputs:     None
+        Description: See purpose.
+        """
+        with self._lock:
+            self._propagate(timestamp)
+            self._z[0] = x
+            self._z[1] = y
+            self._correct(self._hPosition, std**2)
+            self._lastFixTime = max(timestamp, self._lastFixTime or timestamp)
+        return
+
+    def updateOdometry(self, timestamp, x, y, angle, std):
+        """
+        Function:    updateOdometry
+        Purpose:     Feed a Crazyflie stateEstimate position to the filter
+        Inputs:      timestamp - a floating point value in the time.monotonic() time base
+                     x - a floating point value, the UAV x-coordinate in its own frame in meters
+                     y - a floating point value, the UAV y-coordinate in its own frame in meters
+                     angle - a floating point value, the UAV frame offset angle from the camera frame in radians
+                     std - a floating point value, the standard deviation of the derived velocity in meters per second
+        Outputs:     None
+        Description: The onboard position drifts and has its own origin, so only the change between two packets is used.
+                     That change is turned into a velocity and rotated into the camera frame, which is the inverse of the
+                     transform used by _sendToHome.
+        """
+        with self._lock:
+            previous = self._lastOdometry
+            self._lastOdometry = (timestamp, x, y)
+            if(previous == None or timestamp <= previous[0]):
+                return
+            dt = timestamp - previous[0]
+            vx = (x - previous[1])/dt
+            vy = (y - previous[2])/dt
+
+            self._propagate(timestamp)
+            self._z[0] = vx*math.cos(angle) - vy*math.sin(angle)
+            self._z[1] = vx*math.sin(angle) + vy*math.cos(angle)
+            self._correct(self._hVelocity, std**2)
+        return
+
+    def predict(self, timestamp):
+        """
+        Function:    predict
+        Purpose:     Report the UAV position and velocity at any time
+        Inputs:      timestamp - a floating point value in the time.monotonic() time base
+        Outputs:     a StateEstimate value, or None if no measurement has been received
+        Description: The filter state is extrapolated with the constant velocity model without being changed, so this can
+                     be called as often as needed from any thread.
+        """
+        with self._lock:
+            if(self._time == None):
+                return None
+            dt = max(0.0, timestamp - self._time)
+            x = self._x.copy()
+            P = self._P.copy()
+            lastFixTime = self._lastFixTime
+
+        q = self._processNoise
+        positionVariance = P[0, 0] + 2*dt*P[0, 2] + dt*dt*P[2, 2] + q*dt**3/3
+        positionVariance = max(positionVariance, P[1, 1] + 2*dt*P[1, 3] + dt*dt*P[3, 3] + q*dt**3/3)
+        return StateEstimate(timestamp, float(x[0] + dt*x[2]), float(x[1] + dt*x[3]), float(x[2]), float(x[3]), math.sqrt(positionVariance), lastFixTime)
@@ -37,6 +37,11 @@ Modified:  5-5-2020
 import logging
 import time
 import io
+import collections
+
+import numpy as np
+
+import AsyncStreams
 
 import cflib.crtp
 from cflib.crazyflie import Crazyflie
@@ -44,6 +49,12 @@ from cflib.positioning.motion_commander import MotionCommander
 from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
 from cflib.crazyflie.syncLogger import SyncLogger
 from cflib.crazyflie.log import LogConfig, Log, LogVariable
+
+#A single log packet from the UAV, timestamp is the host monotonic time it was received and uavTimestamp is the UAV time in milliseconds
+TelemetryPacket = collections.namedtuple('TelemetryPacket', ['timestamp', 'uavTimestamp', 'data'])
+
+#Number of attitude samples kept for interpolation, 5 seconds at the attitude log period
+ATTITUDE_HISTORY = 250
         
 class UAVController():
 
@@ -66,6 +77,13 @@ class UAVController():
         self.airborne = False
         self._recentDataPacket = None
         self._receivingDataPacket = False
+        self._telemetryListeners = ()
+        #Attitude log of time, roll, pitch and yaw rows, each sample written twice, ATTITUDE_HISTORY apart, so the latest
+        #samples are always one contiguous slice however far the ring has wrapped
+        self._attitudeLog = np.zeros((4, 2*ATTITUDE_HISTORY))
+        self._attitudeCount = 0
+        self._metrics = None
+        self._lastDataTime = None
 
         #Attempt to locate UAV by scanning available interface
         for _ in range(0,500):
@@ -113,6 +131,18 @@ class UAVController():
             else:
                 logger.warning("Could not setup log configuration")
 
+            #Attitude is logged in its own block, a log block only holds 26 bytes and the block above uses 20 of them
+            self.UAVAttitudeConfig = LogConfig(name = "UAVAttitude", period_in_ms=20)
+            self.UAVAttitudeConfig.add_variable('stabilizer.roll', 'float')
+            self.UAVAttitudeConfig.add_variable('stabilizer.pitch', 'float')
+            self.UAVAttitudeConfig.add_variable('stabilizer.yaw', 'float')
+            self.UAV.log.add_config(self.UAVAttitudeConfig)
+            if(self.UAVAttitudeConfig.valid):
+                self.UAVAttitudeConfig.data_received_cb.add_callback(self._getUAVAttitudePacket)
+                self.UAVAttitudeConfig.start()
+            else:
+                logger.warning("Could not setup attitude log configuration")
+
         #End of function
 
     def done(self):
@@ -124,6 +154,7 @@ class UAVController():
         Description: See purpose.
         """
         self.UAVLogConfig.stop()
+        self.UAVAttitudeConfig.stop()
         self.UAV.close_link()
         self.airborne = False
         return
@@ -171,6 +202,23 @@ class UAVController():
         #End of function
         return
 
+    def setVelocity(self, velocityX, velocityY, velocityZ):
+        """
+        Function: setVelocity
+        Purpose: A wrapper function to set the UAV velocity without waiting for a movement to finish
+        Inputs: velocityX - a floating point value that represents the velocity in the X-dimension, measured in meters per second.
+                velocityY - a floating point value that represents the velocity in the Y-dimension, measured in meters per second.
+                velocityZ - a floating point value that represents the velocity in the Z-dimension, measured in meters per second.
+        Outputs: none
+        Description: Calls the Motion Commander start_linear_motion function, which sends the setpoint to the UAV immediately and
+                     keeps repeating it until the next call. Meant to be called at a steady rate by a closed loop controller.
+        """
+        if(self.airborne == False):
+            self.launch()
+
+        self.MC.start_linear_motion(velocityX, velocityY, velocityZ)
+        return
+
     def rotate(self, degree):
         """
         Function: rotate
@@ -227,6 +275,47 @@ class UAVController():
 
         return retVal
 
+    def getPosition(self):
+        """
+        Function: getPosition
+        Purpose: A function that reads the UAV onboard position estimate from a IOStream.
+        Inputs: none
+        Outputs: retVal - a tuple of x, y, z floating point values in meters, in the UAV frame from its take off point.
+        Description: The onboard x-y estimate drifts over time, so it should only be relied on for short term changes.
+        """
+        retVal = None
+        if(self._recentDataPacket != None and self._receivingDataPacket == False):
+            packet = self._recentDataPacket
+            retVal = (packet["stateEstimate.x"], packet["stateEstimate.y"], packet["stateEstimate.z"])
+
+        return retVal
+
+    def getAttitude(self, timestamps):
+        """
+        Function: getAttitude
+        Purpose: A function that reports the UAV attitude at given times, interpolated from the attitude log.
+        Inputs: timestamps - a floating point value or array of values in the time.monotonic() time base
+        Outputs: retVal - a tuple of roll, pitch, yaw NumPy arrays in degrees, or None if no attitude has been received.
+        Description: Attitude is interpolated linearly between the two log packets around each time, and held at the first or
+                     last packet outside of the logged span. Only the packets between the earliest and latest time are read
+                     from the log, found by binary search, so the cost does not grow with the length of the log. Yaw is unwrapped first so it does not jump at +/-180 degrees.
+                     Pitch is reported as the Crazyflie logs it, which is inverted from the right hand rule.
+        """
+        count = self._attitudeCount
+        if(count == 0):
+            return None
+        #Latest samples as a view of the log, leaving out the oldest slot, which the next packet overwrites
+        end = (count - 1) % ATTITUDE_HISTORY + 1 + ATTITUDE_HISTORY
+        log = self._attitudeLog[:, end - min(count, ATTITUDE_HISTORY - 1):end]
+
+        #Only the samples around the requested times are needed
+        timestamps = np.asarray(timestamps, dtype=float)
+        first = max(0, int(np.searchsorted(log[0], timestamps.min(), 'right')) - 1)
+        last = int(np.searchsorted(log[0], timestamps.max(), 'left')) + 1
+        times, roll, pitch, yaw = log[:, first:last]
+        yaw = np.degrees(np.unwrap(np.radians(yaw)))
+        return np.interp(timestamps, times, roll), np.interp(timestamps, times, pitch), np.interp(timestamps, times, yaw)
+
     def isCharging(self):
         """
         Function: getCurrentHeight
@@ -254,3 +343,84 @@ class UAVController():
         self._receivingDataPacket = True
         self._recentDataPacket = data
         self._receivingDataPacket = False 
+
+        #Measure how evenly log packets arrive
+        if(self._metrics != None):
+            now = time.monotonic()
+            if(self._lastDataTime != None):
+                interval = now - self._lastDataTime
+                self._telemetryInterval.record(interval)
+                self._telemetryJitter.record(abs(interval - self._telemetryPeriod))
+            self._lastDataTime = now
+
+        #Pass the packet on to anything streaming telemetry
+        if(len(self._telemetryListeners) > 0):
+            packet = TelemetryPacket(time.monotonic(), ident, data)
+            for listener in self._telemetryListeners:
+                listener([packet])
+
+    def _getUAVAttitudePacket(self, ident, data, logconfig):
+        """
+        Function: getUAVAttitudePacket
+        Purpose: A callback function to process an attitude packet received from the UAV
+        Inputs: ident -  identifier of the UAV
+                data - data from the UAV
+                logconfig - log configuration from the UAV
+        Outputs: None
+        Description: A user should NEVER call this function.
+        """
+        sample = (time.monotonic(), data["stabilizer.roll"], data["stabilizer.pitch"], data["stabilizer.yaw"])
+        index = self._attitudeCount % ATTITUDE_HISTORY
+        self._attitudeLog[:, index] = sample
+        self._attitudeLog[:, index + ATTITUDE_HISTORY] = sample
+        #Published after the sample is stored, so readers never see a half written sample
+        self._attitudeCount += 1
+
+    def attachMetrics(self, metrics):
+        """
+        Function:    attachMetrics
+        Purpose:     Start measuring the arrival of log packets from the UAV
+        Inputs:      metrics - a Metrics.MetricsRegistry value
+        Outputs:     None
+        Description: The time between log packets, and its difference from the log period, are recorded on the Crazyflie
+                     logging thread as each packet arrives.
+        """
+        self._telemetryInterval = metrics.histogram('uav_telemetry_interval_seconds', 'Time between log packets received from the UAV')
+        self._telemetryJitter = metrics.histogram('uav_telemetry_jitter_seconds', 'Difference between the time between log packets and the log period')
+        self._telemetryPeriod = self.UAVLogConfig.period_in_ms/1000.0
+        self._lastDataTime = None
+        self._metrics = metrics
+        return
+
+    def addTelemetryListener(self, callback):
+        """
+        Function:    addTelemetryListener
+        Purpose:     Register a function to be given every log packet received from the UAV
+        Inputs:      callback - a function that takes a list of TelemetryPacket values
+        Outputs:     None
+        Description: The callback runs on the Crazyflie logging thread, so it must be quick and must not block.
+        """
+        self._telemetryListeners = self._telemetryListeners + (callback,)
+        return
+
+    def removeTelemetryListener(self, callback):
+        """
+        Function:    removeTelemetryListener
+        Purpose:     Remove a function registered with addTelemetryListener
+        Inputs:      callback - a previously registered function
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._telemetryListeners = tuple(listener for listener in self._telemetryListeners if listener != callback)
+        return
+
+    async def telemetry(self, maxQueue=256):
+        """
+        Function:    telemetry
+        Purpose:     Stream log packets from the UAV as they arrive
+        Inputs:      maxQueue - an integer value denoting how many packets may wait for the consumer before the oldest are dropped
+        Outputs:     yields TelemetryPacket values, use as "async for packet in uav.telemetry()"
+        Description: Packets are handed from the Crazyflie logging thread to the event loop with call_soon_threadsafe.
+        """
+        async for packet in AsyncStreams.callbackStream(self.addTelemetryListener, self.removeTelemetryListener, maxQueue):
+            yield packet
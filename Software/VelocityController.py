@@ -0,0 +1,136 @@
+"""
+
+      .o.       ooooooooo.         .o.       oooooo     oooo
+     .888.      `888   `Y88.      .888.       `888.     .8'
+    .8"888.      888   .d88'     .8"888.       `888.   .8'
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'
+ .8'     `888.   888  `88b.   .8'     `888.       `888'
+o88o     o8888o o888o  o888o o88o     o8888o       `8'
+
+
+File:      VelocityController
+Purpose:   This file contains the PID controller used by the LandingPlatformController class for
+           closed loop landing. Instead of commanding a distance and waiting for the move to
+           finish, the controller turns the latest position estimate into a velocity setpoint
+           many times a second, so alignment and descent happen at the same time.
+Author:    Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created:   10-18-2026
+Modified:  10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+"""
+import math
+
+class PIDAxis():
+
+    def __init__(self, kp, ki, kd, outputLimit, integralLimit):
+        """
+        Function:    __init__
+        Purpose:     Setup a PID controller for one axis
+        Inputs:      kp - a floating point value, the proportional gain in 1/s
+                     ki - a floating point value, the integral gain in 1/s^2
+                     kd - a floating point value, the derivative gain, unitless
+                     outputLimit - a floating point value, the largest velocity that will be commanded in m/s
+                     integralLimit - a floating point value, the largest velocity the integral term may contribute in m/s
+        Outputs:     None
+        Description: See purpose.
+        """
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.outputLimit = outputLimit
+        self.integralLimit = integralLimit
+        self._integral = 0.0
+
+    def reset(self):
+        """
+        Function:    reset
+        Purpose:     Clear the integral term
+        Inputs:      None
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._integral = 0.0
+        return
+
+    def update(self, error, rate, dt):
+        """
+        Function:    update
+        Purpose:     Compute the velocity command for one axis
+        Inputs:      error - a floating point value, the target minus the position in meters
+                     rate - a floating point value, the measured velocity in m/s
+                     dt - a floating point value, the time since the last update in seconds
+        Outputs:     a floating point velocity command in m/s
+        Description: The derivative acts on the measured velocity rather than the error, so a jump in the target or in
+                     the estimate does not kick the output. Two anti-windup measures are used. The integral is clamped
+                     to integralLimit, and it is not grown while the output is saturated in the same direction as
+                     the error.
+        """
+        unlimited = self.kp*error + self._integral - self.kd*rate
+        output = max(-self.outputLimit, min(self.outputLimit, unlimited))
+        if(output == unlimited or (error > 0) != (unlimited > 0)):
+            self._integral += self.ki*error*dt
+            self._integral = max(-self.integralLimit, min(self.integralLimit, self._integral))
+        return output
+
+class VelocityController():
+
+    def __init__(self, gains=(1.0, 0.1, 0.2), maxVelocity=0.3, integralLimit=0.1, descentVelocity=0.1):
+        """
+        Function:    __init__
+        Purpose:     Setup the closed loop landing controller
+        Inputs:      gains - a list of kp, ki, kd floating point values used for both horizontal axes
+                     maxVelocity - a floating point value, the largest horizontal speed along each axis in m/s
+                     integralLimit - a floating point value, the largest velocity the integral term may contribute in m/s
+                     descentVelocity - a floating point value, the descent speed when exactly over the target in m/s
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._x = PIDAxis(gains[0], gains[1], gains[2], maxVelocity, integralLimit)
+        self._y = PIDAxis(gains[0], gains[1], gains[2], maxVelocity, integralLimit)
+        self._descentVelocity = descentVelocity
+
+    def reset(self):
+        """
+        Function:    reset
+        Purpose:     Clear the integral terms, for example after the estimate was lost
+        Inputs:      None
+        Outputs:     None
+        Description: See purpose.
+        """
+        self._x.reset()
+        self._y.reset()
+        return
+
+    def update(self, state, target, onTargetRadius, dt):
+        """
+        Function:    update
+        Purpose:     Compute a velocity setpoint from the latest position estimate
+        Inputs:      state - a StateEstimator.StateEstimate value
+                     target - a list of x, y floating point values, the landing point in meters
+                     onTargetRadius - a floating point value, the offset at which the UAV counts as on target at its height
+                     dt - a floating point value, the time since the last update in seconds
+        Outputs:     a tuple of vx, vy, vz floating point values in m/s in the camera frame
+        Description: The descent speed falls off linearly with the horizontal offset, reaching zero at the on target
+                     radius, so the UAV only comes down while it is lined up and slows its descent as it drifts.
+        """
+        errorX = target[0] - state.x
+        errorY = target[1] - state.y
+        vx = self._x.update(errorX, state.vx, dt)
+        vy = self._y.update(errorY, state.vy, dt)
+        offset = math.hypot(errorX, errorY)
+        vz = -self._descentVelocity*max(0.0, 1.0 - offset/onTargetRadius) if onTargetRadius > 0 else 0.0
+        return vx, vy, vz
@@ -0,0 +1,105 @@
+"""                                                    
+
+      .o.       ooooooooo.         .o.       oooooo     oooo 
+     .888.      `888   `Y88.      .888.       `888.     .8'  
+    .8"888.      888   .d88'     .8"888.       `888.   .8'   
+   .8' `888.     888ooo88P'     .8' `888.       `888. .8'    
+  .88ooo8888.    888`88b.      .88ooo8888.       `888.8'     
+ .8'     `888.   888  `88b.   .8'     `888.       `888'      
+o88o     o8888o o888o  o888o o88o     o8888o       `8'       
+                                                             
+                                                             
+File:      main_async
+Purpose:   This file is a sample main file which runs the LandingPlatformController and
+           UAVController classes on an asyncio event loop. The camera is read by the loop,
+           camera data points and UAV telemetry are monitored as streams, and the landing
+           routine runs in an executor alongside them.
+Author: Joseph Haun, Alexander McGinnis, Anthony Aboumrad
+Created: 10-18-2026
+Modified: 10-18-2026
+
+  This program is free software; you can redistribute it and/or
+  modify it under the terms of the GNU General Public License
+  as published by the Free Software Foundation; either version 2
+  of the License, or (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+  You should have received a copy of the GNU General Public License
+  along with this program; if not, write to the Free Software
+  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+  MA  02110-1301, USA.
+
+"""
+
+from UAVController import UAVController
+from LandingPlatformController import LandingPlatformController
+
+import asyncio
+import signal
+import sys
+
+async def monitorCamera(LPC):
+    #Report the number of camera data points received each second
+    loop = asyncio.get_running_loop()
+    count = 0
+    reportTime = loop.time() + 1
+    async for fix in LPC.cameraFixes():
+        count += 1
+        if(loop.time() >= reportTime):
+            print("MAIN: camera " + str(count) + " points/s, last = " + str(fix))
+            count = 0
+            reportTime = loop.time() + 1
+
+async def monitorTelemetry(UAV):
+    #Report the UAV battery voltage once every ten log packets
+    count = 0
+    async for packet in UAV.telemetry():
+        count += 1
+        if(count % 10 == 0):
+            print("MAIN: battery = " + str(packet.data['pm.vbat']))
+
+async def run(LPC, UAV):
+    loop = asyncio.get_running_loop()
+    LPC.attachEventLoop(loop)
+    monitors = [asyncio.ensure_future(monitorCamera(LPC)), asyncio.ensure_future(monitorTelemetry(UAV))]
+    try:
+        #The landing routine blocks, so it runs on an executor thread while the loop keeps reading the camera
+        landing = loop.run_in_executor(None, LPC.engageFlightRoutine)
+        #Cancelling cannot stop the thread, so whatever happens wait for it to land the UAV before shutting down
+        while(landing.done() == False):
+            try:
+                await asyncio.shield(landing)
+            except asyncio.CancelledError:
+                LPC.requestStop()
+        landing.result()
+    finally:
+        for monitor in monitors:
+            monitor.cancel()
+        LPC.done()
+
+def main():
+    UAV = None
+    print("MAIN: Attempting to connect to UAV")
+    while(UAV == None):
+        UAV = UAVController()
+    print("MAIN: UAV Connected, Initializing Landing Platform Controller")
+    LPC = None
+    settingsArray = dict()
+    settingsArray['uav'] = UAV
+    while(LPC == None):
+        LPC = LandingPlatformController(settings=settingsArray, debug=False)
+    print("MAIN: Landing Platform Controller Initialized")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    task = loop.create_task(run(LPC, UAV))
+    #Ctrl-C aborts the landing, which lands the UAV where it is, and run then shuts everything down
+    loop.add_signal_handler(signal.SIGINT, LPC.requestStop)
+    loop.run_until_complete(task)
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()